@@ -8,12 +8,17 @@ from alembic import context
 # Import your models here for autogenerate
 from src.models.base import Base
 from src.models.politico import Politico, Partido
-from src.models.gasto import Gasto, Empresa
+from src.models.gasto import Gasto, Empresa, TipoDespesa
 from src.models.dlq import DLQ
 from src.models.analise import AnaliseIA
 from src.models.proposicao import Proposicao
 from src.models.votacao import Votacao
 from src.models.voto import Voto
+from src.models.exploracao import GastoExploracao
+from src.models.resumo import (
+    GastoResumoAnual, DashboardAnual, GastoMensal, GastoMensalUF, GastoMensalPartido,
+    GastoFornecedor, FornecedorAnual, ConcentracaoFornecedores, PlacarVotacao,
+)
 from src.core.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,49 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b41c2d9e5a3'
+down_revision = 'f3ac90b0e084'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Índices para os caminhos quentes da API, ingestão e ai_analyzer.
+    # Em produção com tabelas grandes, prefira criar com CONCURRENTLY fora de transação.
+    op.create_index('ix_gastos_politico_data', 'gastos_gabinete', ['politico_id', 'data_emissao', 'id'], postgresql_include=['valor'])
+    op.create_index('ix_gastos_data_id', 'gastos_gabinete', ['data_emissao', 'id'])
+    op.create_index('ix_gastos_valor_id', 'gastos_gabinete', ['valor', 'id'])
+    op.create_index('ix_gastos_tipo_despesa', 'gastos_gabinete', ['tipo_despesa'], postgresql_where=sa.text('tipo_despesa IS NOT NULL'))
+    op.create_index('ix_votos_votacao_id', 'votos', ['votacao_id'])
+    op.create_index('ix_votos_politico_id', 'votos', ['politico_id'])
+    op.create_index('ix_analises_entidade', 'analises_ia', ['entidade_tipo', 'entidade_id'], postgresql_include=['score_anomalia'])
+    op.create_index('ix_politicos_partido_id', 'politicos', ['partido_id'])
+    op.create_index('ix_politicos_uf', 'politicos', ['uf'])
+    op.create_index('ix_proposicoes_data_apresentacao', 'proposicoes', ['data_apresentacao'])
+    op.create_index('ix_autoria_politico_id', 'autoria_proposicao', ['politico_id'])
+    op.create_index('ix_votacoes_data', 'votacoes', ['data'])
+    op.create_index('ix_votacoes_proposicao_id', 'votacoes', ['proposicao_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_votacoes_proposicao_id', table_name='votacoes')
+    op.drop_index('ix_votacoes_data', table_name='votacoes')
+    op.drop_index('ix_autoria_politico_id', table_name='autoria_proposicao')
+    op.drop_index('ix_proposicoes_data_apresentacao', table_name='proposicoes')
+    op.drop_index('ix_politicos_uf', table_name='politicos')
+    op.drop_index('ix_politicos_partido_id', table_name='politicos')
+    op.drop_index('ix_analises_entidade', table_name='analises_ia')
+    op.drop_index('ix_votos_politico_id', table_name='votos')
+    op.drop_index('ix_votos_votacao_id', table_name='votos')
+    op.drop_index('ix_gastos_tipo_despesa', table_name='gastos_gabinete')
+    op.drop_index('ix_gastos_valor_id', table_name='gastos_gabinete')
+    op.drop_index('ix_gastos_data_id', table_name='gastos_gabinete')
+    op.drop_index('ix_gastos_politico_data', table_name='gastos_gabinete')
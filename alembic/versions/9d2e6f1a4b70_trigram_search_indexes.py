@@ -0,0 +1,45 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2e6f1a4b70'
+down_revision = '7b41c2d9e5a3'
+branch_labels = None
+depends_on = None
+
+
+# (índice, tabela, coluna) buscados por substring sem acento (src/api/filters.py:contains_text)
+TRGM_INDEXES = [
+    ('ix_politicos_nome_parlamentar_trgm', 'politicos', 'nome_parlamentar'),
+    ('ix_partidos_sigla_trgm', 'partidos', 'sigla'),
+    ('ix_gastos_tipo_despesa_trgm', 'gastos_gabinete', 'tipo_despesa'),
+    ('ix_empresas_nome_fantasia_trgm', 'empresas', 'nome_fantasia'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() é STABLE (depende do search_path) e não pode entrar em índice;
+    # o wrapper fixa o dicionário e pode ser IMMUTABLE
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+    # Índices de expressão: o autogenerate do Alembic não os compara, por isso não estão nos models
+    for name, table, column in TRGM_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} USING gin (f_unaccent({column}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for name, table, column in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
@@ -0,0 +1,92 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d8e5c1f960'
+down_revision = 'f4c19a3e7b2d'
+branch_labels = None
+depends_on = None
+
+
+# Busca por substring sem acento (contains_text) direto no read model
+TRGM_INDEXES = [
+    ('ix_gastos_exploracao_politico_nome_trgm', 'politico_nome'),
+    ('ix_gastos_exploracao_partido_sigla_trgm', 'partido_sigla'),
+    ('ix_gastos_exploracao_tipo_despesa_trgm', 'tipo_despesa'),
+    ('ix_gastos_exploracao_fornecedor_nome_trgm', 'fornecedor_nome'),
+]
+
+
+def upgrade() -> None:
+    op.create_table('gastos_exploracao',
+        sa.Column('gasto_id', sa.Integer(), nullable=False),
+        sa.Column('ext_id', sa.Integer(), nullable=False),
+        sa.Column('politico_id', sa.Integer(), nullable=False),
+        sa.Column('politico_nome', sa.String(length=255), nullable=False),
+        sa.Column('partido_sigla', sa.String(length=20), nullable=True),
+        sa.Column('uf', sa.String(length=2), nullable=True),
+        sa.Column('data_emissao', sa.Date(), nullable=True),
+        sa.Column('valor', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('tipo_despesa', sa.String(length=255), nullable=True),
+        sa.Column('empresa_cnpj', sa.String(length=20), nullable=True),
+        sa.Column('fornecedor_nome', sa.String(length=255), nullable=True),
+        sa.Column('url_documento', sa.String(length=500), nullable=True),
+        sa.Column('has_analise', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+        sa.Column('score_anomalia', sa.Numeric(precision=3, scale=2), nullable=True),
+        sa.Column('ai_resumo', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['gasto_id'], ['gastos_gabinete.id'], ),
+        sa.PrimaryKeyConstraint('gasto_id')
+    )
+
+    # Carga inicial antes dos índices (mesmo SELECT de src/services/exploracao.py)
+    op.execute("""
+        INSERT INTO gastos_exploracao (
+            gasto_id, ext_id, politico_id, politico_nome, partido_sigla, uf,
+            data_emissao, valor, tipo_despesa, empresa_cnpj, fornecedor_nome, url_documento,
+            has_analise, score_anomalia, ai_resumo
+        )
+        SELECT g.id, g.ext_id, g.politico_id, p.nome_parlamentar, pa.sigla, p.uf,
+               g.data_emissao, g.valor, g.tipo_despesa, g.empresa_cnpj, e.nome_fantasia, g.url_documento,
+               a.id IS NOT NULL, a.score_anomalia, a.resumo_critico
+        FROM gastos_gabinete g
+        JOIN politicos p ON p.id = g.politico_id
+        LEFT JOIN partidos pa ON pa.id = p.partido_id
+        LEFT JOIN empresas e ON e.cnpj = g.empresa_cnpj
+        LEFT JOIN LATERAL (
+            SELECT id, score_anomalia, resumo_critico
+            FROM analises_ia
+            WHERE entidade_tipo = 'GASTO' AND entidade_id = g.id
+            ORDER BY id DESC
+            LIMIT 1
+        ) a ON true
+    """)
+
+    op.create_index('ix_gastos_exploracao_data', 'gastos_exploracao', ['data_emissao', 'gasto_id'])
+    op.create_index('ix_gastos_exploracao_valor', 'gastos_exploracao', ['valor', 'gasto_id'])
+    op.create_index('ix_gastos_exploracao_politico', 'gastos_exploracao', ['politico_id', 'data_emissao', 'gasto_id'])
+    op.create_index('ix_gastos_exploracao_uf', 'gastos_exploracao', ['uf', 'data_emissao', 'gasto_id'])
+    op.create_index('ix_gastos_exploracao_empresa', 'gastos_exploracao', ['empresa_cnpj'])
+    op.create_index('ix_gastos_exploracao_score', 'gastos_exploracao', ['score_anomalia', 'gasto_id'],
+                    postgresql_where=sa.text('has_analise'))
+    # Índices de expressão: fora dos models, como na migration 9d2e6f1a4b70
+    for name, column in TRGM_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON gastos_exploracao USING gin (f_unaccent({column}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for name, column in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name='gastos_exploracao')
+    op.drop_index('ix_gastos_exploracao_score', table_name='gastos_exploracao')
+    op.drop_index('ix_gastos_exploracao_empresa', table_name='gastos_exploracao')
+    op.drop_index('ix_gastos_exploracao_uf', table_name='gastos_exploracao')
+    op.drop_index('ix_gastos_exploracao_politico', table_name='gastos_exploracao')
+    op.drop_index('ix_gastos_exploracao_valor', table_name='gastos_exploracao')
+    op.drop_index('ix_gastos_exploracao_data', table_name='gastos_exploracao')
+    op.drop_table('gastos_exploracao')
@@ -0,0 +1,42 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b58c3e0d7f12'
+down_revision = '9d2e6f1a4b70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Configuração "portuguese" + unaccent: "saude" encontra "saúde" e o ts_headline
+    # continua destacando o texto original (acentuado)
+    op.execute("CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem"
+    )
+    # Coluna gerada: o Postgres a recalcula em todo upsert feito pelo ResilienceIngestor
+    op.add_column('proposicoes', sa.Column(
+        'ementa_tsv',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('portuguese_unaccent'::regconfig, coalesce(ementa, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_proposicoes_ementa_tsv', 'proposicoes', ['ementa_tsv'], postgresql_using='gin')
+    op.create_index('ix_proposicoes_sigla_tipo_ano', 'proposicoes', ['sigla_tipo', 'ano'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proposicoes_sigla_tipo_ano', table_name='proposicoes')
+    op.drop_index('ix_proposicoes_ementa_tsv', table_name='proposicoes')
+    op.drop_column('proposicoes', 'ementa_tsv')
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent")
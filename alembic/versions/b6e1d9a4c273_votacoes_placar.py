@@ -0,0 +1,98 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d9a4c273'
+down_revision = 'a3d8e5c1f960'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('votacoes_placar',
+        sa.Column('votacao_id', sa.String(length=50), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('sim', sa.Integer(), nullable=False),
+        sa.Column('nao', sa.Integer(), nullable=False),
+        sa.Column('abstencao', sa.Integer(), nullable=False),
+        sa.Column('obstrucao', sa.Integer(), nullable=False),
+        sa.Column('por_tipo', sa.JSON(), nullable=False),
+        sa.Column('por_partido', sa.JSON(), nullable=False),
+        sa.Column('por_uf', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['votacao_id'], ['votacoes.id'], ),
+        sa.PrimaryKeyConstraint('votacao_id')
+    )
+    # Carga inicial (mesmo SQL de src/services/placares.py); depois disso
+    # process_votacoes_batch recalcula o placar das votações que ingere
+    op.execute("""
+        WITH v AS (
+            SELECT vo.votacao_id, vo.tipo_voto, COALESCE(pa.sigla, '') AS sigla, COALESCE(p.uf, '') AS uf
+            FROM votos vo
+            JOIN politicos p ON p.id = vo.politico_id
+            LEFT JOIN partidos pa ON pa.id = p.partido_id
+        ),
+        tipos AS (
+            SELECT votacao_id, SUM(n)::int AS total, json_object_agg(tipo_voto, n ORDER BY tipo_voto) AS por_tipo
+            FROM (SELECT votacao_id, tipo_voto, COUNT(*) AS n FROM v GROUP BY 1, 2) t
+            GROUP BY 1
+        ),
+        por_partido AS (
+            SELECT votacao_id,
+                   json_agg(json_build_object('sigla', sigla, 'total', total, 'votos', votos) ORDER BY total DESC, sigla) AS grupos
+            FROM (
+                SELECT votacao_id, sigla, SUM(n) AS total, json_object_agg(tipo_voto, n ORDER BY tipo_voto) AS votos
+                FROM (SELECT votacao_id, sigla, tipo_voto, COUNT(*) AS n FROM v GROUP BY 1, 2, 3) t
+                GROUP BY 1, 2
+            ) g
+            GROUP BY 1
+        ),
+        por_uf AS (
+            SELECT votacao_id,
+                   json_agg(json_build_object('uf', uf, 'total', total, 'votos', votos) ORDER BY uf) AS grupos
+            FROM (
+                SELECT votacao_id, uf, SUM(n) AS total, json_object_agg(tipo_voto, n ORDER BY tipo_voto) AS votos
+                FROM (SELECT votacao_id, uf, tipo_voto, COUNT(*) AS n FROM v GROUP BY 1, 2, 3) t
+                GROUP BY 1, 2
+            ) g
+            GROUP BY 1
+        )
+        INSERT INTO votacoes_placar
+            (votacao_id, total, sim, nao, abstencao, obstrucao, por_tipo, por_partido, por_uf, updated_at)
+        SELECT vt.id,
+               COALESCE(t.total, 0),
+               COALESCE((t.por_tipo->>'Sim')::int, 0),
+               COALESCE((t.por_tipo->>'Não')::int, 0),
+               COALESCE((t.por_tipo->>'Abstenção')::int, 0),
+               COALESCE((t.por_tipo->>'Obstrução')::int, 0),
+               COALESCE(t.por_tipo, '{}'::json),
+               COALESCE(pp.grupos, '[]'::json),
+               COALESCE(pu.grupos, '[]'::json),
+               now()
+        FROM votacoes vt
+        LEFT JOIN tipos t ON t.votacao_id = vt.id
+        LEFT JOIN por_partido pp ON pp.votacao_id = vt.id
+        LEFT JOIN por_uf pu ON pu.votacao_id = vt.id
+        ON CONFLICT (votacao_id) DO UPDATE SET
+            total = EXCLUDED.total, sim = EXCLUDED.sim, nao = EXCLUDED.nao,
+            abstencao = EXCLUDED.abstencao, obstrucao = EXCLUDED.obstrucao,
+            por_tipo = EXCLUDED.por_tipo, por_partido = EXCLUDED.por_partido, por_uf = EXCLUDED.por_uf,
+            updated_at = EXCLUDED.updated_at
+    """)
+    # Keyset (data, id) de GET /votacoes: o índice só por data ordenava o desempate
+    # por id fora do índice. A versão composta substitui a antiga.
+    op.create_index('ix_votacoes_data_id', 'votacoes', ['data', 'id'])
+    op.drop_index('ix_votacoes_data', table_name='votacoes')
+
+
+def downgrade() -> None:
+    op.create_index('ix_votacoes_data', 'votacoes', ['data'])
+    op.drop_index('ix_votacoes_data_id', table_name='votacoes')
+    op.drop_table('votacoes_placar')
@@ -0,0 +1,92 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7d2e91b35'
+down_revision = 'b58c3e0d7f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('gastos_resumo_anual',
+        sa.Column('politico_id', sa.Integer(), nullable=False),
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('tipo_despesa', sa.String(length=255), nullable=False),
+        sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('qtd', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ),
+        sa.PrimaryKeyConstraint('politico_id', 'ano', 'tipo_despesa')
+    )
+    op.create_index('ix_gastos_resumo_anual_ano', 'gastos_resumo_anual', ['ano', 'politico_id'])
+
+    op.create_table('dashboard_anual',
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('total_gastos', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column('qtd_gastos', sa.Integer(), nullable=False),
+        sa.Column('total_deputados', sa.Integer(), nullable=False),
+        sa.Column('total_proposicoes', sa.Integer(), nullable=False),
+        sa.Column('top_spenders', sa.JSON(), nullable=False),
+        sa.Column('categories', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('ano')
+    )
+
+    # Carga inicial: /stats/dashboard só lê dashboard_anual e a ingestão só recalcula os
+    # anos que toca (mesmo cálculo de src/services/rollups.py: _resumo_select e refresh_dashboard)
+    op.execute("""
+        INSERT INTO gastos_resumo_anual (politico_id, ano, tipo_despesa, total, qtd)
+        SELECT politico_id, EXTRACT(YEAR FROM data_emissao)::int, COALESCE(tipo_despesa, ''),
+               SUM(valor), COUNT(*)
+        FROM gastos_gabinete
+        WHERE data_emissao IS NOT NULL
+        GROUP BY 1, 2, 3
+    """)
+    op.execute("""
+        WITH por_deputado AS (
+            SELECT r.ano, p.id, p.nome_parlamentar, p.foto_url, SUM(r.total) AS total,
+                   ROW_NUMBER() OVER (PARTITION BY r.ano ORDER BY SUM(r.total) DESC, p.id) AS pos
+            FROM gastos_resumo_anual r JOIN politicos p ON p.id = r.politico_id
+            GROUP BY r.ano, p.id
+        ),
+        por_tipo AS (
+            SELECT ano, tipo_despesa, SUM(total) AS total,
+                   ROW_NUMBER() OVER (PARTITION BY ano ORDER BY SUM(total) DESC, tipo_despesa) AS pos
+            FROM gastos_resumo_anual
+            GROUP BY ano, tipo_despesa
+        )
+        INSERT INTO dashboard_anual
+            (ano, total_gastos, qtd_gastos, total_deputados, total_proposicoes, top_spenders, categories, updated_at)
+        SELECT a.ano, a.total, a.qtd,
+               (SELECT COUNT(*) FROM politicos),
+               (SELECT COUNT(*) FROM proposicoes),
+               COALESCE((
+                   SELECT json_agg(json_build_object('id', d.id, 'nome', d.nome_parlamentar,
+                                                     'foto_url', d.foto_url, 'valor', d.total::float8) ORDER BY d.pos)
+                   FROM por_deputado d WHERE d.ano = a.ano AND d.pos <= 5
+               ), '[]'::json),
+               COALESCE((
+                   SELECT json_agg(json_build_object('categoria', NULLIF(t.tipo_despesa, ''),
+                                                     'valor', t.total::float8) ORDER BY t.pos)
+                   FROM por_tipo t WHERE t.ano = a.ano AND t.pos <= 5
+               ), '[]'::json),
+               now()
+        FROM (
+            SELECT ano, SUM(total) AS total, SUM(qtd)::int AS qtd
+            FROM gastos_resumo_anual
+            GROUP BY ano
+        ) a
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_anual')
+    op.drop_index('ix_gastos_resumo_anual_ano', table_name='gastos_resumo_anual')
+    op.drop_table('gastos_resumo_anual')
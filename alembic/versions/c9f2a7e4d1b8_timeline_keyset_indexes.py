@@ -0,0 +1,34 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f2a7e4d1b8'
+down_revision = 'b6e1d9a4c273'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset (data, id) de /deputados/{id}/timeline: o índice só por data ordenava o
+    # desempate por id fora do índice. A versão composta substitui a antiga; votações
+    # já usam ix_votacoes_data_id (b6e1d9a4c273).
+    op.create_index('ix_proposicoes_data_id', 'proposicoes', ['data_apresentacao', 'id'])
+    op.drop_index('ix_proposicoes_data_apresentacao', table_name='proposicoes')
+    # Voto do deputado em cada votação percorrida pela timeline (probe por índice, sem ler
+    # os ~513 votos da votação); continua servindo o DELETE por votacao_id da ingestão
+    op.create_index('ix_votos_votacao_politico', 'votos', ['votacao_id', 'politico_id'])
+    op.drop_index('ix_votos_votacao_id', table_name='votos')
+
+
+def downgrade() -> None:
+    op.create_index('ix_votos_votacao_id', 'votos', ['votacao_id'])
+    op.drop_index('ix_votos_votacao_politico', table_name='votos')
+    op.create_index('ix_proposicoes_data_apresentacao', 'proposicoes', ['data_apresentacao'])
+    op.drop_index('ix_proposicoes_data_id', table_name='proposicoes')
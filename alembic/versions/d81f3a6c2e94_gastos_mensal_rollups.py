@@ -0,0 +1,75 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f3a6c2e94'
+down_revision = 'c4a7d2e91b35'
+branch_labels = None
+depends_on = None
+
+
+def _rollup_table(name, dimensao_column, total_precision, *constraints):
+    op.create_table(name,
+        dimensao_column,
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('mes', sa.Integer(), nullable=False),
+        sa.Column('tipo_despesa', sa.String(length=255), nullable=False),
+        sa.Column('total', sa.Numeric(precision=total_precision, scale=2), nullable=False),
+        sa.Column('qtd', sa.Integer(), nullable=False),
+        *constraints,
+        sa.PrimaryKeyConstraint(dimensao_column.name, 'ano', 'mes', 'tipo_despesa')
+    )
+
+
+def upgrade() -> None:
+    _rollup_table('gastos_mensal',
+        sa.Column('politico_id', sa.Integer(), nullable=False), 14,
+        sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ),
+    )
+    op.create_index('ix_gastos_mensal_ano', 'gastos_mensal', ['ano', 'politico_id'])
+    _rollup_table('gastos_mensal_uf', sa.Column('uf', sa.String(length=2), nullable=False), 16)
+    _rollup_table('gastos_mensal_partido',
+        sa.Column('partido_id', sa.Integer(), nullable=False), 16,
+        sa.ForeignKeyConstraint(['partido_id'], ['partidos.id'], ),
+    )
+
+    # Carga inicial: a ingestão só aplica deltas, então o ponto de partida precisa estar completo
+    # (mesmo SQL de src/services/rollups.py:REBUILD_MENSAL_SQL). ano = mes = 0: gastos sem data.
+    op.execute("""
+        INSERT INTO gastos_mensal (politico_id, ano, mes, tipo_despesa, total, qtd)
+        SELECT politico_id,
+               COALESCE(EXTRACT(YEAR FROM data_emissao)::int, 0),
+               COALESCE(EXTRACT(MONTH FROM data_emissao)::int, 0),
+               COALESCE(tipo_despesa, ''),
+               SUM(valor), COUNT(*)
+        FROM gastos_gabinete
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        INSERT INTO gastos_mensal_uf (uf, ano, mes, tipo_despesa, total, qtd)
+        SELECT p.uf, m.ano, m.mes, m.tipo_despesa, SUM(m.total), SUM(m.qtd)
+        FROM gastos_mensal m JOIN politicos p ON p.id = m.politico_id
+        WHERE p.uf IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        INSERT INTO gastos_mensal_partido (partido_id, ano, mes, tipo_despesa, total, qtd)
+        SELECT p.partido_id, m.ano, m.mes, m.tipo_despesa, SUM(m.total), SUM(m.qtd)
+        FROM gastos_mensal m JOIN politicos p ON p.id = m.politico_id
+        WHERE p.partido_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('gastos_mensal_partido')
+    op.drop_table('gastos_mensal_uf')
+    op.drop_index('ix_gastos_mensal_ano', table_name='gastos_mensal')
+    op.drop_table('gastos_mensal')
@@ -0,0 +1,90 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7f4c81a06'
+down_revision = 'd81f3a6c2e94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('gastos_fornecedor',
+        sa.Column('empresa_cnpj', sa.String(length=20), nullable=False),
+        sa.Column('politico_id', sa.Integer(), nullable=False),
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('qtd', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['empresa_cnpj'], ['empresas.cnpj'], ),
+        sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ),
+        sa.PrimaryKeyConstraint('empresa_cnpj', 'politico_id', 'ano')
+    )
+    op.create_index('ix_gastos_fornecedor_politico', 'gastos_fornecedor', ['politico_id', 'ano'])
+    op.create_table('fornecedores_anual',
+        sa.Column('empresa_cnpj', sa.String(length=20), nullable=False),
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column('qtd', sa.Integer(), nullable=False),
+        sa.Column('deputados', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['empresa_cnpj'], ['empresas.cnpj'], ),
+        sa.PrimaryKeyConstraint('empresa_cnpj', 'ano')
+    )
+    op.create_index('ix_fornecedores_anual_ano_total', 'fornecedores_anual', ['ano', 'total'])
+    op.create_table('fornecedores_concentracao',
+        sa.Column('politico_id', sa.Integer(), nullable=False),
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('fornecedores', sa.Integer(), nullable=False),
+        sa.Column('hhi', sa.Float(), nullable=True),
+        sa.Column('top1_share', sa.Float(), nullable=True),
+        sa.Column('top5_share', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ),
+        sa.PrimaryKeyConstraint('politico_id', 'ano')
+    )
+    op.create_index('ix_fornecedores_concentracao_ano_hhi', 'fornecedores_concentracao', ['ano', 'hhi'])
+
+    # Carga inicial (mesmo SQL de src/services/rollups.py:REBUILD_FORNECEDORES_SQL).
+    # ano = 0: gastos sem data; gastos sem CNPJ ficam de fora.
+    op.execute("""
+        INSERT INTO gastos_fornecedor (empresa_cnpj, politico_id, ano, total, qtd)
+        SELECT empresa_cnpj, politico_id, COALESCE(EXTRACT(YEAR FROM data_emissao)::int, 0),
+               SUM(valor), COUNT(*)
+        FROM gastos_gabinete
+        WHERE empresa_cnpj IS NOT NULL
+        GROUP BY 1, 2, 3
+    """)
+    op.execute("""
+        INSERT INTO fornecedores_anual (empresa_cnpj, ano, total, qtd, deputados)
+        SELECT empresa_cnpj, ano, SUM(total), SUM(qtd), COUNT(*)
+        FROM gastos_fornecedor
+        GROUP BY 1, 2
+    """)
+    op.execute("""
+        INSERT INTO fornecedores_concentracao (politico_id, ano, total, fornecedores, hhi, top1_share, top5_share)
+        SELECT politico_id, ano, SUM(total), COUNT(*),
+               SUM(share * share) * 10000, MAX(share), SUM(share) FILTER (WHERE posicao <= 5)
+        FROM (
+            SELECT politico_id, ano, total,
+                   (total / NULLIF(SUM(total) OVER w, 0))::float8 AS share,
+                   ROW_NUMBER() OVER (w ORDER BY total DESC) AS posicao
+            FROM gastos_fornecedor
+            WINDOW w AS (PARTITION BY politico_id, ano)
+        ) participacao
+        GROUP BY politico_id, ano
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fornecedores_concentracao_ano_hhi', table_name='fornecedores_concentracao')
+    op.drop_table('fornecedores_concentracao')
+    op.drop_index('ix_fornecedores_anual_ano_total', table_name='fornecedores_anual')
+    op.drop_table('fornecedores_anual')
+    op.drop_index('ix_gastos_fornecedor_politico', table_name='gastos_fornecedor')
+    op.drop_table('gastos_fornecedor')
@@ -0,0 +1,31 @@
+import sys
+import os
+
+# Standard template for script.py.mako
+"""
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c19a3e7b2d'
+down_revision = 'e2b7f4c81a06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('tipos_despesa',
+        sa.Column('nome', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('nome')
+    )
+    # Carga inicial; depois disso process_gastos_batch insere os tipos novos
+    op.execute("""
+        INSERT INTO tipos_despesa (nome)
+        SELECT DISTINCT tipo_despesa FROM gastos_gabinete WHERE tipo_despesa IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('tipos_despesa')
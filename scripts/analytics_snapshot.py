@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Snapshot Parquet e consultas no motor analítico (DuckDB).
+
+Uso:
+  python scripts/analytics_snapshot.py build
+  python scripts/analytics_snapshot.py query gastos_partido_mes --ano 2024
+  python scripts/analytics_snapshot.py query concentracao_fornecedores --ano 2024 --top 10
+  python scripts/analytics_snapshot.py query concordancia_partidos --ano 2024
+  python scripts/analytics_snapshot.py sql "SELECT uf, count(*) FROM politicos GROUP BY 1"
+
+build requer pyarrow; query/sql requerem duckdb. As consultas não acessam o Postgres.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+QUERIES = ["gastos_partido_mes", "concentracao_fornecedores", "concordancia_partidos"]
+
+
+def _print(result: dict, started: float):
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+    print(f"[ANALYTICS] {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics snapshot / DuckDB queries")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Gera e publica um novo snapshot Parquet")
+    query = sub.add_parser("query", help="Roda uma consulta analítica nomeada")
+    query.add_argument("name", choices=QUERIES)
+    query.add_argument("--ano", type=int, required=True)
+    query.add_argument("--tipo-despesa")
+    query.add_argument("--top", type=int, default=20)
+    raw = sub.add_parser("sql", help="SQL livre sobre as views do snapshot")
+    raw.add_argument("sql")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from src.core.database import use_engine_profile, run_with_engine
+        import src.models  # noqa: F401  (registra todos os mappers)
+        from src.services.snapshot import build_snapshot
+
+        use_engine_profile("analyzer")
+        manifest = run_with_engine(build_snapshot())
+        print(json.dumps(manifest, indent=2))
+        return
+
+    from src.services import analytics
+
+    started = time.perf_counter()
+    try:
+        if args.command == "sql":
+            result = analytics.engine.query(args.sql, args.sql)
+        elif args.name == "concentracao_fornecedores":
+            result = asyncio.run(analytics.concentracao_fornecedores(args.ano, args.tipo_despesa, args.top))
+        else:
+            result = asyncio.run(getattr(analytics, args.name)(args.ano))
+    except analytics.AnalyticsUnavailable as e:
+        sys.exit(f"❌ {e}")
+    _print(result, started)
+
+
+if __name__ == "__main__":
+    main()
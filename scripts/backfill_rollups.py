@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Reconstrói os rollups de gastos (gastos_resumo_anual, dashboard_anual, gastos_mensal/_uf/_partido
+e fornecedores), o read model gastos_exploracao e os placares de votações.
+
+Todas as migrations já fazem a carga inicial dos seus rollups e a ingestão os mantém
+atualizados; o script serve para corrigir divergências.
+
+Uso:
+  python scripts/backfill_rollups.py             # todos os anos
+  python scripts/backfill_rollups.py --ano 2024  # apenas um ano do resumo anual/dashboard
+  python scripts/backfill_rollups.py --mensal    # também refaz gastos_mensal (partido atual dos deputados)
+  python scripts/backfill_rollups.py --fornecedores  # também refaz gastos_fornecedor e derivados
+  python scripts/backfill_rollups.py --exploracao    # também refaz gastos_exploracao
+  python scripts/backfill_rollups.py --placares      # também refaz votacoes_placar (partido atual dos deputados)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from src.core.database import AsyncSessionLocal, use_engine_profile, run_with_engine
+import src.models  # noqa: F401  (registra todos os mappers)
+from src.models.resumo import GastoResumoAnual
+from src.services import rollups
+from src.services.exploracao import rebuild_exploracao
+from src.services.placares import rebuild_placares
+
+
+async def backfill(ano: int | None, mensal: bool, fornecedores: bool, exploracao: bool = False,
+                   placares: bool = False):
+    async with AsyncSessionLocal() as session:
+        if mensal:
+            print("[ROLLUPS] Rebuilding gastos_mensal, gastos_mensal_uf, gastos_mensal_partido...")
+            await rollups.rebuild_gastos_mensal(session)
+        if fornecedores:
+            print("[ROLLUPS] Rebuilding gastos_fornecedor, fornecedores_anual, fornecedores_concentracao...")
+            await rollups.rebuild_gastos_fornecedores(session)
+        if exploracao:
+            print("[ROLLUPS] Rebuilding gastos_exploracao...")
+            await rebuild_exploracao(session)
+        if placares:
+            print("[ROLLUPS] Rebuilding votacoes_placar...")
+            await rebuild_placares(session)
+
+        anos = {ano} if ano else None
+        print(f"[ROLLUPS] Rebuilding gastos_resumo_anual ({ano or 'all years'})...")
+        await rollups.rebuild_gastos_resumo(session, anos)
+
+        if anos is None:
+            result = await session.execute(select(GastoResumoAnual.ano).distinct())
+            anos = {row[0] for row in result.all()}
+
+        for a in sorted(anos):
+            await rollups.refresh_dashboard(session, a)
+            print(f"[ROLLUPS] dashboard_anual {a} refreshed")
+
+        await session.commit()
+    print("[ROLLUPS] Done.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild dashboard rollups")
+    parser.add_argument("--ano", type=int, help="Reconstruir apenas este ano")
+    parser.add_argument("--mensal", action="store_true", help="Refazer também os rollups mensais")
+    parser.add_argument("--fornecedores", action="store_true", help="Refazer também os rollups de fornecedores")
+    parser.add_argument("--exploracao", action="store_true", help="Refazer também o read model da exploração")
+    parser.add_argument("--placares", action="store_true", help="Refazer também os placares das votações")
+    args = parser.parse_args()
+
+    use_engine_profile("analyzer")
+    run_with_engine(backfill(args.ano, args.mensal, args.fornecedores, args.exploracao, args.placares))
+
+
+if __name__ == "__main__":
+    main()
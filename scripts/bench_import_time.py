@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Mede o custo de import (startup) de cada entry point.
+
+Cada entry point é importado num interpretador novo com `python -X importtime`,
+então o resultado não depende de cache de módulos do processo atual.
+
+Uso:
+  python scripts/bench_import_time.py
+  python scripts/bench_import_time.py --entry api --top 15
+  python scripts/bench_import_time.py --repeat 5 --json >> bench_import_time.jsonl
+
+Opções:
+  --entry {api,worker,analyzer}   Mede apenas um entry point (default: todos)
+  --top N                         Módulos mais caros a listar (default: 10)
+  --repeat N                      Execuções por entry point; reporta a mediana (default: 3)
+  --json                          Uma linha JSON por entry point (para acompanhar no tempo)
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Módulos que cada processo importa no boot
+ENTRY_POINTS = {
+    "api": ["src.main"],
+    "worker": ["src.core.celery_app", "src.services.data_fetcher"],
+    "analyzer": ["src.services.ai_analyzer"],
+}
+
+
+def _measure(modules: list[str]) -> tuple[float, list[tuple[int, int, str]]]:
+    """Retorna (tempo de parede em ms, [(self_us, cumulative_us, módulo)])"""
+    code = "; ".join(f"import {m}" for m in modules)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # import time:       self [us] |    cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return wall_ms, rows
+
+
+def bench(entry: str, top: int, repeat: int) -> dict:
+    walls = []
+    imports_us = []
+    rows = []
+    for _ in range(repeat):
+        wall_ms, rows = _measure(ENTRY_POINTS[entry])
+        walls.append(wall_ms)
+        # Módulos de nível superior (sem indentação) somam o custo total de import
+        imports_us.append(sum(c for _, c, name in rows if not name.startswith("  ")))
+
+    slowest = sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "entry": entry,
+        "modules": ENTRY_POINTS[entry],
+        "wall_ms": round(statistics.median(walls), 1),
+        "import_ms": round(statistics.median(imports_us) / 1000, 1),
+        "module_count": len(rows),
+        "slowest": [
+            {"module": name.strip(), "cumulative_ms": round(c / 1000, 1), "self_ms": round(s / 1000, 1)}
+            for s, c, name in slowest
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark per entry point")
+    parser.add_argument("--entry", choices=list(ENTRY_POINTS), help="Single entry point")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per entry point (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON line per entry point")
+    args = parser.parse_args()
+
+    entries = [args.entry] if args.entry else list(ENTRY_POINTS)
+    for entry in entries:
+        try:
+            result = bench(entry, args.top, args.repeat)
+        except RuntimeError as e:
+            print(f"❌ {entry}: {e}", file=sys.stderr)
+            continue
+
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+            continue
+
+        print(f"\n{'═' * 60}")
+        print(f"🚀 {entry}: {', '.join(result['modules'])}")
+        print(f"{'─' * 60}")
+        print(f"  Wall time:   {result['wall_ms']} ms (interpreter + imports)")
+        print(f"  Import time: {result['import_ms']} ms ({result['module_count']} modules)")
+        print(f"\n  Slowest (cumulative):")
+        for row in result["slowest"]:
+            print(f"    {row['cumulative_ms']:>8} ms  {row['module']}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Compara serialização e compressão de uma página de /gastos/exploration (dados sintéticos).
+
+Mede o caminho antigo (jsonable_encoder + json.dumps) contra src.core.serialization.dumps
+(orjson quando instalado) e o tamanho do corpo sem compressão, com gzip e com brotli.
+Não acessa banco nem rede.
+
+Uso:
+  python scripts/bench_serialization.py
+  python scripts/bench_serialization.py --rows 100 --repeat 500
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from src.core import serialization
+from src.core.serialization import dumps
+
+
+def _page(rows: int) -> dict:
+    items = [
+        {
+            "id": 7_000_000 + i,
+            "data": date(2024, 1, 1) + timedelta(days=i % 365),
+            "valor": Decimal("1234.56") + i,
+            "tipo": "COMBUSTÍVEIS E LUBRIFICANTES.",
+            "fornecedor": f"{12345678000100 + i}",
+            "politico": "Deputado Exemplo da Silva",
+            "partido": "PXX",
+            "ai_resumo": None if i % 3 else "Gasto recorrente com fornecedor único no mesmo dia.",
+        }
+        for i in range(rows)
+    ]
+    return {"total": 123456, "total_exact": False, "total_display": "10,000+", "page": 1,
+            "page_size": rows, "next_cursor": "eyJzIjoiZGF0YSJ9", "prev_cursor": None, "items": items}
+
+
+def _time(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization/compression benchmark")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    page = _page(args.rows)
+    legacy = lambda: json.dumps(jsonable_encoder(page)).encode()
+    fast = lambda: dumps(page)
+
+    legacy_ms = _time(legacy, args.repeat)
+    fast_ms = _time(fast, args.repeat)
+    body = fast()
+
+    print(f"Rows: {args.rows}  (orjson: {'yes' if serialization.orjson else 'no, stdlib fallback'})")
+    print(f"  jsonable_encoder + json.dumps : {legacy_ms:8.3f} ms")
+    print(f"  serialization.dumps           : {fast_ms:8.3f} ms  ({legacy_ms / fast_ms:.1f}x)")
+    print(f"  body                          : {len(body):8d} bytes")
+    print(f"  gzip (level 6)                : {len(gzip.compress(body, 6)):8d} bytes")
+    try:
+        import brotli
+        print(f"  brotli (quality 4)            : {len(brotli.compress(body, quality=4)):8d} bytes")
+    except ImportError:
+        print("  brotli                        : not installed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+EXPLAIN ANALYZE das consultas quentes de cada rota, para comparar antes/depois de
+migrations de índice.
+
+As consultas são montadas com os mesmos builders/filtros das rotas e com parâmetros
+amostrados do próprio banco (um deputado e um ano com dados). Só SELECTs são
+executados; o DELETE de process_votacoes_batch é medido pelo SELECT equivalente.
+
+Uso:
+  python scripts/explain_routes.py --save before.json      # antes de `alembic upgrade head`
+  python scripts/explain_routes.py --compare before.json   # depois, mostra o ganho por consulta
+  python scripts/explain_routes.py --only exploration --plan
+
+Opções:
+  --save FILE      Salva os resultados em JSON
+  --compare FILE   Compara com um resultado salvo anteriormente
+  --only TEXTO     Roda apenas consultas cujo nome contém TEXTO
+  --plan           Imprime o plano completo (texto) de cada consulta
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func, text
+from sqlalchemy.dialects import postgresql
+
+from src.core.database import AsyncSessionLocal, use_engine_profile, run_with_engine
+from src.api.routes.gastos import build_exploration_query
+from src.api.routes.deputados import build_perfil_query
+from src.models.analise import AnaliseIA
+from src.models.gasto import Gasto, TipoDespesa
+from src.models.exploracao import GastoExploracao
+from src.models.proposicao import Proposicao
+from src.models.voto import Voto
+from src.models.resumo import DashboardAnual, PlacarVotacao
+from src.models.votacao import Votacao
+from src.services.rollups import _anos_filter, _resumo_select
+
+
+async def _sample_params(session) -> dict:
+    row = (await session.execute(
+        select(Gasto.politico_id, func.extract('year', Gasto.data_emissao))
+        .where(Gasto.data_emissao.isnot(None))
+        .limit(1)
+    )).first()
+    votacao_id = await session.scalar(select(Voto.votacao_id).limit(1))
+    return {
+        "politico_id": row[0] if row else 0,
+        "ano": int(row[1]) if row else 2024,
+        "votacao_id": votacao_id or "",
+    }
+
+
+def _queries(p: dict) -> dict:
+    """Nome -> statement, no mesmo formato que as rotas executam"""
+    exploration = build_exploration_query()
+    exploration_deputado = build_exploration_query(politico_id=p["politico_id"], ano=p["ano"])
+    por_data = (GastoExploracao.data_emissao.desc(), GastoExploracao.gasto_id.desc())
+
+    return {
+        "exploration.page1_data_desc": exploration.order_by(*por_data).limit(21),
+        "exploration.page1_valor_desc": exploration.order_by(
+            GastoExploracao.valor.desc(), GastoExploracao.gasto_id.desc()
+        ).limit(21),
+        "exploration.deputado_ano": exploration_deputado.order_by(*por_data).limit(21),
+        "exploration.count_deputado_ano": select(func.count()).select_from(
+            exploration_deputado.with_only_columns(GastoExploracao.gasto_id).limit(10_001).subquery()
+        ),
+        "exploration.has_ai_analysis": build_exploration_query(has_ai_analysis=True).order_by(*por_data).limit(21),
+        "exploration.min_score": build_exploration_query(min_score=0.7).order_by(*por_data).limit(21),
+        "exploration.fornecedor_nome": build_exploration_query(fornecedor="posto").order_by(*por_data).limit(21),
+        "deputados.perfil": build_perfil_query(p["politico_id"]),
+        "votacoes.list": select(Votacao.id, Votacao.data, PlacarVotacao.total)
+            .outerjoin(PlacarVotacao, PlacarVotacao.votacao_id == Votacao.id)
+            .where(Votacao.data.isnot(None))
+            .order_by(Votacao.data.desc(), Votacao.id.desc()).limit(21),
+        "votacoes.placar": select(PlacarVotacao).where(PlacarVotacao.votacao_id == p["votacao_id"]),
+        "stats.dashboard": select(DashboardAnual).where(DashboardAnual.ano == p["ano"]),
+        "rollups.resumo_deputado_ano": _resumo_select(
+            Gasto.politico_id == p["politico_id"], _anos_filter({p["ano"]})
+        ),
+        "dimensions.tipos_despesa": select(TipoDespesa.nome).order_by(TipoDespesa.nome),
+        "ingestor.votos_by_votacao": select(Voto.id).where(Voto.votacao_id.in_([p["votacao_id"]])),
+        "analyzer.pending_gastos": select(Gasto.id).where(
+            ~select(AnaliseIA.id).where(
+                AnaliseIA.entidade_tipo == "GASTO", AnaliseIA.entidade_id == Gasto.id
+            ).exists(),
+            Gasto.data_emissao.isnot(None),
+        ).order_by(Gasto.data_emissao.desc()).limit(50),
+        "analyzer.pending_proposicoes": select(Proposicao.id).where(
+            ~select(AnaliseIA.id).where(
+                AnaliseIA.entidade_tipo == "PROPOSICAO", AnaliseIA.entidade_id == Proposicao.id
+            ).exists()
+        ).order_by(Proposicao.data_apresentacao.desc()).limit(50),
+    }
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+async def _explain(session, stmt, with_plan: bool) -> dict:
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    raw = await session.scalar(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    root = plan[0]
+    nodes = list(_walk(root["Plan"]))
+    result = {
+        "execution_ms": round(root["Execution Time"], 3),
+        "planning_ms": round(root["Planning Time"], 3),
+        "shared_hit": root["Plan"].get("Shared Hit Blocks", 0),
+        "shared_read": root["Plan"].get("Shared Read Blocks", 0),
+        "seq_scans": sorted({n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"}),
+        "indexes": sorted({n["Index Name"] for n in nodes if "Index Name" in n}),
+    }
+    if with_plan:
+        rows = await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+        result["plan"] = "\n".join(r[0] for r in rows.all())
+    return result
+
+
+async def _run(only: str | None, with_plan: bool) -> dict:
+    async with AsyncSessionLocal() as session:
+        params = await _sample_params(session)
+        results = {"params": params, "queries": {}}
+        for name, stmt in _queries(params).items():
+            if only and only not in name:
+                continue
+            results["queries"][name] = await _explain(session, stmt, with_plan)
+            # EXPLAIN ANALYZE executa a consulta; nada a persistir
+            await session.rollback()
+    return results
+
+
+def _print(results: dict, baseline: dict | None):
+    print(f"\n{'═' * 78}")
+    print(f"🔎 EXPLAIN ANALYZE — params: {results['params']}")
+    print(f"{'─' * 78}")
+    for name, r in results["queries"].items():
+        line = f"  {name:<38} {r['execution_ms']:>10.3f} ms"
+        before = (baseline or {}).get("queries", {}).get(name)
+        if before:
+            speedup = before["execution_ms"] / r["execution_ms"] if r["execution_ms"] else float("inf")
+            line += f"   (antes {before['execution_ms']:.3f} ms, {speedup:.1f}x)"
+        print(line)
+        if r["seq_scans"]:
+            print(f"      seq scan: {', '.join(r['seq_scans'])}")
+        if r["indexes"]:
+            print(f"      índices:  {', '.join(r['indexes'])}")
+        if r.get("plan"):
+            print("\n".join(f"      | {l}" for l in r["plan"].splitlines()))
+    print(f"{'═' * 78}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE of the API hot queries")
+    parser.add_argument("--save", type=str, help="Save results to a JSON file")
+    parser.add_argument("--compare", type=str, help="Compare with a saved JSON file")
+    parser.add_argument("--only", type=str, help="Only queries whose name contains this text")
+    parser.add_argument("--plan", action="store_true", help="Print the full text plan")
+    args = parser.parse_args()
+
+    use_engine_profile("analyzer")
+    results = run_with_engine(_run(args.only, args.plan))
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    _print(results, baseline)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"Saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
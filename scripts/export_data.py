@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Exporta gastos, votos ou proposições em CSV, NDJSON ou Parquet (mesmo código das rotas /export/*).
+
+Uso:
+  python scripts/export_data.py gastos --ano 2024 --format parquet --out gastos_2024.parquet
+  python scripts/export_data.py votos --politico-id 204536 --format ndjson
+  python scripts/export_data.py proposicoes --sigla-tipo PL --ano 2023 > pl_2023.csv
+
+Sem --out, escreve no stdout. Parquet requer pyarrow.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import AsyncReadSessionLocal, use_engine_profile, run_with_engine
+import src.models  # noqa: F401  (registra todos os mappers)
+from src.services.export import DATASETS, EXPORT_FORMATS, ExportError, check_format, stream_export
+
+
+def _filters(args) -> dict:
+    if args.dataset == "gastos":
+        return dict(
+            politico_id=args.politico_id, politico_nome=args.politico_nome, sigla_partido=args.partido,
+            ano=args.ano, mes=args.mes, tipo_despesa=args.tipo_despesa, fornecedor=args.fornecedor,
+        )
+    if args.dataset == "votos":
+        return dict(politico_id=args.politico_id, ano=args.ano, votacao_id=args.votacao_id)
+    return dict(politico_id=args.politico_id, ano=args.ano, sigla_tipo=args.sigla_tipo)
+
+
+async def export(args):
+    out = open(args.out, "wb") if args.out else sys.stdout.buffer
+    written = 0
+    started = time.perf_counter()
+    try:
+        async for chunk in stream_export(
+            AsyncReadSessionLocal, args.dataset, args.format, _filters(args), args.chunk_size
+        ):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.out:
+            out.close()
+    print(
+        f"[EXPORT] {args.dataset} ({args.format}): {written / 1024 / 1024:.1f} MiB "
+        f"in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk export (CSV / NDJSON / Parquet)")
+    parser.add_argument("dataset", choices=DATASETS)
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--out", help="Arquivo de saída (padrão: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Linhas por partição do cursor")
+    parser.add_argument("--politico-id", type=int)
+    parser.add_argument("--ano", type=int)
+    # gastos
+    parser.add_argument("--mes", type=int)
+    parser.add_argument("--politico-nome")
+    parser.add_argument("--partido")
+    parser.add_argument("--tipo-despesa")
+    parser.add_argument("--fornecedor")
+    # votos / proposições
+    parser.add_argument("--votacao-id")
+    parser.add_argument("--sigla-tipo")
+    args = parser.parse_args()
+
+    try:
+        check_format(args.format)
+    except ExportError as e:
+        parser.error(str(e))
+
+    use_engine_profile("analyzer")
+    run_with_engine(export(args))
+
+
+if __name__ == "__main__":
+    main()
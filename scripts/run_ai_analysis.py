@@ -16,7 +16,6 @@ Opções:
   --daily-proposicoes N                        Proposições/dia se usar --daily
 """
 
-import asyncio
 import argparse
 import sys
 from datetime import datetime
@@ -26,6 +25,7 @@ from pathlib import Path
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.core.database import use_engine_profile, run_with_engine
 from src.services.ai_analyzer import AIAnalysisManager, AnalysisType
 
 
@@ -78,15 +78,18 @@ def main():
 
     args = parser.parse_args()
 
+    # Pool pequeno e sem log de SQL: as análises são sequenciais
+    use_engine_profile("analyzer")
+
     # Rodar análise
     if args.daily:
-        result = asyncio.run(_run_daily(
+        result = run_with_engine(_run_daily(
             gasto_limit=args.daily_gastos,
             voto_limit=args.daily_votos,
             proposicao_limit=args.daily_proposicoes
         ))
     else:
-        result = asyncio.run(_run_single(
+        result = run_with_engine(_run_single(
             analysis_type=args.type,
             limit=args.limit
         ))
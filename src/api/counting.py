@@ -0,0 +1,92 @@
+import json
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.resumo import GastoMensal
+
+# Estratégias de contagem para listagens paginadas. O total exato de uma consulta
+# filtrada custa tanto quanto a própria consulta sem LIMIT; estas estratégias
+# limitam esse custo:
+# - exact: count(*) sobre a consulta filtrada
+# - capped: conta no máximo COUNT_CAP + 1 linhas e responde "10,000+" acima disso
+# - estimate: estimativa do planner (EXPLAIN), sem executar a consulta
+# - auto: capped
+# Gastos filtrados só por deputado/ano/mês têm contagem exata barata pelo rollup
+# gastos_mensal (count_gastos_rollup), usada em auto/exact quando possível.
+COUNT_MODES = ["auto", "exact", "capped", "estimate"]
+COUNT_CAP = 10_000
+ROLLUP_COUNT_FILTERS = {"politico_id", "ano", "mes"}
+
+
+def _result(total: int | None, exact: bool) -> dict:
+    if total is None:
+        display = None
+    elif exact:
+        display = f"{total:,}"
+    elif total > COUNT_CAP:
+        display = f"{COUNT_CAP:,}+"
+    else:
+        display = f"~{total:,}"
+    return {"total": total, "total_exact": exact, "total_display": display}
+
+
+async def count_exact(db: AsyncSession, stmt) -> dict:
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    return _result(total or 0, True)
+
+
+async def count_capped(db: AsyncSession, stmt, cap: int = COUNT_CAP) -> dict:
+    total = await db.scalar(select(func.count()).select_from(stmt.limit(cap + 1).subquery()))
+    total = total or 0
+    if total > cap:
+        return _result(cap + 1, False)
+    return _result(total, True)
+
+
+async def count_estimate(db: AsyncSession, stmt) -> dict:
+    # SQL já com os literais, enviado direto ao driver: via text() um ":palavra" dentro
+    # de um filtro do usuário seria lido como bind param. Compilado com o dialeto da
+    # conexão (asyncpg) para não duplicar "%" como no paramstyle do psycopg2.
+    conn = await db.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return _result(int(plan[0]["Plan"]["Plan Rows"]), False)
+
+
+async def count_rows(db: AsyncSession, stmt, mode: str = "auto") -> dict:
+    """
+    Conta as linhas de `stmt` (sem ORDER BY/LIMIT) com a estratégia pedida.
+
+    Retorna {"total", "total_exact", "total_display"}. Passe apenas as colunas
+    necessárias em `stmt` (ex.: a chave primária) para o count não carregar linhas largas.
+    """
+    if mode == "exact":
+        return await count_exact(db, stmt)
+    if mode == "estimate":
+        return await count_estimate(db, stmt)
+    return await count_capped(db, stmt)
+
+
+def rollup_countable(filters: dict) -> bool:
+    """True se os filtros ativos da exploração de gastos cabem no rollup mensal"""
+    active = {name for name, value in filters.items() if value is not None and value != ""}
+    return active <= ROLLUP_COUNT_FILTERS
+
+
+async def count_gastos_rollup(db: AsyncSession, politico_id: int | None = None,
+                              ano: int | None = None, mes: int | None = None) -> dict:
+    """Total exato de gastos somando `qtd` dos rollups mensais (algumas centenas de linhas)"""
+    # gastos_mensal, não a agregação por UF: deputados sem UF ficariam de fora do total
+    stmt = select(func.coalesce(func.sum(GastoMensal.qtd), 0))
+    if politico_id:
+        stmt = stmt.where(GastoMensal.politico_id == politico_id)
+    if ano:
+        stmt = stmt.where(GastoMensal.ano == ano)
+    if mes:
+        stmt = stmt.where(GastoMensal.mes == mes)
+    return _result(int(await db.scalar(stmt)), True)
+
+
+def no_count() -> dict:
+    return _result(None, False)
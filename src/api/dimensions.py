@@ -0,0 +1,129 @@
+import asyncio
+import time
+import unicodedata
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from src.core.cache import tag_versions
+from src.core.config import settings
+from src.core.database import AsyncPrimaryReadSessionLocal
+from src.api.loaders import AnaliseLoader
+from src.models.politico import Politico, Partido
+from src.models.gasto import TipoDespesa
+from src.schemas.public_api import PoliticoPublic
+
+# Tags de src/core/cache.py das quais as dimensões dependem: qualquer bump recarrega tudo
+DIMENSION_TAGS = ("deputados", "partidos", "tipos_despesa", "analises")
+
+
+def normalize_text(value: str) -> str:
+    """Minúsculas e sem acentos, como f_unaccent(col) ILIKE no banco ("joao" acha "João")."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class DimensionCache:
+    """
+    Tabelas pequenas e quase estáticas em memória no processo da API: partidos (~30),
+    UFs, tipos de despesa (~20) e o diretório de deputados (~513, com a análise CROSS_DATA).
+
+    A versão é a lista de contadores de DIMENSION_TAGS no Redis, consultada no máximo a cada
+    DIMENSIONS_CHECK_INTERVAL segundos; se mudou, tudo é recarregado do primário (réplica
+    atrasada poderia fixar dados velhos sob a versão nova). Entre checagens as rotas não
+    tocam rede nenhuma. Independente das versões, tudo é recarregado a cada
+    DIMENSIONS_MAX_AGE segundos; com Redis fora, é o único gatilho de recarga.
+    """
+
+    def __init__(self):
+        self.versions: list | None = None
+        self.checked_at = 0.0
+        self.loaded_at = 0.0
+        self.loaded = False
+        self.partidos: list[dict] = []
+        self.ufs: list[str] = []
+        self.tipos_despesa: list[str] = []
+        self.deputados: list[PoliticoPublic] = []
+        # Nome normalizado de cada deputado, na mesma ordem de self.deputados
+        self._nomes: list[str] = []
+        self._lock = asyncio.Lock()
+
+    def _expired(self) -> bool:
+        return not self.loaded or time.monotonic() - self.checked_at >= settings.DIMENSIONS_CHECK_INTERVAL
+
+    async def ensure_fresh(self):
+        if not self._expired():
+            return
+        async with self._lock:
+            # Outra requisição pode ter recarregado enquanto esperávamos o lock
+            if not self._expired():
+                return
+            try:
+                versions = await tag_versions(*DIMENSION_TAGS)
+            except RedisError as e:
+                print(f"[DIMENSIONS] Redis unavailable, keeping loaded dimensions: {e}")
+                versions = self.versions
+            too_old = time.monotonic() - self.loaded_at >= settings.DIMENSIONS_MAX_AGE
+            if not self.loaded or versions != self.versions or too_old:
+                try:
+                    await self.load()
+                except Exception as e:
+                    if not self.loaded:
+                        raise
+                    # Banco fora: melhor servir a versão anterior do que falhar a rota
+                    print(f"[DIMENSIONS] Reload failed, serving previous version: {e}")
+                    versions = self.versions
+            self.versions = versions
+            self.checked_at = time.monotonic()
+
+    async def load(self):
+        async with AsyncPrimaryReadSessionLocal() as session:
+            partidos = (await session.execute(select(Partido).order_by(Partido.sigla))).scalars().all()
+            tipos = (await session.execute(select(TipoDespesa.nome).order_by(TipoDespesa.nome))).scalars().all()
+            politicos = (await session.execute(
+                select(Politico).options(selectinload(Politico.partido))
+            )).scalars().all()
+            await AnaliseLoader(session).attach("CROSS_DATA", politicos)
+
+            deputados = sorted(
+                (PoliticoPublic.model_validate(p, from_attributes=True) for p in politicos),
+                key=lambda d: (normalize_text(d.nome_parlamentar), d.id),
+            )
+
+        # Sem await daqui em diante: as rotas nunca veem uma mistura de versões
+        self.partidos = [{"id": p.id, "sigla": p.sigla, "nome": p.nome} for p in partidos]
+        self.tipos_despesa = [t for t in tipos if t]
+        self.ufs = sorted({d.uf for d in deputados if d.uf})
+        self.deputados = deputados
+        self._nomes = [normalize_text(d.nome_parlamentar) for d in deputados]
+        self.loaded = True
+        self.loaded_at = time.monotonic()
+        print(f"[DIMENSIONS] Loaded {len(deputados)} deputados, {len(self.partidos)} partidos, "
+              f"{len(self.tipos_despesa)} tipos de despesa")
+
+    def buscar_deputados(self, partido: str = None, uf: str = None, nome: str = None,
+                         limit: int = 24, offset: int = 0) -> list[PoliticoPublic]:
+        """Filtro e paginação do diretório em memória, em ordem de nome."""
+        partido = partido.upper() if partido else None
+        uf = uf.upper() if uf else None
+        termo = normalize_text(nome.strip()) if nome else None
+
+        encontrados = []
+        for deputado, nome_normalizado in zip(self.deputados, self._nomes):
+            if partido and (deputado.partido is None or deputado.partido.sigla != partido):
+                continue
+            if uf and deputado.uf != uf:
+                continue
+            if termo and termo not in nome_normalizado:
+                continue
+            encontrados.append(deputado)
+            if len(encontrados) >= offset + limit:
+                break
+        return encontrados[offset:offset + limit]
+
+
+dimensions = DimensionCache()
+
+
+async def get_dimensions() -> DimensionCache:
+    await dimensions.ensure_fresh()
+    return dimensions
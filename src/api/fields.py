@@ -0,0 +1,45 @@
+from typing import Optional
+from fastapi import HTTPException, Query
+
+# Seleção de campos nas rotas de listagem (`?fields=`).
+#
+# Aceita nomes de campos e presets separados por vírgula, ex.: `fields=compact`,
+# `fields=id,valor,data` ou `fields=compact,ai_resumo`. Cada rota declara seus campos e
+# presets; "full" (todos os campos, o padrão) existe sempre. A rota usa a seleção para
+# estreitar a projeção SQL (colunas, joins, loaders) e o JSON de saída.
+
+
+def field_selection(fields: tuple[str, ...], presets: dict[str, tuple[str, ...]], required: tuple[str, ...] = ("id",)):
+    """
+    Cria a dependência que lê `fields=` e devolve os campos escolhidos, na ordem de `fields`.
+
+    `required` entra em toda seleção (ex.: o id, usado por paginação e loaders).
+    """
+    presets = {"full": fields, **presets}
+    description = (
+        "Campos separados por vírgula e/ou presets. "
+        + "; ".join(f"{name}: {','.join(preset)}" for name, preset in presets.items())
+    )
+
+    def dependency(
+        selected: Optional[str] = Query(None, alias="fields", description=description)
+    ) -> tuple[str, ...]:
+        if not selected:
+            return fields
+        chosen = set(required)
+        for token in selected.split(","):
+            token = token.strip()
+            if not token:
+                continue
+            if token in presets:
+                chosen.update(presets[token])
+            elif token in fields:
+                chosen.add(token)
+            else:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Campo desconhecido em fields: '{token}'. Use {sorted(fields)} ou {sorted(presets)}",
+                )
+        return tuple(f for f in fields if f in chosen)
+
+    return dependency
@@ -0,0 +1,43 @@
+from datetime import date
+from sqlalchemy import func
+
+# Filtros reutilizáveis pelas rotas. Preferimos predicados "sargable" (que um índice
+# consegue atender) a funções aplicadas sobre a coluna.
+
+def periodo_range(ano: int, mes: int | None = None) -> tuple[date, date]:
+    """Intervalo [início, fim) de um ano ou de um mês do ano."""
+    if mes:
+        start = date(ano, mes, 1)
+        end = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    else:
+        start = date(ano, 1, 1)
+        end = date(ano + 1, 1, 1)
+    return start, end
+
+def periodo_filters(column, ano: int | None = None, mes: int | None = None) -> list:
+    """
+    Filtros de ano/mês sobre uma coluna de data como range (col >= início AND col < fim),
+    que usa o índice da coluna, ao contrário de extract('year', col) = ano.
+
+    Mês sem ano ("todos os janeiros") não cabe num range e mantém o extract.
+    """
+    if ano:
+        start, end = periodo_range(ano, mes)
+        return [column >= start, column < end]
+    if mes:
+        return [func.extract('month', column) == mes]
+    return []
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def contains_text(column, term: str):
+    """
+    Busca por substring sem diferenciar caixa nem acentos ("joao" acha "João").
+
+    Gera f_unaccent(col) ILIKE f_unaccent('%termo%'), atendido pelos índices trigram
+    GIN criados sobre f_unaccent(col) (migration 9d2e6f1a4b70). Termos com menos de
+    3 caracteres não formam trigramas e acabam varrendo o índice inteiro.
+    """
+    pattern = f"%{_escape_like(term.strip())}%"
+    return func.f_unaccent(column).ilike(func.f_unaccent(pattern), escape="\\")
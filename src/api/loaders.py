@@ -0,0 +1,61 @@
+from collections import defaultdict
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.database import get_read_db
+from src.models.analise import AnaliseIA
+
+# entidade_tipo de AnaliseIA -> o que entidade_id referencia (ver src/services/ai_analyzer.py)
+#   GASTO: gastos_gabinete.id | VOTO: votos.id | PROPOSICAO: proposicoes.id | CROSS_DATA: politicos.id
+
+
+class AnaliseLoader:
+    """
+    Carregador em lote das análises IA, com escopo de requisição.
+
+    As rotas registram os ids da página (`add`) e `load` busca tudo com uma consulta
+    `IN` por tipo de entidade (índice ix_analises_entidade), em vez de um JOIN ou de
+    uma consulta por linha. Havendo mais de uma análise por entidade, vale a mais recente.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._pending: dict[str, set[int]] = defaultdict(set)
+        self._loaded: dict[tuple[str, int], AnaliseIA | None] = {}
+
+    def add(self, entidade_tipo: str, ids):
+        for entidade_id in ids:
+            if entidade_id is not None and (entidade_tipo, entidade_id) not in self._loaded:
+                self._pending[entidade_tipo].add(entidade_id)
+
+    async def load(self):
+        pending, self._pending = self._pending, defaultdict(set)
+        for entidade_tipo, ids in pending.items():
+            if not ids:
+                continue
+            result = await self.db.execute(
+                select(AnaliseIA)
+                .where(AnaliseIA.entidade_tipo == entidade_tipo, AnaliseIA.entidade_id.in_(ids))
+                .order_by(AnaliseIA.id)
+            )
+            for entidade_id in ids:
+                self._loaded[(entidade_tipo, entidade_id)] = None
+            # Ordenado por id: a última atribuição é a análise mais recente
+            for analise in result.scalars().all():
+                self._loaded[(entidade_tipo, analise.entidade_id)] = analise
+
+    def get(self, entidade_tipo: str, entidade_id: int) -> AnaliseIA | None:
+        return self._loaded.get((entidade_tipo, entidade_id))
+
+    async def attach(self, entidade_tipo: str, objects, attr: str = "analise"):
+        """Preenche `obj.<attr>` (campo `analise` dos schemas públicos) em cada objeto pelo `id`."""
+        self.add(entidade_tipo, [obj.id for obj in objects])
+        await self.load()
+        for obj in objects:
+            setattr(obj, attr, self.get(entidade_tipo, obj.id))
+        return objects
+
+
+async def get_analise_loader(db: AsyncSession = Depends(get_read_db)) -> AnaliseLoader:
+    # Mesma sessão da rota: o FastAPI resolve get_read_db uma vez por requisição
+    return AnaliseLoader(db)
@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from fastapi import HTTPException
+
+# Cursores opacos para paginação keyset: JSON compacto em base64 url-safe.
+# O conteúdo é detalhe de implementação de cada rota; o cliente só devolve o valor recebido.
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return payload
+
+def cursor_value(keyset: dict, key: str, parse):
+    """
+    Campo `key` de um cursor decodificado. `parse` é um tipo (int, str, float: checado sem
+    conversão) ou uma função de conversão (ex.: date.fromisoformat). Campo ausente ou
+    inválido vira 400, nunca 500.
+    """
+    try:
+        value = keyset[key]
+        if isinstance(parse, type):
+            # bool é subclasse de int; float aceita inteiros do JSON
+            accepted = (int, float) if parse is float else parse
+            if isinstance(value, bool) or not isinstance(value, accepted):
+                raise TypeError(key)
+            return value
+        return parse(value)
+    except (KeyError, TypeError, ValueError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Query
+from src.services import analytics
+from src.services.analytics import AnalyticsUnavailable
+from src.services.snapshot import current_snapshot, MANIFEST_FILE
+from typing import Optional
+import json
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+# Estas rotas não usam o Postgres: leem o snapshot Parquet local via DuckDB
+# (src/services/analytics.py). Resultados ficam em cache por versão do snapshot.
+
+
+async def _run(coro):
+    try:
+        return await coro
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/snapshot")
+async def get_snapshot():
+    """Versão publicada do snapshot analítico e contagem de linhas por tabela"""
+    snapshot = current_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Nenhum snapshot analítico publicado")
+    version, path = snapshot
+    try:
+        return json.loads((path / MANIFEST_FILE).read_text())
+    except FileNotFoundError:
+        return {"version": version}
+
+
+@router.get("/partidos/gastos-mensais")
+async def gastos_partido_mes(ano: int = Query(..., ge=2000, le=2100)):
+    """Total e quantidade de gastos por partido e mês"""
+    return await _run(analytics.gastos_partido_mes(ano))
+
+
+@router.get("/fornecedores/concentracao")
+async def concentracao_fornecedores(
+    ano: int = Query(..., ge=2000, le=2100),
+    tipo_despesa: Optional[str] = Query(None, description="Tipo de despesa exato (padrão: todos)"),
+    top: int = Query(20, ge=1, le=200),
+):
+    """
+    Concentração de fornecedores: maiores fornecedores, participação de cada um,
+    participação somada do top N e índice Herfindahl-Hirschman (0-10.000).
+    """
+    return await _run(analytics.concentracao_fornecedores(ano, tipo_despesa, top))
+
+
+@router.get("/votos/concordancia-partidos")
+async def concordancia_partidos(ano: int = Query(..., ge=2000, le=2100)):
+    """
+    Matriz de concordância entre partidos: fração das votações em que a maioria
+    (Sim/Não) dos dois partidos votou igual.
+    """
+    return await _run(analytics.concordancia_partidos(ano))
@@ -1,38 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from src.core.database import get_db
-from src.models.politico import Politico
+from sqlalchemy import func, literal_column, union_all, and_, tuple_, literal, JSON, DateTime
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from src.core.database import get_read_db
+from src.core.cache import cached
+from src.core.load_shedding import query_deadline
+from src.core.serialization import FastJSONResponse
+from src.api.loaders import AnaliseLoader, get_analise_loader
+from src.api.dimensions import DimensionCache, get_dimensions
+from src.api.fields import field_selection
+from src.api.pagination import encode_cursor, decode_cursor, cursor_value
+from src.models.politico import Politico, Partido
+from src.models.gasto import Gasto, Empresa
+from src.models.voto import Voto
+from src.models.votacao import Votacao
+from src.models.analise import AnaliseIA
+from src.models.proposicao import Proposicao, autoria_proposicao
+from src.models.resumo import GastoResumoAnual, GastoFornecedor, ConcentracaoFornecedores
 from src.schemas.public_api import PoliticoPublic, PoliticoDetail
-from typing import List
+from typing import List, Optional
+from datetime import datetime, time
+from itertools import islice
+import heapq
 
 router = APIRouter(prefix="/deputados", tags=["Deputados"])
 
+deputado_fields = field_selection(
+    tuple(PoliticoPublic.model_fields),
+    presets={"compact": ("id", "nome_parlamentar", "uf", "partido", "foto_url")},
+)
+
 @router.get("/", response_model=List[PoliticoPublic])
 async def list_deputados(
     partido: str = None, 
     uf: str = None,
+    nome: str = None,
     limit: int = 24,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    fields: tuple = Depends(deputado_fields),
+    dims: DimensionCache = Depends(get_dimensions)
 ):
-    query = select(Politico).options(selectinload(Politico.partido))
-    
-    if partido:
-        from src.models.politico import Partido
-        query = query.join(Politico.partido).filter(Partido.sigla == partido.upper())
-    if uf:
-        query = query.filter(Politico.uf == uf.upper())
-    
-    # Add pagination
-    query = query.offset(offset).limit(limit)
-        
-    result = await db.execute(query)
-    return result.scalars().all()
+    """Diretório de deputados. `fields=compact` deixa de fora a análise IA."""
+    # Diretório em memória (src/api/dimensions.py): filtro e paginação sem ir ao banco
+    deputados = dims.buscar_deputados(partido=partido, uf=uf, nome=nome, limit=limit, offset=offset)
+    include = set(fields)
+    return FastJSONResponse([d.model_dump(include=include) for d in deputados])
 
 @router.get("/{id}", response_model=PoliticoDetail)
-async def get_deputado(id: int, db: AsyncSession = Depends(get_db)):
+async def get_deputado(
+    id: int,
+    db: AsyncSession = Depends(get_read_db),
+    loader: AnaliseLoader = Depends(get_analise_loader)
+):
     query = select(Politico).where(Politico.id == id).options(selectinload(Politico.partido))
     result = await db.execute(query)
     deputado = result.scalar_one_or_none()
@@ -40,15 +61,351 @@ async def get_deputado(id: int, db: AsyncSession = Depends(get_db)):
     if not deputado:
         raise HTTPException(status_code=404, detail="Deputado não encontrado")
     
+    await loader.attach("CROSS_DATA", [deputado])
     return deputado
 
+PERFIL_TOP_FORNECEDORES = 10
+PERFIL_ANALISES = 5
+
+def _json_object(**columns):
+    # Chaves como literais: parâmetros sem tipo em json_build_object falham no asyncpg
+    args = []
+    for key, column in columns.items():
+        args.extend([literal_column(f"'{key}'"), column])
+    return func.json_build_object(*args)
+
+def _json_list(subquery, order_by, **columns):
+    """Subquery escalar: linhas de `subquery` como lista JSON ordenada ([] se vazia)"""
+    aggregated = func.json_agg(aggregate_order_by(_json_object(**columns), *order_by))
+    return (
+        select(func.coalesce(aggregated, literal_column("'[]'::json"), type_=JSON))
+        .select_from(subquery)
+        .scalar_subquery()
+    )
+
+def build_perfil_query(politico_id: int):
+    """Perfil completo de um deputado em um único SELECT (uma subquery escalar por seção)"""
+    anual = (
+        select(
+            GastoResumoAnual.ano,
+            func.sum(GastoResumoAnual.total).label("total"),
+            func.sum(GastoResumoAnual.qtd).label("qtd"),
+        )
+        .where(GastoResumoAnual.politico_id == politico_id)
+        .group_by(GastoResumoAnual.ano)
+        .subquery()
+    )
+
+    # literal_column: mesmo texto no SELECT e no GROUP BY
+    mes = func.to_char(Gasto.data_emissao, literal_column("'YYYY-MM'"))
+    mensal = (
+        select(mes.label("mes"), func.sum(Gasto.valor).label("total"), func.count().label("qtd"))
+        .where(Gasto.politico_id == politico_id, Gasto.data_emissao.isnot(None))
+        .group_by(mes)
+        .subquery()
+    )
+
+    # Do rollup gastos_fornecedor (uma linha por fornecedor-ano), não de gastos_gabinete
+    fornecedores = (
+        select(
+            GastoFornecedor.empresa_cnpj.label("cnpj"),
+            Empresa.nome_fantasia.label("nome"),
+            func.sum(GastoFornecedor.total).label("total"),
+            func.sum(GastoFornecedor.qtd).label("qtd"),
+        )
+        .join(Empresa, Empresa.cnpj == GastoFornecedor.empresa_cnpj)
+        .where(GastoFornecedor.politico_id == politico_id)
+        .group_by(GastoFornecedor.empresa_cnpj, Empresa.nome_fantasia)
+        .order_by(func.sum(GastoFornecedor.total).desc())
+        .limit(PERFIL_TOP_FORNECEDORES)
+        .subquery()
+    )
+
+    votos = (
+        select(Voto.tipo_voto, func.count().label("qtd"))
+        .where(Voto.politico_id == politico_id)
+        .group_by(Voto.tipo_voto)
+        .subquery()
+    )
+    votos_por_tipo = (
+        select(func.coalesce(
+            func.json_object_agg(votos.c.tipo_voto, votos.c.qtd),
+            literal_column("'{}'::json"),
+            type_=JSON,
+        ))
+        .select_from(votos)
+        .scalar_subquery()
+    )
+
+    total_proposicoes = (
+        select(func.count())
+        .select_from(autoria_proposicao)
+        .where(autoria_proposicao.c.politico_id == politico_id)
+        .scalar_subquery()
+    )
+
+    # Análises mais recentes: cruzada do deputado + de seus gastos
+    analise_cols = (AnaliseIA.entidade_tipo, AnaliseIA.entidade_id, AnaliseIA.score_anomalia,
+                    AnaliseIA.resumo_critico, AnaliseIA.created_at)
+    analises = union_all(
+        select(*analise_cols).where(
+            AnaliseIA.entidade_tipo == "CROSS_DATA", AnaliseIA.entidade_id == politico_id
+        ),
+        select(*analise_cols).join(Gasto, Gasto.id == AnaliseIA.entidade_id).where(
+            AnaliseIA.entidade_tipo == "GASTO", Gasto.politico_id == politico_id
+        ),
+    ).order_by(literal_column("created_at").desc()).limit(PERFIL_ANALISES).subquery()
+
+    return (
+        select(
+            Politico.id, Politico.nome_parlamentar, Politico.nome_civil, Politico.uf,
+            Politico.email, Politico.foto_url, Politico.id_legislatura,
+            Partido.id.label("partido_id"), Partido.sigla.label("partido_sigla"),
+            Partido.nome.label("partido_nome"), Partido.logo_url.label("partido_logo_url"),
+            _json_list(anual, [anual.c.ano], ano=anual.c.ano, total=anual.c.total, qtd=anual.c.qtd)
+                .label("gastos_anuais"),
+            _json_list(mensal, [mensal.c.mes], mes=mensal.c.mes, total=mensal.c.total, qtd=mensal.c.qtd)
+                .label("gastos_mensais"),
+            _json_list(fornecedores, [fornecedores.c.total.desc()], cnpj=fornecedores.c.cnpj,
+                       nome=fornecedores.c.nome, total=fornecedores.c.total, qtd=fornecedores.c.qtd)
+                .label("top_fornecedores"),
+            votos_por_tipo.label("votos_por_tipo"),
+            total_proposicoes.label("total_proposicoes"),
+            _json_list(analises, [analises.c.created_at.desc()], tipo=analises.c.entidade_tipo,
+                       entidade_id=analises.c.entidade_id, score_anomalia=analises.c.score_anomalia,
+                       resumo=analises.c.resumo_critico, created_at=analises.c.created_at)
+                .label("analises_recentes"),
+        )
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .where(Politico.id == politico_id)
+    )
+
+@router.get("/{id}/perfil")
+@cached(tags=("deputados", "votacoes", "analises", "deputado:{id}"))
+@query_deadline(3.0)
+async def get_deputado_perfil(id: int, db: AsyncSession = Depends(get_read_db)):
+    """
+    Perfil do deputado em uma chamada: identidade, partido, gastos por ano e por mês,
+    maiores fornecedores, votos por tipo, total de proposições de autoria e análises IA
+    recentes. Uma única consulta ao banco; em cache até a próxima ingestão do deputado.
+    """
+    row = (await db.execute(build_perfil_query(id))).mappings().one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Deputado não encontrado")
+
+    return {
+        "id": row["id"],
+        "nome_parlamentar": row["nome_parlamentar"],
+        "nome_civil": row["nome_civil"],
+        "uf": row["uf"],
+        "email": row["email"],
+        "foto_url": row["foto_url"],
+        "id_legislatura": row["id_legislatura"],
+        "partido": {
+            "id": row["partido_id"],
+            "sigla": row["partido_sigla"],
+            "nome": row["partido_nome"],
+            "logo_url": row["partido_logo_url"],
+        } if row["partido_id"] is not None else None,
+        "gastos_anuais": row["gastos_anuais"],
+        "gastos_mensais": row["gastos_mensais"],
+        "top_fornecedores": row["top_fornecedores"],
+        "votos_por_tipo": row["votos_por_tipo"],
+        "total_proposicoes": row["total_proposicoes"],
+        "analises_recentes": row["analises_recentes"],
+    }
+
+@router.get("/{id}/fornecedores")
+@cached(tags=("deputados", "deputado:{id}"))
+@query_deadline(3.0)
+async def get_deputado_fornecedores(
+    id: int,
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano (padrão: todos)"),
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Maiores fornecedores pagos pelo deputado, com participação no total, e a concentração
+    (HHI, top 1/top 5) de cada ano. Lido dos rollups gastos_fornecedor e fornecedores_concentracao.
+    """
+    if await db.scalar(select(Politico.id).where(Politico.id == id)) is None:
+        raise HTTPException(status_code=404, detail="Deputado não encontrado")
+
+    total = func.sum(GastoFornecedor.total)
+    stmt = (
+        select(
+            GastoFornecedor.empresa_cnpj, Empresa.nome_fantasia, total,
+            func.sum(GastoFornecedor.qtd), func.sum(total).over(),
+        )
+        .join(Empresa, Empresa.cnpj == GastoFornecedor.empresa_cnpj)
+        .where(GastoFornecedor.politico_id == id)
+        .group_by(GastoFornecedor.empresa_cnpj, Empresa.nome_fantasia)
+        .order_by(total.desc(), GastoFornecedor.empresa_cnpj)
+        .limit(limit)
+    )
+    concentracao = select(ConcentracaoFornecedores).where(ConcentracaoFornecedores.politico_id == id)
+    if ano:
+        stmt = stmt.where(GastoFornecedor.ano == ano)
+        concentracao = concentracao.where(ConcentracaoFornecedores.ano == ano)
+
+    rows = (await db.execute(stmt)).all()
+    anos = (await db.execute(concentracao.order_by(ConcentracaoFornecedores.ano.desc()))).scalars().all()
+    return {
+        "politico_id": id,
+        "ano": ano,
+        "fornecedores": [
+            {
+                "cnpj": cnpj, "nome": nome, "total": float(valor), "qtd": qtd,
+                "share": float(valor / soma) if soma else None,
+            }
+            for cnpj, nome, valor, qtd, soma in rows
+        ],
+        "concentracao": [
+            {
+                "ano": c.ano or None, "total": float(c.total), "fornecedores": c.fornecedores,
+                "hhi": c.hhi, "top1_share": c.top1_share, "top5_share": c.top5_share,
+            }
+            for c in anos
+        ],
+    }
+
+# Timeline: cada fonte é lida por keyset em (data, id) decrescente, no máximo limit + 1
+# linhas por fonte e página, e as listas são intercaladas com heapq.merge. O cursor é a
+# posição do último item na ordem global (data, fonte, id), válida para todas as fontes.
+TIMELINE_TIPOS = ("gasto", "voto", "proposicao")
+# Desempate entre fontes no mesmo instante
+_TIMELINE_RANK = {"gasto": 0, "voto": 1, "proposicao": 2}
+
+def _timeline_cursor(cursor: str) -> dict:
+    """Decodifica e valida o cursor da timeline; campo inválido vira 400."""
+    keyset = decode_cursor(cursor)
+    fonte = cursor_value(keyset, "s", int)
+    if fonte not in _TIMELINE_RANK.values():
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return {
+        "t": cursor_value(keyset, "t", datetime.fromisoformat),
+        "s": fonte,
+        # Votações têm id texto; gastos e proposições, inteiro
+        "id": cursor_value(keyset, "id", str if fonte == _TIMELINE_RANK["voto"] else int),
+    }
+
+def _timeline_after(tipo: str, data_col, id_col, keyset: dict):
+    """Filtro das linhas da fonte que vêm depois do cursor (já validado) na ordem global decrescente."""
+    # Tipado como timestamp: gastos (date) comparam como meia-noite, ainda pelo índice
+    instante = literal(keyset["t"], DateTime)
+    rank = _TIMELINE_RANK[tipo]
+    if rank < keyset["s"]:
+        return data_col <= instante
+    if rank > keyset["s"]:
+        return data_col < instante
+    return tuple_(data_col, id_col) < tuple_(instante, keyset["id"])
+
+def _timeline_sources(politico_id: int, tipos: tuple) -> list:
+    """(tipo, SELECT, coluna de data, coluna de id) de cada fonte pedida."""
+    sources = []
+    if "gasto" in tipos:
+        # ix_gastos_politico_data (politico_id, data_emissao, id)
+        sources.append(("gasto", select(
+            Gasto.id, Gasto.data_emissao.label("data"), Gasto.ext_id, Gasto.valor,
+            Gasto.tipo_despesa, Gasto.empresa_cnpj, Gasto.url_documento,
+        ).where(Gasto.politico_id == politico_id), Gasto.data_emissao, Gasto.id))
+    if "voto" in tipos:
+        # Percorre ix_votacoes_data_id e sonda o voto do deputado em ix_votos_votacao_politico
+        sources.append(("voto", select(
+            Votacao.id, Votacao.data, Votacao.sigla_orgao, Votacao.descricao, Votacao.aprovacao,
+            Votacao.proposicao_id, Voto.tipo_voto,
+        ).join(Voto, and_(Voto.votacao_id == Votacao.id, Voto.politico_id == politico_id)),
+            Votacao.data, Votacao.id))
+    if "proposicao" in tipos:
+        sources.append(("proposicao", select(
+            Proposicao.id, Proposicao.data_apresentacao.label("data"), Proposicao.sigla_tipo,
+            Proposicao.numero, Proposicao.ano, Proposicao.ementa,
+        ).join(autoria_proposicao, and_(
+            autoria_proposicao.c.proposicao_id == Proposicao.id,
+            autoria_proposicao.c.politico_id == politico_id,
+        )), Proposicao.data_apresentacao, Proposicao.id))
+    return sources
+
+def _timeline_item(tipo: str, row) -> dict:
+    if tipo == "gasto":
+        return {
+            "tipo": tipo, "data": row.data, "id": row.ext_id, "valor": float(row.valor),
+            "tipo_despesa": row.tipo_despesa, "fornecedor": row.empresa_cnpj,
+            "url_documento": row.url_documento,
+        }
+    if tipo == "voto":
+        return {
+            "tipo": tipo, "data": row.data, "id": row.id, "tipo_voto": row.tipo_voto,
+            "sigla_orgao": row.sigla_orgao, "descricao": row.descricao,
+            "aprovacao": row.aprovacao, "proposicao_id": row.proposicao_id,
+        }
+    return {
+        "tipo": tipo, "data": row.data, "id": row.id, "sigla_tipo": row.sigla_tipo,
+        "numero": row.numero, "ano": row.ano, "ementa": row.ementa,
+    }
+
+@router.get("/{id}/timeline")
+@cached(tags=("votacoes", "proposicoes", "deputado:{id}"))
+@query_deadline(3.0)
+async def get_deputado_timeline(
+    id: int,
+    tipos: Optional[str] = Query(None, description="Fontes separadas por vírgula: gasto, voto, proposicao (padrão: todas)"),
+    limit: int = Query(30, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Atividade do deputado em ordem cronológica decrescente: gastos, votos e proposições
+    de autoria intercalados. Cada página lê no máximo limit + 1 linhas de cada fonte por
+    índice, sem UNION sobre o histórico nem OFFSET; envie `next_cursor` para continuar
+    (com as mesmas `tipos`). Itens sem data ficam de fora.
+    """
+    selecionados = tuple(t.strip() for t in tipos.split(",") if t.strip()) if tipos else TIMELINE_TIPOS
+    desconhecidos = set(selecionados) - set(TIMELINE_TIPOS)
+    if desconhecidos or not selecionados:
+        raise HTTPException(status_code=400, detail=f"tipos aceita {', '.join(TIMELINE_TIPOS)}")
+
+    if await db.scalar(select(Politico.id).where(Politico.id == id)) is None:
+        raise HTTPException(status_code=404, detail="Deputado não encontrado")
+
+    keyset = _timeline_cursor(cursor) if cursor else None
+    streams = []
+    for tipo, stmt, data_col, id_col in _timeline_sources(id, selecionados):
+        stmt = stmt.where(data_col.isnot(None))
+        if keyset:
+            stmt = stmt.where(_timeline_after(tipo, data_col, id_col, keyset))
+        stmt = stmt.order_by(data_col.desc(), id_col.desc()).limit(limit + 1)
+        rows = (await db.execute(stmt)).all()
+        rank = _TIMELINE_RANK[tipo]
+        # Chave global: gastos (date) contam como meia-noite do dia
+        streams.append([
+            (row.data if isinstance(row.data, datetime) else datetime.combine(row.data, time.min), rank, row.id, tipo, row)
+            for row in rows
+        ])
+
+    # Cada lista já está em ordem decrescente; o merge só consome o que a página usa
+    merged = heapq.merge(*streams, key=lambda entry: entry[:3], reverse=True)
+    page = list(islice(merged, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    next_cursor = None
+    if has_more:
+        instante, rank, last_id, _, _ = page[-1]
+        next_cursor = encode_cursor({"t": instante.isoformat(), "s": rank, "id": last_id})
+
+    return {
+        "politico_id": id,
+        "items": [_timeline_item(tipo, row) for _, _, _, tipo, row in page],
+        "next_cursor": next_cursor,
+    }
+
 @router.get("/partidos/", response_model=List[dict])
-async def list_partidos(db: AsyncSession = Depends(get_db)):
+async def list_partidos(dims: DimensionCache = Depends(get_dimensions)):
     """Fetch all political parties for filter dropdowns"""
-    from src.models.politico import Partido
-    
-    query = select(Partido).order_by(Partido.sigla)
-    result = await db.execute(query)
-    partidos = result.scalars().all()
-    
-    return [{"id": p.id, "sigla": p.sigla, "nome": p.nome} for p in partidos]
+    return dims.partidos
+
+@router.get("/ufs/", response_model=List[str])
+async def list_ufs(dims: DimensionCache = Depends(get_dimensions)):
+    """UFs com deputados, para os filtros"""
+    return dims.ufs
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from src.core.database import read_session_factory
+from src.api.routes.gastos import exploration_filters
+from src.services.export import EXPORT_FORMATS, ExportError, check_format, stream_export
+from typing import Optional
+from datetime import datetime
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+FORMAT_QUERY = Query("csv", enum=list(EXPORT_FORMATS), description="csv, ndjson ou parquet")
+
+
+async def _stream(request: Request, dataset: str, fmt: str, filters: dict):
+    try:
+        check_format(fmt)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type, extension = EXPORT_FORMATS[fmt]
+    filename = f"{dataset}_{datetime.now():%Y%m%d_%H%M%S}.{extension}"
+    session_factory = await read_session_factory(request)
+    return StreamingResponse(
+        stream_export(session_factory, dataset, fmt, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/gastos")
+async def export_gastos(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    filters: dict = Depends(exploration_filters),
+):
+    """
+    Exporta gastos com os mesmos filtros de /gastos/exploration, em um único download.
+
+    O resultado é lido com cursor no servidor e enviado em partes (memória constante);
+    um ano inteiro cabe em uma requisição. Ordenado por id interno.
+    """
+    return await _stream(request, "gastos", format, filters)
+
+
+@router.get("/votos")
+async def export_votos(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    politico_id: Optional[int] = Query(None),
+    ano: Optional[int] = Query(None),
+    votacao_id: Optional[str] = Query(None),
+):
+    """Exporta votos nominais (com data e proposição da votação)"""
+    filters = dict(politico_id=politico_id, ano=ano, votacao_id=votacao_id)
+    return await _stream(request, "votos", format, filters)
+
+
+@router.get("/proposicoes")
+async def export_proposicoes(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    politico_id: Optional[int] = Query(None, description="Apenas proposições de autoria do deputado"),
+    ano: Optional[int] = Query(None),
+    sigla_tipo: Optional[str] = Query(None),
+):
+    """Exporta proposições (com ementa)"""
+    filters = dict(politico_id=politico_id, ano=ano, sigla_tipo=sigla_tipo)
+    return await _stream(request, "proposicoes", format, filters)
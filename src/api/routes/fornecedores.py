@@ -0,0 +1,157 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from src.core.database import get_read_db
+from src.core.cache import cached
+from src.core.load_shedding import query_deadline
+from src.models.gasto import Empresa
+from src.models.politico import Politico, Partido
+from src.models.resumo import GastoFornecedor, FornecedorAnual, ConcentracaoFornecedores
+from typing import Optional
+
+router = APIRouter(prefix="/fornecedores", tags=["Fornecedores"])
+
+# Tudo aqui lê os rollups de fornecedores (src/services/rollups.py), mantidos pela ingestão
+# de gastos; nenhuma rota agrupa gastos_gabinete.
+
+CONCENTRACAO_ORDENS = {
+    "hhi": ConcentracaoFornecedores.hhi,
+    "top1_share": ConcentracaoFornecedores.top1_share,
+    "top5_share": ConcentracaoFornecedores.top5_share,
+}
+
+@router.get("/ranking")
+@cached(tags=("gastos",))
+@query_deadline(5.0)
+async def get_ranking_fornecedores(
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano (padrão: todos)"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fornecedores que mais receberam, com quantidade de documentos e de deputados pagantes."""
+    if ano:
+        # Uma linha por fornecedor no ano: ordem direto do índice (ano, total)
+        stmt = (
+            select(
+                FornecedorAnual.empresa_cnpj.label("cnpj"), FornecedorAnual.total.label("total"),
+                FornecedorAnual.qtd.label("qtd"), FornecedorAnual.deputados.label("deputados"),
+            )
+            .where(FornecedorAnual.ano == ano)
+            .order_by(FornecedorAnual.total.desc(), FornecedorAnual.empresa_cnpj)
+        )
+    else:
+        # Somar deputados de cada ano contaria o mesmo deputado várias vezes
+        total = func.sum(GastoFornecedor.total)
+        stmt = (
+            select(
+                GastoFornecedor.empresa_cnpj.label("cnpj"), total.label("total"),
+                func.sum(GastoFornecedor.qtd).label("qtd"),
+                func.count(GastoFornecedor.politico_id.distinct()).label("deputados"),
+            )
+            .group_by(GastoFornecedor.empresa_cnpj)
+            .order_by(total.desc(), GastoFornecedor.empresa_cnpj)
+        )
+    ranking = stmt.offset(offset).limit(limit).subquery()
+
+    result = await db.execute(
+        select(ranking, Empresa.nome_fantasia)
+        .join(Empresa, Empresa.cnpj == ranking.c.cnpj)
+        .order_by(ranking.c.total.desc(), ranking.c.cnpj)
+    )
+    return [
+        {"cnpj": cnpj, "nome": nome, "total": float(total), "qtd": qtd, "deputados": deputados}
+        for cnpj, total, qtd, deputados, nome in result.all()
+    ]
+
+@router.get("/concentracao")
+@cached(tags=("gastos", "deputados"))
+@query_deadline(3.0)
+async def get_ranking_concentracao(
+    ano: int = Query(..., ge=2000, le=2100),
+    ordem: str = Query("hhi", description="hhi, top1_share ou top5_share"),
+    min_total: float = Query(10000, ge=0, description="Ignora deputados com pouco gasto identificado"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Deputados cujos gastos do ano se concentram em menos fornecedores.
+
+    hhi de 0 a 10.000 (acima de 2.500 é considerado alta concentração); as shares são frações
+    do total pago a fornecedores com CNPJ/CPF.
+    """
+    if ordem not in CONCENTRACAO_ORDENS:
+        raise HTTPException(status_code=400, detail=f"ordem deve ser uma de {sorted(CONCENTRACAO_ORDENS)}")
+    order_col = CONCENTRACAO_ORDENS[ordem]
+
+    result = await db.execute(
+        select(ConcentracaoFornecedores, Politico.nome_parlamentar, Politico.uf, Partido.sigla)
+        .join(Politico, Politico.id == ConcentracaoFornecedores.politico_id)
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .where(
+            ConcentracaoFornecedores.ano == ano,
+            ConcentracaoFornecedores.total >= min_total,
+            order_col.is_not(None),
+        )
+        .order_by(order_col.desc(), ConcentracaoFornecedores.politico_id)
+        .limit(limit)
+    )
+    return [
+        {
+            "politico_id": c.politico_id, "nome": nome, "uf": uf, "partido": sigla,
+            "total": float(c.total), "fornecedores": c.fornecedores,
+            "hhi": c.hhi, "top1_share": c.top1_share, "top5_share": c.top5_share,
+        }
+        for c, nome, uf, sigla in result.all()
+    ]
+
+@router.get("/{cnpj}")
+@cached(tags=("gastos", "deputados"))
+@query_deadline(3.0)
+async def get_fornecedor(
+    cnpj: str,
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano (padrão: todos)"),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Totais anuais de um fornecedor e os deputados que o pagaram, do maior para o menor."""
+    empresa = await db.scalar(select(Empresa).where(Empresa.cnpj == cnpj))
+    if empresa is None:
+        raise HTTPException(status_code=404, detail="Fornecedor não encontrado")
+
+    anual = await db.execute(
+        select(FornecedorAnual.ano, FornecedorAnual.total, FornecedorAnual.qtd, FornecedorAnual.deputados)
+        .where(FornecedorAnual.empresa_cnpj == cnpj)
+        .order_by(FornecedorAnual.ano.desc())
+    )
+
+    total = func.sum(GastoFornecedor.total)
+    stmt = (
+        select(
+            Politico.id, Politico.nome_parlamentar, Politico.uf, Partido.sigla,
+            total, func.sum(GastoFornecedor.qtd),
+        )
+        .join(Politico, Politico.id == GastoFornecedor.politico_id)
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .where(GastoFornecedor.empresa_cnpj == cnpj)
+        .group_by(Politico.id, Partido.sigla)
+        .order_by(total.desc(), Politico.id)
+        .limit(limit)
+    )
+    if ano:
+        stmt = stmt.where(GastoFornecedor.ano == ano)
+    deputados = await db.execute(stmt)
+
+    return {
+        "cnpj": empresa.cnpj,
+        "nome": empresa.nome_fantasia,
+        "anos": [
+            # ano 0: gastos sem data de emissão
+            {"ano": a or None, "total": float(t), "qtd": q, "deputados": d}
+            for a, t, q, d in anual.all()
+        ],
+        "deputados": [
+            {"id": pid, "nome": nome, "uf": uf, "partido": sigla, "total": float(t), "qtd": q}
+            for pid, nome, uf, sigla, t, q in deputados.all()
+        ],
+    }
@@ -1,116 +1,386 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from src.core.database import get_db
-from src.models.gasto import Gasto
+from sqlalchemy import select, func, and_, or_, tuple_, literal_column, union_all
+from src.core.database import get_read_db
+from src.core.cache import cached
+from src.core.load_shedding import query_deadline
+from src.core.serialization import FastJSONResponse
+from src.api.dimensions import DimensionCache, get_dimensions
+from src.api.fields import field_selection
+from src.api.pagination import encode_cursor, decode_cursor, cursor_value
+from src.api.counting import COUNT_MODES, count_rows, no_count, rollup_countable, count_gastos_rollup
+from src.api.filters import periodo_filters, contains_text
+from src.models.gasto import Empresa
 from src.models.politico import Politico, Partido
-from src.models.analise import AnaliseIA
+from src.models.resumo import GastoMensal, GastoMensalUF, GastoMensalPartido
+from src.models.exploracao import GastoExploracao
 from typing import Optional
 from datetime import date
+from decimal import Decimal
 
 router = APIRouter(prefix="/gastos", tags=["Gastos"])
 
-@router.get("/exploration")
-async def get_gastos_exploration(
-    db: AsyncSession = Depends(get_db),
+def build_exploration_query(
+    politico_id: Optional[int] = None,
+    politico_nome: Optional[str] = None,
+    sigla_partido: Optional[str] = None,
+    uf: Optional[str] = None,
+    ano: Optional[int] = None,
+    mes: Optional[int] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    tipo_despesa: Optional[str] = None,
+    fornecedor: Optional[str] = None,
+    min_valor: Optional[float] = None,
+    max_valor: Optional[float] = None,
+    has_ai_analysis: Optional[bool] = None,
+    min_score: Optional[float] = None,
+):
+    """
+    SELECT filtrado da exploração, sem ordenação nem paginação (reutilizado por scripts).
+
+    Lê só o read model gastos_exploracao (src/models/exploracao.py): deputado, partido,
+    fornecedor e análise IA já estão na linha, então nenhum filtro precisa de join.
+    """
+    stmt = select(GastoExploracao)
+
+    # Apply filters
+    filters = []
+    if politico_id:
+        filters.append(GastoExploracao.politico_id == politico_id)
+    if politico_nome:
+        filters.append(contains_text(GastoExploracao.politico_nome, politico_nome))
+    if sigla_partido:
+        filters.append(contains_text(GastoExploracao.partido_sigla, sigla_partido))
+    if uf:
+        filters.append(GastoExploracao.uf == uf.upper())
+    if data_inicio:
+        filters.append(GastoExploracao.data_emissao >= data_inicio)
+    if data_fim:
+        filters.append(GastoExploracao.data_emissao <= data_fim)
+    filters.extend(periodo_filters(GastoExploracao.data_emissao, ano, mes))
+    if tipo_despesa:
+        filters.append(contains_text(GastoExploracao.tipo_despesa, tipo_despesa))
+    if fornecedor:
+        # Nome do fornecedor ou prefixo do CNPJ/CPF
+        filters.append(or_(
+            contains_text(GastoExploracao.fornecedor_nome, fornecedor),
+            GastoExploracao.empresa_cnpj.startswith(fornecedor.strip(), autoescape=True),
+        ))
+    if min_valor:
+        filters.append(GastoExploracao.valor >= min_valor)
+    if max_valor:
+        filters.append(GastoExploracao.valor <= max_valor)
+    if has_ai_analysis is not None:
+        filters.append(GastoExploracao.has_analise.is_(has_ai_analysis))
+    if min_score is not None:
+        # Só gastos analisados têm score (índice parcial ix_gastos_exploracao_score)
+        filters.append(GastoExploracao.has_analise.is_(True))
+        filters.append(GastoExploracao.score_anomalia >= min_score)
+
+    if filters:
+        stmt = stmt.where(and_(*filters))
+
+    return stmt
+
+def exploration_filters(
     politico_id: Optional[int] = Query(None),
     politico_nome: Optional[str] = Query(None),
     sigla_partido: Optional[str] = Query(None),
+    uf: Optional[str] = Query(None, min_length=2, max_length=2),
     ano: Optional[int] = Query(None),
     mes: Optional[int] = Query(None),
     data_inicio: Optional[date] = Query(None),
     data_fim: Optional[date] = Query(None),
     tipo_despesa: Optional[str] = Query(None),
+    fornecedor: Optional[str] = Query(None, description="Nome do fornecedor (sem acento/caixa) ou prefixo do CNPJ"),
     min_valor: Optional[float] = Query(None),
     max_valor: Optional[float] = Query(None),
     has_ai_analysis: Optional[bool] = Query(None),
+    min_score: Optional[float] = Query(None, ge=0, le=1, description="Score mínimo de anomalia da análise IA"),
+) -> dict:
+    """Filtros da exploração como dependência (também usados por /export/gastos)"""
+    return dict(
+        politico_id=politico_id, politico_nome=politico_nome, sigla_partido=sigla_partido, uf=uf,
+        ano=ano, mes=mes, data_inicio=data_inicio, data_fim=data_fim, tipo_despesa=tipo_despesa,
+        fornecedor=fornecedor, min_valor=min_valor, max_valor=max_valor, has_ai_analysis=has_ai_analysis,
+        min_score=min_score,
+    )
+
+def _finite_decimal(value) -> Decimal:
+    # O cursor guarda o valor como texto (encode_cursor usa default=str)
+    number = Decimal(str(value))
+    if not number.is_finite():
+        raise ValueError(value)
+    return number
+
+# Campos de cada item da exploração e a coluna do read model de onde saem
+EXPLORATION_FIELDS = {
+    "id": GastoExploracao.ext_id,
+    "data": GastoExploracao.data_emissao,
+    "valor": GastoExploracao.valor,
+    "tipo": GastoExploracao.tipo_despesa,
+    "fornecedor": GastoExploracao.empresa_cnpj,
+    "fornecedor_nome": GastoExploracao.fornecedor_nome,
+    "politico": GastoExploracao.politico_nome,
+    "partido": GastoExploracao.partido_sigla,
+    "uf": GastoExploracao.uf,
+    "score_anomalia": GastoExploracao.score_anomalia,
+    "ai_resumo": GastoExploracao.ai_resumo,
+}
+
+exploration_fields = field_selection(
+    tuple(EXPLORATION_FIELDS),
+    presets={"compact": ("id", "data", "valor", "tipo", "politico")},
+)
+
+@router.get("/exploration")
+@query_deadline(8.0)
+async def get_gastos_exploration(
+    db: AsyncSession = Depends(get_read_db),
+    filters: dict = Depends(exploration_filters),
+    fields: tuple = Depends(exploration_fields),
     sort_by: str = Query("data", enum=["data", "valor"]),
     sort_order: str = Query("desc", enum=["asc", "desc"]),
     page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100)
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor/prev_cursor) para paginação keyset"),
+    include_total: bool = Query(True, description="false pula a contagem (recomendado no modo cursor)"),
+    count_mode: str = Query("auto", enum=COUNT_MODES),
 ):
-    # Base query joining Gasto with Politico, Partido and optionally AnaliseIA
-    stmt = (
-        select(Gasto, Politico.nome_parlamentar, Partido.sigla, AnaliseIA.resumo_critico)
-        .join(Politico, Gasto.politico_id == Politico.id)
-        .join(Partido, Politico.partido_id == Partido.id)
-        .outerjoin(AnaliseIA, and_(
-            AnaliseIA.entidade_id == Gasto.ext_id,
-            AnaliseIA.entidade_tipo == "GASTO"
-        ))
-    )
+    """
+    Exploração de gastos com filtros.
 
-    # Apply filters
-    filters = []
-    if politico_id:
-        filters.append(Gasto.politico_id == politico_id)
-    if politico_nome:
-        filters.append(Politico.nome_parlamentar.ilike(f"%{politico_nome}%"))
-    if sigla_partido:
-        filters.append(Partido.sigla.ilike(f"%{sigla_partido}%"))
-    if data_inicio:
-        filters.append(Gasto.data_emissao >= data_inicio)
-    if data_fim:
-        filters.append(Gasto.data_emissao <= data_fim)
-    if ano:
-        filters.append(func.extract('year', Gasto.data_emissao) == ano)
-    if mes:
-        filters.append(func.extract('month', Gasto.data_emissao) == mes)
-    if tipo_despesa:
-        filters.append(Gasto.tipo_despesa.ilike(f"%{tipo_despesa}%"))
-    if min_valor:
-        filters.append(Gasto.valor >= min_valor)
-    if max_valor:
-        filters.append(Gasto.valor <= max_valor)
-    if has_ai_analysis is not None:
-        if has_ai_analysis:
-            filters.append(AnaliseIA.id != None)
-        else:
-            filters.append(AnaliseIA.id == None)
+    Paginação por número de página (`page`) ou keyset (`cursor`). No modo cursor a
+    ordenação é (coluna de ordenação, id), então páginas profundas custam o mesmo que
+    a primeira e não se deslocam quando a ingestão insere novos gastos. Na ordenação
+    por data, gastos sem `data_emissao` ficam de fora do modo cursor.
 
-    if filters:
-        stmt = stmt.where(and_(*filters))
+    O total segue `count_mode` (ver src/api/counting.py): por padrão é exato até
+    10.000 linhas e "10,000+" acima disso; `include_total=false` não conta nada.
+    Filtrando só por deputado/ano/mês, o total exato vem do rollup gastos_mensal.
+
+    `fields` escolhe os campos de cada item (preset `compact` para listas em telas
+    pequenas). Tudo sai de uma única tabela desnormalizada (gastos_exploracao),
+    mantida pela ingestão e pelo analisador IA.
+    """
+    keyset = decode_cursor(cursor) if cursor else None
+    if keyset and (keyset.get("s") != sort_by or keyset.get("o") != sort_order):
+        raise HTTPException(status_code=400, detail="Cursor não corresponde à ordenação solicitada")
+
+    stmt = build_exploration_query(**filters)
 
-    # Count total for pagination
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total_count = await db.scalar(count_stmt)
+    # Count total for pagination (somente a PK)
+    if include_total and count_mode in ("auto", "exact") and rollup_countable(filters):
+        count = await count_gastos_rollup(db, filters["politico_id"], filters["ano"], filters["mes"])
+    elif include_total:
+        count = await count_rows(db, stmt.with_only_columns(GastoExploracao.gasto_id), count_mode)
+    else:
+        count = no_count()
+
+    # Paging and ordering: (coluna, id) garante ordem total, necessária para o keyset
+    order_col = GastoExploracao.data_emissao if sort_by == "data" else GastoExploracao.valor
+    descending = sort_order == "desc"
+    backwards = bool(keyset) and keyset.get("d") == "prev"
+    if backwards:
+        # Para voltar uma página, percorre no sentido inverso e reverte o resultado
+        descending = not descending
+
+    if keyset:
+        if sort_by == "data":
+            stmt = stmt.where(GastoExploracao.data_emissao.isnot(None))
+            boundary = cursor_value(keyset, "v", date.fromisoformat)
+        else:
+            boundary = cursor_value(keyset, "v", _finite_decimal)
+        row_key = tuple_(order_col, GastoExploracao.gasto_id)
+        cursor_key = tuple_(boundary, cursor_value(keyset, "id", int))
+        stmt = stmt.where(row_key < cursor_key if descending else row_key > cursor_key)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
 
-    # Paging and ordering
-    order_col = Gasto.data_emissao if sort_by == "data" else Gasto.valor
-    if sort_order == "desc":
-        stmt = stmt.order_by(order_col.desc())
+    if descending:
+        stmt = stmt.order_by(order_col.desc(), GastoExploracao.gasto_id.desc())
     else:
-        stmt = stmt.order_by(order_col.asc())
-        
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-    
+        stmt = stmt.order_by(order_col.asc(), GastoExploracao.gasto_id.asc())
+
+    # Uma linha a mais indica se existe próxima página
+    stmt = stmt.limit(page_size + 1)
+
+    # Só as colunas dos campos pedidos (mais id e ordenação, para cursores):
+    # tuplas direto para o JSON, sem instanciar objetos ORM
+    columns = {"gasto_id": GastoExploracao.gasto_id, "ordem": order_col}
+    for field in fields:
+        columns[field] = EXPLORATION_FIELDS[field]
+    stmt = stmt.with_only_columns(*(column.label(name) for name, column in columns.items()))
     result = await db.execute(stmt)
-    items = []
-    for row in result.all():
-        gasto, nome_politico, partido, ai_resumo = row
-        items.append({
-            "id": gasto.ext_id,
-            "data": gasto.data_emissao,
-            "valor": float(gasto.valor),
-            "tipo": gasto.tipo_despesa,
-            "fornecedor": gasto.empresa_cnpj, # Could join Empresa for name later
-            "politico": nome_politico,
-            "partido": partido,
-            "ai_resumo": ai_resumo
-        })
+    rows = result.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
 
-    return {
-        "total": total_count,
-        "page": page,
+    # valor/score: Decimal -> número no FastJSONResponse
+    items = [{field: getattr(row, field) for field in fields} for row in rows]
+
+    def _cursor_for(row, direction):
+        if row.ordem is None:
+            return None
+        return encode_cursor({"s": sort_by, "o": sort_order, "v": row.ordem, "id": row.gasto_id, "d": direction})
+
+    next_cursor = prev_cursor = None
+    if rows:
+        # Indo para trás, a existência de páginas seguintes é garantida pelo cursor recebido
+        if has_more or backwards:
+            next_cursor = _cursor_for(rows[-1], "next")
+        if (keyset and not backwards) or (backwards and has_more) or (not keyset and page > 1):
+            prev_cursor = _cursor_for(rows[0], "prev")
+
+    # Resposta direta: pula o jsonable_encoder (cópia recursiva de cada item)
+    return FastJSONResponse({
+        **count,
+        "page": None if keyset else page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
         "items": items
+    })
+
+@router.get("/series")
+@cached(tags=("gastos",))
+@query_deadline(3.0)
+async def get_gastos_series(
+    politico_id: Optional[int] = Query(None),
+    uf: Optional[str] = Query(None),
+    sigla_partido: Optional[str] = Query(None),
+    tipo_despesa: Optional[str] = Query(None, description="Tipo exato (como em /gastos/tipos-despesa/)"),
+    ano_inicio: Optional[int] = Query(None),
+    ano_fim: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Série mensal de gastos (total e quantidade) de um deputado, UF, partido ou do país.
+
+    Lida dos rollups gastos_mensal/_uf/_partido, mantidos pela ingestão; prioridade do
+    recorte: politico_id > sigla_partido > uf > nacional.
+    """
+    if politico_id:
+        model = GastoMensal
+        scope = [GastoMensal.politico_id == politico_id]
+    elif sigla_partido:
+        model = GastoMensalPartido
+        scope = [GastoMensalPartido.partido_id.in_(
+            select(Partido.id).where(Partido.sigla == sigla_partido.upper())
+        )]
+    else:
+        # Nacional: a agregação por UF tem as mesmas somas com menos linhas
+        model = GastoMensalUF
+        scope = [GastoMensalUF.uf == uf.upper()] if uf else []
+
+    stmt = (
+        select(model.ano, model.mes, func.sum(model.total), func.sum(model.qtd))
+        .where(model.ano > 0, *scope)  # ano 0: gastos sem data
+        .group_by(model.ano, model.mes)
+        .order_by(model.ano, model.mes)
+    )
+    if tipo_despesa is not None:
+        stmt = stmt.where(model.tipo_despesa == tipo_despesa)
+    if ano_inicio:
+        stmt = stmt.where(model.ano >= ano_inicio)
+    if ano_fim:
+        stmt = stmt.where(model.ano <= ano_fim)
+
+    result = await db.execute(stmt)
+    return [
+        {"ano": ano, "mes": mes, "total": float(total), "qtd": qtd}
+        for ano, mes, total, qtd in result.all()
+    ]
+
+@router.get("/benchmark")
+@cached(tags=("gastos", "deputados"))
+@query_deadline(3.0)
+async def get_gastos_benchmark(
+    politico_id: int = Query(...),
+    ano: int = Query(..., ge=2000, le=2100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Gastos do deputado no ano por tipo de despesa, comparados à média por deputado
+    da sua UF, do seu partido e nacional (deputados com gastos no ano). Rollups mensais.
+    """
+    politico = (await db.execute(
+        select(Politico.uf, Politico.partido_id, Partido.sigla)
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .where(Politico.id == politico_id)
+    )).one_or_none()
+    if politico is None:
+        raise HTTPException(status_code=404, detail="Deputado não encontrado")
+    uf, partido_id, sigla = politico
+
+    def _por_tipo(scope, model, *where):
+        return (
+            select(literal_column(f"'{scope}'").label("escopo"), model.tipo_despesa, func.sum(model.total).label("total"))
+            .where(model.ano == ano, *where)
+            .group_by(model.tipo_despesa)
+        )
+
+    totais = await db.execute(union_all(
+        _por_tipo("deputado", GastoMensal, GastoMensal.politico_id == politico_id),
+        _por_tipo("uf", GastoMensalUF, GastoMensalUF.uf == uf),
+        _por_tipo("partido", GastoMensalPartido, GastoMensalPartido.partido_id == partido_id),
+        _por_tipo("nacional", GastoMensalUF),
+    ))
+
+    # Deputados com gastos no ano, em cada recorte
+    deputados = func.count(GastoMensal.politico_id.distinct())
+    n_nacional, n_uf, n_partido = (await db.execute(
+        select(
+            deputados,
+            deputados.filter(Politico.uf == uf),
+            deputados.filter(Politico.partido_id == partido_id),
+        )
+        .join(Politico, Politico.id == GastoMensal.politico_id)
+        .where(GastoMensal.ano == ano)
+    )).one()
+    divisores = {"deputado": 1, "uf": n_uf, "partido": n_partido, "nacional": n_nacional}
+
+    categorias = {}
+    for escopo, tipo, total in totais.all():
+        linha = categorias.setdefault(tipo, {"tipo_despesa": tipo or None, "deputado": 0.0,
+                                             "uf": 0.0, "partido": 0.0, "nacional": 0.0})
+        linha[escopo] = float(total) / divisores[escopo] if divisores[escopo] else 0.0
+
+    itens = sorted(categorias.values(), key=lambda c: c["nacional"], reverse=True)
+    return {
+        "politico_id": politico_id,
+        "ano": ano,
+        "uf": uf,
+        "partido": sigla,
+        "deputados": {"uf": n_uf, "partido": n_partido, "nacional": n_nacional},
+        "total": {k: sum(c[k] for c in itens) for k in ("deputado", "uf", "partido", "nacional")},
+        "categorias": itens,
     }
 
 @router.get("/tipos-despesa/")
-async def list_tipos_despesa(db: AsyncSession = Depends(get_db)):
-    """Fetch all distinct expense types for filter dropdowns"""
-    query = select(Gasto.tipo_despesa).distinct().where(Gasto.tipo_despesa.isnot(None)).order_by(Gasto.tipo_despesa)
+async def list_tipos_despesa(dims: DimensionCache = Depends(get_dimensions)):
+    """Tipos de despesa para os filtros, do lookup tipos_despesa em memória"""
+    return [{"tipo": tipo} for tipo in dims.tipos_despesa]
+
+@router.get("/fornecedores/")
+@query_deadline(2.0)
+async def search_fornecedores(
+    q: str = Query(..., min_length=2, description="Parte do nome do fornecedor ou prefixo do CNPJ"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Typeahead de fornecedores: substring sem acento no nome, mais parecidos primeiro"""
+    query = (
+        select(Empresa.cnpj, Empresa.nome_fantasia)
+        .where(or_(
+            contains_text(Empresa.nome_fantasia, q),
+            Empresa.cnpj.startswith(q.strip(), autoescape=True),
+        ))
+        .order_by(func.similarity(func.f_unaccent(Empresa.nome_fantasia), func.f_unaccent(q)).desc())
+        .limit(limit)
+    )
     result = await db.execute(query)
-    tipos = result.scalars().all()
-    
-    return [{"tipo": tipo} for tipo in tipos if tipo]
+    return [{"cnpj": cnpj, "nome": nome} for cnpj, nome in result.all()]
@@ -1,49 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from src.core.database import get_db
+from sqlalchemy.orm import load_only
+from sqlalchemy import func, tuple_, literal, Float
+from src.core.database import get_read_db
+from src.core.cache import cached
+from src.core.load_shedding import query_deadline
+from src.core.serialization import FastJSONResponse
+from src.api.loaders import AnaliseLoader, get_analise_loader
+from src.api.pagination import encode_cursor, decode_cursor, cursor_value
+from src.api.fields import field_selection
 from src.models.proposicao import Proposicao
 from src.models.politico import Politico
 from src.models.analise import AnaliseIA
-from src.schemas.public_api import ProposicaoPublic
-from typing import List
+from src.schemas.public_api import ProposicaoPublic, AnaliseIAPublic
+from typing import List, Optional
 
 router = APIRouter(prefix="/proposicoes", tags=["Proposições"])
 
+# Campos do item da listagem (os de ProposicaoPublic)
+PROPOSICAO_FIELDS = tuple(ProposicaoPublic.model_fields)
+
+proposicao_fields = field_selection(
+    PROPOSICAO_FIELDS,
+    presets={"compact": ("id", "sigla_tipo", "numero", "ano", "data_apresentacao")},
+)
+
 @router.get("/", response_model=List[ProposicaoPublic])
 async def list_proposicoes(
     politico_id: int = None,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    fields: tuple = Depends(proposicao_fields),
+    db: AsyncSession = Depends(get_read_db),
+    loader: AnaliseLoader = Depends(get_analise_loader)
 ):
-    from sqlalchemy import func
-    
-    # Log request parameters
-    print(f"[PROPOSICOES] Request - politico_id: {politico_id}, limit: {limit}")
-    
-    # Check total count in database
-    count_query = select(func.count()).select_from(Proposicao)
-    total_count = await db.scalar(count_query)
-    print(f"[PROPOSICOES] Total proposições in DB: {total_count}")
-    
-    # Check autoria table
-    from src.models.proposicao import autoria_proposicao
-    autoria_count_query = select(func.count()).select_from(autoria_proposicao)
-    autoria_count = await db.scalar(autoria_count_query)
-    print(f"[PROPOSICOES] Total entries in autoria_proposicao: {autoria_count}")
-    
-    query = select(Proposicao).options(selectinload(Proposicao.autores))
+    """
+    Proposições, opcionalmente de um autor. `fields` restringe as colunas carregadas e
+    devolvidas (ex.: `compact` deixa de fora a ementa e a análise IA).
+    """
+    # Só as colunas pedidas; autores não fazem parte da resposta
+    columns = [getattr(Proposicao, f) for f in fields if f != "analise"]
+    query = select(Proposicao).options(load_only(*columns))
     
     if politico_id:
-        print(f"[PROPOSICOES] Filtering by politico_id: {politico_id}")
         # Filter by author using the many-to-many relationship
         query = query.join(Proposicao.autores).filter(Politico.id == politico_id)
-        
-        # Check count with filter
-        count_filtered = select(func.count()).select_from(Proposicao).join(Proposicao.autores).filter(Politico.id == politico_id)
-        filtered_count = await db.scalar(count_filtered)
-        print(f"[PROPOSICOES] Proposições for politico_id {politico_id}: {filtered_count}")
     
     # Apply limit after filtering
     query = query.limit(limit)
@@ -51,14 +52,108 @@ async def list_proposicoes(
     result = await db.execute(query)
     proposicoes = result.scalars().all()
     
-    print(f"[PROPOSICOES] Returning {len(proposicoes)} proposições")
-    
-    # Adicionamos a análise manualmente se necessário ou via relationship se configurado
-    # Por enquanto, retornamos o básico.
-    return proposicoes
+    # Análises da página inteira em uma consulta
+    if "analise" in fields:
+        await loader.attach("PROPOSICAO", proposicoes)
+
+    # Resposta direta: o response_model preencheria os campos não pedidos
+    return FastJSONResponse([
+        {f: _field_value(p, f) for f in fields}
+        for p in proposicoes
+    ])
+
+def _field_value(proposicao, field):
+    if field == "analise":
+        analise = proposicao.analise
+        return AnaliseIAPublic.model_validate(analise, from_attributes=True) if analise else None
+    return getattr(proposicao, field)
+
+# Configuração criada na migration b58c3e0d7f12 (portuguese + unaccent)
+TS_CONFIG = "portuguese_unaccent"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter= … "
+
+@router.get("/search")
+@query_deadline(5.0)
+async def search_proposicoes(
+    q: str = Query(..., min_length=2, description="Termos de busca (aceita \"frase exata\", OR e -exclusão)"),
+    sigla_tipo: Optional[str] = Query(None),
+    ano: Optional[int] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Busca textual nas ementas com ranking e trechos destacados (<mark>).
+
+    Usa o tsvector gerado `ementa_tsv` (índice GIN) e pagina por keyset em (rank, id):
+    envie `next_cursor` para a página seguinte, com os mesmos filtros.
+    """
+    tsquery = func.websearch_to_tsquery(TS_CONFIG, q)
+    rank = func.ts_rank_cd(Proposicao.ementa_tsv, tsquery)
+
+    query = (
+        select(
+            Proposicao.id,
+            Proposicao.sigla_tipo,
+            Proposicao.numero,
+            Proposicao.ano,
+            Proposicao.data_apresentacao,
+            rank.label("rank"),
+        )
+        .where(Proposicao.ementa_tsv.op("@@")(tsquery))
+    )
+    if sigla_tipo:
+        query = query.where(Proposicao.sigla_tipo == sigla_tipo.upper())
+    if ano:
+        query = query.where(Proposicao.ano == ano)
+    if cursor:
+        keyset = decode_cursor(cursor)
+        boundary = literal(cursor_value(keyset, "r", float), Float)
+        query = query.where(tuple_(rank, Proposicao.id) < tuple_(boundary, cursor_value(keyset, "id", int)))
+
+    # ts_headline é caro: calculado só para as linhas da página
+    page = query.order_by(rank.desc(), Proposicao.id.desc()).limit(limit + 1).subquery()
+    stmt = (
+        select(
+            page,
+            func.ts_headline(TS_CONFIG, Proposicao.ementa, tsquery, HEADLINE_OPTIONS).label("snippet"),
+        )
+        .join(Proposicao, Proposicao.id == page.c.id)
+        .order_by(page.c.rank.desc(), page.c.id.desc())
+    )
+
+    result = await db.execute(stmt)
+    rows = result.mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"r": rows[-1]["rank"], "id": rows[-1]["id"]})
+
+    return FastJSONResponse({
+        "items": [
+            {
+                "id": r["id"],
+                "sigla_tipo": r["sigla_tipo"],
+                "numero": r["numero"],
+                "ano": r["ano"],
+                "data_apresentacao": r["data_apresentacao"],
+                "rank": r["rank"],
+                "snippet": r["snippet"],
+            }
+            for r in rows
+        ],
+        "next_cursor": next_cursor,
+    })
 
 @router.get("/{id}", response_model=ProposicaoPublic)
-async def get_proposicao(id: int, db: AsyncSession = Depends(get_db)):
+@cached(tags=("proposicoes", "analises"), model=ProposicaoPublic, ttl=600)
+async def get_proposicao(
+    id: int,
+    db: AsyncSession = Depends(get_read_db),
+    loader: AnaliseLoader = Depends(get_analise_loader)
+):
     query = select(Proposicao).where(Proposicao.id == id)
     result = await db.execute(query)
     proposicao = result.scalar_one_or_none()
@@ -66,4 +161,5 @@ async def get_proposicao(id: int, db: AsyncSession = Depends(get_db)):
     if not proposicao:
         raise HTTPException(status_code=404, detail="Proposição não encontrada")
     
+    await loader.attach("PROPOSICAO", [proposicao])
     return proposicao
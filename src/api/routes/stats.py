@@ -1,71 +1,51 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func
 from sqlalchemy.future import select
-from src.core.database import get_db
-from src.models.politico import Politico
-from src.models.gasto import Gasto
-from src.models.proposicao import Proposicao
+from src.core.database import get_read_db
+from src.core.cache import cached
+from src.models.resumo import DashboardAnual
+from typing import Optional
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
 from datetime import datetime
 
 @router.get("/dashboard")
-async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
-    # Current year for default filtering
-    target_year = datetime.now().year
-    
-    # 1. Broad Counts
-    total_deputados = await db.scalar(select(func.count(Politico.id)))
-    total_proposicoes = await db.scalar(select(func.count(Proposicao.id)))
-    
-    # 2. Financial Metrics for the current year
-    total_gastos_2026 = await db.scalar(
-        select(func.sum(Gasto.valor))
-        .where(func.extract('year', Gasto.data_emissao) == target_year)
-    )
-    
-    # 3. Top 5 Spenders in 2026
-    top_spenders_query = (
-        select(
-            Politico.id,
-            Politico.nome_parlamentar,
-            Politico.foto_url,
-            func.sum(Gasto.valor).label("total_gasto")
-        )
-        .join(Gasto)
-        .where(func.extract('year', Gasto.data_emissao) == target_year)
-        .group_by(Politico.id)
-        .order_by(func.sum(Gasto.valor).desc())
-        .limit(5)
-    )
-    top_spenders_result = await db.execute(top_spenders_query)
-    top_spenders = [
-        {"id": r[0], "nome": r[1], "foto_url": r[2], "valor": float(r[3])} 
-        for r in top_spenders_result.all()
-    ]
-    
-    # 4. Expenditure by Category
-    category_query = (
-        select(Gasto.tipo_despesa, func.sum(Gasto.valor))
-        .where(func.extract('year', Gasto.data_emissao) == target_year)
-        .group_by(Gasto.tipo_despesa)
-        .order_by(func.sum(Gasto.valor).desc())
-        .limit(5)
-    )
-    category_result = await db.execute(category_query)
-    categories = [
-        {"categoria": r[0], "valor": float(r[1])}
-        for r in category_result.all()
-    ]
-    
+@cached(tags=("stats",))
+async def get_dashboard_stats(
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano (padrão: ano corrente)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Resumo do dashboard, lido de dashboard_anual (uma linha por ano, pela PK).
+
+    O rollup é mantido pela ingestão (src/services/rollups.py); ver scripts/backfill_rollups.py.
+    """
+    target_year = ano or datetime.now().year
+
+    row = await db.scalar(select(DashboardAnual).where(DashboardAnual.ano == target_year))
+    if row is None:
+        # Ano sem gastos: contagens globais vêm do rollup mais recente
+        latest = await db.scalar(select(DashboardAnual).order_by(DashboardAnual.ano.desc()).limit(1))
+        return {
+            "year": target_year,
+            "total_deputados": latest.total_deputados if latest else 0,
+            "total_proposicoes": latest.total_proposicoes if latest else 0,
+            "total_gastos": 0.0,
+            "top_spenders": [],
+            "categories": [],
+            "savings_opportunity_estimate": 0.0,
+            "updated_at": None,
+        }
+
+    total_gastos = float(row.total_gastos or 0)
     return {
         "year": target_year,
-        "total_deputados": total_deputados or 0,
-        "total_proposicoes": total_proposicoes or 0,
-        "total_gastos": float(total_gastos_2026 or 0),
-        "top_spenders": top_spenders,
-        "categories": categories,
-        "savings_opportunity_estimate": float(total_gastos_2026 or 0) * 0.05
+        "total_deputados": row.total_deputados,
+        "total_proposicoes": row.total_proposicoes,
+        "total_gastos": total_gastos,
+        "top_spenders": row.top_spenders,
+        "categories": row.categories,
+        "savings_opportunity_estimate": total_gastos * 0.05,
+        "updated_at": row.updated_at,
     }
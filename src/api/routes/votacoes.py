@@ -0,0 +1,151 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_
+from src.core.database import get_read_db
+from src.core.cache import cached
+from src.core.load_shedding import query_deadline
+from src.api.pagination import encode_cursor, decode_cursor, cursor_value
+from src.models.votacao import Votacao
+from src.models.proposicao import Proposicao
+from src.models.resumo import PlacarVotacao
+from typing import Optional
+from datetime import date, datetime, timedelta
+
+router = APIRouter(prefix="/votacoes", tags=["Votações"])
+
+# Placares vêm de votacoes_placar (src/services/placares.py), recalculado por
+# process_votacoes_batch: uma linha por votação, nenhuma rota agrega a tabela votos.
+
+PLACAR_COLUMNS = (
+    PlacarVotacao.total, PlacarVotacao.sim, PlacarVotacao.nao,
+    PlacarVotacao.abstencao, PlacarVotacao.obstrucao,
+)
+
+def _placar(row) -> dict | None:
+    # Votação ainda sem placar (ingerida antes da migration e sem backfill)
+    if row.total is None:
+        return None
+    return {
+        "total": row.total, "sim": row.sim, "nao": row.nao,
+        "abstencao": row.abstencao, "obstrucao": row.obstrucao,
+    }
+
+@router.get("/")
+@cached(tags=("votacoes",))
+@query_deadline(3.0)
+async def list_votacoes(
+    proposicao_id: Optional[int] = Query(None),
+    sigla_orgao: Optional[str] = Query(None, description="Ex.: PLEN"),
+    data_inicio: Optional[date] = Query(None),
+    data_fim: Optional[date] = Query(None),
+    aprovada: Optional[bool] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Votações mais recentes primeiro, com o placar (total, sim, não, abstenção, obstrução).
+
+    Paginação keyset em (data, id) pelo índice ix_votacoes_data_id: envie `next_cursor`
+    com os mesmos filtros. Votações sem data ficam de fora.
+    """
+    stmt = (
+        select(
+            Votacao.id, Votacao.data, Votacao.sigla_orgao, Votacao.descricao,
+            Votacao.aprovacao, Votacao.proposicao_id, *PLACAR_COLUMNS,
+        )
+        .outerjoin(PlacarVotacao, PlacarVotacao.votacao_id == Votacao.id)
+        .where(Votacao.data.isnot(None))
+    )
+    if proposicao_id:
+        stmt = stmt.where(Votacao.proposicao_id == proposicao_id)
+    if sigla_orgao:
+        stmt = stmt.where(Votacao.sigla_orgao == sigla_orgao.upper())
+    if data_inicio:
+        stmt = stmt.where(Votacao.data >= data_inicio)
+    if data_fim:
+        # data é timestamp: inclui o dia inteiro
+        stmt = stmt.where(Votacao.data < data_fim + timedelta(days=1))
+    if aprovada is not None:
+        stmt = stmt.where(Votacao.aprovacao == (1 if aprovada else 0))
+    if cursor:
+        keyset = decode_cursor(cursor)
+        boundary = cursor_value(keyset, "v", datetime.fromisoformat)
+        stmt = stmt.where(tuple_(Votacao.data, Votacao.id) < tuple_(boundary, cursor_value(keyset, "id", str)))
+
+    result = await db.execute(stmt.order_by(Votacao.data.desc(), Votacao.id.desc()).limit(limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"v": rows[-1].data.isoformat(), "id": rows[-1].id})
+
+    return {
+        "items": [
+            {
+                "id": row.id,
+                "data": row.data,
+                "sigla_orgao": row.sigla_orgao,
+                "descricao": row.descricao,
+                "aprovacao": row.aprovacao,
+                "proposicao_id": row.proposicao_id,
+                "placar": _placar(row),
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+    }
+
+@router.get("/{id}")
+@cached(tags=("votacoes", "proposicoes"))
+@query_deadline(3.0)
+async def get_votacao(
+    id: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Uma votação com o placar completo: contagem por tipo de voto, quebras por partido
+    e por UF (cada grupo com total e contagem por tipo) e a proposição votada.
+    """
+    stmt = (
+        select(
+            Votacao.id, Votacao.uri, Votacao.data, Votacao.sigla_orgao, Votacao.descricao,
+            Votacao.aprovacao, *PLACAR_COLUMNS,
+            PlacarVotacao.por_tipo, PlacarVotacao.por_partido, PlacarVotacao.por_uf,
+            Proposicao.id.label("proposicao_id"), Proposicao.sigla_tipo, Proposicao.numero,
+            Proposicao.ano, Proposicao.ementa,
+        )
+        .outerjoin(PlacarVotacao, PlacarVotacao.votacao_id == Votacao.id)
+        .outerjoin(Proposicao, Proposicao.id == Votacao.proposicao_id)
+        .where(Votacao.id == id)
+    )
+    row = (await db.execute(stmt)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Votação não encontrada")
+
+    placar = _placar(row)
+    if placar is not None:
+        placar.update(por_tipo=row.por_tipo, por_partido=row.por_partido, por_uf=row.por_uf)
+
+    proposicao = None
+    if row.proposicao_id is not None:
+        proposicao = {
+            "id": row.proposicao_id,
+            "sigla_tipo": row.sigla_tipo,
+            "numero": row.numero,
+            "ano": row.ano,
+            "ementa": row.ementa,
+        }
+
+    return {
+        "id": row.id,
+        "uri": row.uri,
+        "data": row.data,
+        "sigla_orgao": row.sigla_orgao,
+        "descricao": row.descricao,
+        "aprovacao": row.aprovacao,
+        "placar": placar,
+        "proposicao": proposicao,
+    }
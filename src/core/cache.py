@@ -0,0 +1,211 @@
+import functools
+import hashlib
+import inspect
+import json
+import time
+import asyncio
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from src.core.config import settings
+from src.core.redis import get_redis
+from src.core.serialization import dumps
+
+# Cache de respostas HTTP das rotas GET públicas.
+#
+# Cada entrada guarda o corpo JSON, o ETag e a versão das tags de que depende. A ingestão
+# incrementa `cache:tag:<tag>` depois do commit (bump_tags); uma entrada com versões
+# antigas vira "stale": ainda é servida enquanto UMA requisição (lock SET NX) recalcula.
+#
+# Tags usadas: gastos, deputados, partidos, proposicoes, votacoes, stats, analises (ai_analyzer),
+# tipos_despesa (só quando surge um tipo novo) e deputado:<id> (dados de um deputado: gastos, autorias).
+# As mesmas versões invalidam o cache de dimensões em memória (src/api/dimensions.py).
+
+KEY_PREFIX = "cache:v1:"
+TAG_PREFIX = "cache:tag:"
+LOCK_TIMEOUT_MS = 10_000
+# Sem entrada stale, quem não pegou o lock espera o recálculo por até LOCK_WAIT segundos
+LOCK_WAIT = 2.0
+LOCK_POLL = 0.05
+# Parâmetros que não mudam o conteúdo da resposta
+IGNORED_PARAMS = {"consistency"}
+
+
+def _cache_key(request: Request) -> str:
+    params = sorted(
+        (k, v) for k, v in request.query_params.multi_items()
+        if v != "" and k not in IGNORED_PARAMS
+    )
+    raw = request.url.path.rstrip("/") + "?" + "&".join(f"{k}={v}" for k, v in params)
+    return KEY_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _bypass(request: Request) -> bool:
+    # Leitura forçada no primário (ver get_read_db) também ignora o cache
+    consistency = request.headers.get("x-read-consistency") or request.query_params.get("consistency")
+    return not settings.CACHE_ENABLED or consistency == "primary"
+
+
+async def _tag_versions(redis, tags) -> list:
+    pipe = redis.pipeline(transaction=False)
+    for tag in tags:
+        pipe.get(TAG_PREFIX + tag)
+    return [v or "0" for v in await pipe.execute()]
+
+
+async def tag_versions(*tags: str) -> list:
+    """Versão atual de cada tag ("0" se nunca incrementada)."""
+    return await _tag_versions(get_redis(), tags)
+
+
+async def bump_tags(*tags: str):
+    """Invalida as respostas que dependem das tags. Chamar depois do commit."""
+    # Incrementa mesmo com CACHE_ENABLED=false: as dimensões em memória dependem das versões
+    if not tags:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(TAG_PREFIX + tag)
+        await pipe.execute()
+    except RedisError as e:
+        # Sem invalidação as entradas expiram pelo TTL
+        print(f"[CACHE] Failed to bump tags {tags}: {e}")
+
+
+def _serialize(result, adapter: TypeAdapter | None) -> str:
+    if adapter is not None:
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True)).decode()
+    return dumps(result).decode()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Lista separada por vírgulas; comparação fraca (W/ ignorado), valores inteiros
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _response(request: Request, body: str, etag: str, max_age: int, stale: int, status: str) -> Response:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={stale}",
+        "X-Cache": status,
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached(tags: tuple[str, ...], model=None, ttl: int | None = None, max_age: int = 60):
+    """
+    Cacheia a resposta JSON de uma rota GET no Redis.
+
+    `tags`: tabelas das quais a resposta depende (invalidadas por bump_tags). Aceitam
+    parâmetros de path, ex.: "deputado:{id}" vira "deputado:123".
+    `model`: o response_model da rota, para serializar objetos ORM (None = dicts/listas crus).
+    `ttl`: segundos em que a entrada é fresca; depois disso (ou após um bump) fica stale
+    por CACHE_STALE_TTL segundos. `max_age`: Cache-Control repassado ao cliente.
+
+    Usar abaixo do @router.get. A rota ganha um parâmetro `request` se ainda não tiver.
+    """
+    adapter = TypeAdapter(model) if model is not None else None
+    ttl = ttl or settings.CACHE_DEFAULT_TTL
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        wants_request = "request" in signature.parameters
+
+        async def compute(request, args, kwargs):
+            if not wants_request:
+                kwargs = {k: v for k, v in kwargs.items() if k != "request"}
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                return result, None
+            body = _serialize(result, adapter)
+            return body, '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+
+        @functools.wraps(func)
+        async def wrapper(*args, request: Request, **kwargs):
+            if wants_request:
+                kwargs["request"] = request
+            if _bypass(request):
+                result, _ = await compute(request, args, kwargs)
+                if isinstance(result, Response):
+                    return result
+                return Response(content=result, media_type="application/json", headers={"X-Cache": "BYPASS"})
+
+            redis = get_redis()
+            key = _cache_key(request)
+            stale_ttl = settings.CACHE_STALE_TTL
+            try:
+                versions = await _tag_versions(redis, [t.format(**request.path_params) for t in tags])
+                raw = await redis.get(key)
+            except RedisError as e:
+                print(f"[CACHE] Redis unavailable, serving uncached: {e}")
+                result, etag = await compute(request, args, kwargs)
+                if etag is None:
+                    return result
+                return _response(request, result, etag, max_age, stale_ttl, "BYPASS")
+
+            entry = json.loads(raw) if raw else None
+            if entry and entry["v"] == versions and time.time() - entry["t"] < ttl:
+                return _response(request, entry["b"], entry["e"], max_age, stale_ttl, "HIT")
+
+            # Banco sobrecarregado (get_read_db): a versão anterior é melhor que um 503
+            if entry and getattr(request.state, "overloaded", None):
+                return _response(request, entry["b"], entry["e"], max_age, stale_ttl, "STALE")
+
+            # Single-flight: só quem pega o lock recalcula; os demais servem a entrada stale
+            lock_key = key + ":lock"
+            try:
+                got_lock = await redis.set(lock_key, "1", nx=True, px=LOCK_TIMEOUT_MS)
+            except RedisError:
+                got_lock = True
+
+            if not got_lock:
+                if entry:
+                    return _response(request, entry["b"], entry["e"], max_age, stale_ttl, "STALE")
+                deadline = time.monotonic() + LOCK_WAIT
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_POLL)
+                    try:
+                        raw = await redis.get(key)
+                    except RedisError:
+                        break
+                    if raw:
+                        entry = json.loads(raw)
+                        return _response(request, entry["b"], entry["e"], max_age, stale_ttl, "HIT")
+
+            try:
+                body, etag = await compute(request, args, kwargs)
+                if etag is None:
+                    return body
+                try:
+                    entry = {"b": body, "e": etag, "v": versions, "t": time.time()}
+                    await redis.set(key, json.dumps(entry, ensure_ascii=False), ex=ttl + stale_ttl)
+                except RedisError as e:
+                    print(f"[CACHE] Failed to store {request.url.path}: {e}")
+                return _response(request, body, etag, max_age, stale_ttl, "MISS")
+            finally:
+                if got_lock:
+                    try:
+                        await redis.delete(lock_key)
+                    except RedisError:
+                        pass
+
+        if not wants_request:
+            params = list(signature.parameters.values())
+            params.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+
+    return decorator
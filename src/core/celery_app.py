@@ -42,5 +42,9 @@ celery_app.conf.beat_schedule = {
         'schedule': crontab(hour=3, minute=0),
         'args': (7,) 
     },
+    'build-analytics-snapshot-daily': {
+        'task': 'src.services.data_fetcher.build_analytics_snapshot_task',
+        'schedule': crontab(hour=4, minute=30),
+    },
     # Note: AI analysis was decoupled from ingestion and is executed via scripts (scripts/run_ai_analysis.py).
 }
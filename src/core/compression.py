@@ -0,0 +1,121 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli vem do pyproject; sem ele (instalação mínima) só gzip é negociado
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Formatos já comprimidos: recomprimir só gasta CPU
+SKIP_MEDIA_TYPES = ("application/vnd.apache.parquet", "application/zip", "application/gzip", "image/")
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        # wbits=31: container gzip
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compressão negociada (br > gzip) para respostas acima de `minimum_size` bytes.
+
+    Como o GZipMiddleware do Starlette, mas com brotli quando o cliente aceita e o pacote
+    existe. Respostas em streaming (exportações) são comprimidas pedaço a pedaço, com
+    flush a cada pedaço, sem bufferizar o corpo inteiro.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _negotiate(self, accept_encoding: str):
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in accept_encoding.split(",")
+            if "q=0" not in token.replace(" ", "").split(";")[1:]
+        }
+        if brotli is not None and "br" in accepted:
+            return "br", lambda: _Brotli(self.brotli_quality)
+        if "gzip" in accepted:
+            return "gzip", lambda: _Gzip(self.gzip_level)
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding, factory = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Segura o start até saber o tamanho do primeiro pedaço do corpo
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                media_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or media_type.startswith(SKIP_MEDIA_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = factory()
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    message["body"] = compressor.compress(body)
+                else:
+                    message["body"] = compressor.finish(body)
+                    headers["Content-Length"] = str(len(message["body"]))
+                await send(start_message)
+                await send(message)
+                return
+
+            message["body"] = compressor.compress(body) if more_body else compressor.finish(body)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,27 +1,144 @@
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from collections import deque
+import asyncio
 import json
-# Import models to ensure they are registered with Base
-from src.models.gasto import Gasto, Empresa
-from src.models.politico import Politico
-from src.models.proposicao import Proposicao
-from src.models.votacao import Votacao
-from src.models.voto import Voto
+import time
 from src.core.config import settings
+from src.core.load_shedding import Overloaded, admission, is_statement_timeout, statement_timeout_ms
 
-from sqlalchemy.pool import NullPool
 
-# Garante que o driver asyncpg seja usado mesmo que o usuário esqueça no .env
-db_url = settings.DATABASE_URL
-if db_url.startswith("postgresql://"):
-    db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+def _asyncpg_url(url: str) -> str:
+    # Garante que o driver asyncpg seja usado mesmo que o usuário esqueça no .env
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
 
-engine = create_async_engine(
-    db_url, 
-    echo=True,
-    poolclass=NullPool,
-    # Ensure JSON serialization preserves unicode characters (no \u escapes)
-    json_serializer=lambda v: json.dumps(v, ensure_ascii=False, default=str),
-)
+db_url = _asyncpg_url(settings.DATABASE_URL)
+replica_url = _asyncpg_url(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+
+# Perfis de engine por papel do processo. Valores de DB_* no Settings sobrescrevem o perfil.
+# - api: muitas requisições curtas e concorrentes, falha rápido se o pool esgotar
+# - worker: ingestão Celery, concorrência limitada pelo semáforo das tasks (10)
+# - analyzer: scripts de análise IA, sequenciais
+ENGINE_PROFILES = {
+    "api": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 5.0, "echo": False},
+    "worker": {"pool_size": 10, "max_overflow": 0, "pool_timeout": 60.0, "echo": False},
+    "analyzer": {"pool_size": 2, "max_overflow": 0, "pool_timeout": 30.0, "echo": False},
+}
+
+
+# Janela do p95 "recente" da espera no checkout (usado pela admissão de carga)
+RECENT_WAIT_WINDOW = 10.0
+
+
+class PoolMetrics:
+    """Tempo de espera no checkout e saturação de um pool de conexões."""
+
+    def __init__(self, capacity: int = 0):
+        self.capacity = capacity
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits = deque(maxlen=256)
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self._recent_waits.append((time.monotonic(), seconds))
+
+    def recent_wait_p95(self) -> float:
+        # Só os últimos RECENT_WAIT_WINDOW segundos: sem checkouts novos (ex.: tudo sendo
+        # recusado pela admissão) o pico antigo deixa de contar
+        since = time.monotonic() - RECENT_WAIT_WINDOW
+        ordered = sorted(wait for at, wait in self._recent_waits if at >= since)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def snapshot(self, pool) -> dict:
+        checked_out = pool.checkedout()
+        return {
+            "pool_size": pool.size(),
+            "checked_out": checked_out,
+            "overflow": pool.overflow(),
+            "capacity": self.capacity,
+            "saturation": round(checked_out / self.capacity, 3) if self.capacity else 0.0,
+            "checkouts": self.checkouts,
+            "wait_avg_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_p95_ms": round(self.recent_wait_p95() * 1000, 3),
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """QueuePool que mede quanto tempo cada checkout esperou por uma conexão livre."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() recria o pool; as métricas continuam valendo para o engine
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+def _parse_echo(value: str, default):
+    value = value.strip().lower()
+    if not value:
+        return default
+    if value == "debug":
+        return "debug"
+    return value in ("1", "true", "yes", "on")
+
+
+def build_engine(profile: str, url: str = None):
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB engine profile: {profile}")
+    options = ENGINE_PROFILES[profile]
+
+    pool_size = settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else options["pool_size"]
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else options["max_overflow"]
+    pool_timeout = settings.DB_POOL_TIMEOUT if settings.DB_POOL_TIMEOUT is not None else options["pool_timeout"]
+
+    new_engine = create_async_engine(
+        url or db_url,
+        echo=_parse_echo(settings.DB_ECHO, options["echo"]),
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # cache do SQLAlchemy (asyncpg adapter) e cache interno do asyncpg
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+        # Ensure JSON serialization preserves unicode characters (no \u escapes)
+        json_serializer=lambda v: json.dumps(v, ensure_ascii=False, default=str),
+    )
+    new_engine.sync_engine.pool.metrics = PoolMetrics(pool_size + max_overflow)
+    return new_engine
+
+
+current_profile = settings.DB_ENGINE_PROFILE
+engine = build_engine(current_profile)
+# Sem réplica configurada, as leituras usam o próprio primário
+replica_engine = build_engine(current_profile, replica_url) if replica_url else engine
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -29,16 +146,185 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+class ReadSession(Session):
+    """
+    Sessão de leitura. Aberta por get_read_db, carrega a requisição em info["request"] e
+    aplica a admissão de carga e o statement_timeout da rota (src/core/load_shedding.py);
+    sem requisição (exportação, snapshots, dimensões) se comporta como uma Session comum.
+    """
+
+
+@event.listens_for(ReadSession, "do_orm_execute")
+def _check_admission(orm_execute_state):
+    # Antes do checkout da conexão: a requisição recusada não entra na fila do pool
+    request = orm_execute_state.session.info.get("request")
+    if request is not None and getattr(request.state, "overloaded", None):
+        raise Overloaded(f"Banco sobrecarregado: {request.state.overloaded}")
+
+
+@event.listens_for(ReadSession, "after_begin")
+def _set_statement_timeout(session, transaction, connection):
+    request = session.info.get("request")
+    if request is not None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {statement_timeout_ms(request)}")
+
+
+# Sessões somente leitura (BEGIN READ ONLY): na réplica por padrão, ou no primário quando forçado
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=replica_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    sync_session_class=ReadSession,
+    expire_on_commit=False,
+)
+AsyncPrimaryReadSessionLocal = async_sessionmaker(
+    bind=engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    sync_session_class=ReadSession,
+    expire_on_commit=False,
+)
+
+
+def use_engine_profile(profile: str):
+    """
+    Troca o engine do processo para outro perfil (ex.: worker Celery, scripts de análise).
+
+    Deve ser chamado no boot do entry point, antes de qualquer conexão ser aberta.
+    """
+    global engine, replica_engine, current_profile
+    if profile == current_profile:
+        return
+    # Nenhuma conexão foi aberta ainda, então descartar o pool antigo não precisa de event loop
+    engine.sync_engine.dispose(close=False)
+    if replica_engine is not engine:
+        replica_engine.sync_engine.dispose(close=False)
+
+    current_profile = profile
+    engine = build_engine(profile)
+    replica_engine = build_engine(profile, replica_url) if replica_url else engine
+
+    AsyncSessionLocal.configure(bind=engine)
+    AsyncReadSessionLocal.configure(bind=replica_engine.execution_options(postgresql_readonly=True))
+    AsyncPrimaryReadSessionLocal.configure(bind=engine.execution_options(postgresql_readonly=True))
+
+
+def get_pool_stats() -> dict:
+    stats = {
+        "profile": current_profile,
+        "primary": engine.sync_engine.pool.metrics.snapshot(engine.sync_engine.pool),
+        "admission": admission.snapshot(),
+    }
+    if replica_engine is not engine:
+        stats["replica"] = replica_engine.sync_engine.pool.metrics.snapshot(replica_engine.sync_engine.pool)
+        stats["replica"]["lag_ok"] = _replica_state["fresh"]
+    return stats
+
+
+def run_with_engine(coro):
+    """
+    asyncio.run() que descarta os pools (banco e Redis) antes do loop fechar.
+
+    Conexões asyncpg/redis ficam presas ao event loop que as criou; como cada task Celery
+    roda seu próprio asyncio.run(), o pool vive apenas durante a task.
+    """
+    async def _runner():
+        from src.core.redis import close_redis
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+            # Tasks que usam a sessão de leitura (ex.: snapshot analítico) também pegam conexões da réplica
+            if replica_engine is not engine:
+                await replica_engine.dispose()
+            await close_redis()
+
+    return asyncio.run(_runner())
+
+
 # Integragem com Celery para evitar erros de fork (InterfaceError)
-def setup_worker_db():
+def setup_worker_db(profile: str = "worker"):
     from celery.signals import worker_process_init
+
+    use_engine_profile(profile)
+
     @worker_process_init.connect
     def init_worker(**kwargs):
-        import asyncio
-        # No worker, queremos que o engine limpe qualquer conexão herdada do pai
-        # e crie novas sob demanda no novo processo
-        asyncio.run(engine.dispose())
+        # No worker, queremos que o engine abandone qualquer conexão herdada do pai
+        # (sem fechá-las, pois pertencem ao processo pai) e crie novas sob demanda
+        engine.sync_engine.dispose(close=False)
+
+
+# Estado do lag da réplica, checado no máximo a cada REPLICA_CHECK_INTERVAL segundos
+REPLICA_CHECK_INTERVAL = 5.0
+_replica_state = {"checked_at": 0.0, "fresh": True}
+
+async def replica_is_fresh() -> bool:
+    """
+    True se a réplica está dentro do atraso tolerado (DB_REPLICA_MAX_LAG_SECONDS).
+
+    Réplica inacessível conta como atrasada, e as leituras voltam para o primário.
+    """
+    now = time.monotonic()
+    if now - _replica_state["checked_at"] < REPLICA_CHECK_INTERVAL:
+        return _replica_state["fresh"]
+    _replica_state["checked_at"] = now
+
+    try:
+        async with replica_engine.connect() as conn:
+            # Sem WAL pendente o atraso é zero, mesmo que a última transação seja antiga
+            lag = await conn.scalar(text(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            ))
+        _replica_state["fresh"] = lag is None or float(lag) <= settings.DB_REPLICA_MAX_LAG_SECONDS
+    except Exception as e:
+        print(f"[DB] Replica lag check failed, reading from primary: {e}")
+        _replica_state["fresh"] = False
+    return _replica_state["fresh"]
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def read_session_factory(request: Request):
+    """
+    Fábrica de sessões somente leitura para a requisição.
+
+    Usa a réplica (tolerando o atraso configurado) quando existir. O cliente pode
+    exigir leitura no primário com o header `X-Read-Consistency: primary` ou
+    `?consistency=primary`, por exemplo logo após disparar uma ingestão.
+    """
+    consistency = request.headers.get("x-read-consistency") or request.query_params.get("consistency")
+    if replica_engine is engine or consistency == "primary" or not await replica_is_fresh():
+        return AsyncPrimaryReadSessionLocal
+    return AsyncReadSessionLocal
+
+async def get_read_db(request: Request):
+    """
+    Sessão somente leitura para rotas GET (ver read_session_factory), sob a admissão de
+    carga e o statement_timeout da rota (src/core/load_shedding.py).
+
+    Com o banco sobrecarregado a sessão é entregue marcada: a primeira consulta vira 503,
+    mas uma rota com @cached ainda pode responder com a entrada stale sem consultar nada.
+    """
+    session_factory = await read_session_factory(request)
+    bind = session_factory.kw["bind"]
+    request.state.overloaded = admission.overload_reason(bind.sync_engine.pool.metrics)
+    # Recusadas não contam como em voo: não chegam a consultar o banco
+    counted = not request.state.overloaded
+    if counted:
+        admission.in_flight += 1
+    else:
+        admission.rejected += 1
+    try:
+        async with session_factory(info={"request": request}) as session:
+            try:
+                yield session
+            except DBAPIError as e:
+                if is_statement_timeout(e):
+                    print(f"[LOAD] {request.url.path} hit statement_timeout ({statement_timeout_ms(request)}ms)")
+                    raise Overloaded("A consulta excedeu o tempo limite") from e
+                raise
+    finally:
+        if counted:
+            admission.in_flight -= 1
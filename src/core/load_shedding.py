@@ -0,0 +1,115 @@
+import asyncio
+import functools
+import inspect
+import math
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from src.core.config import settings
+
+# Controle de carga da API sobre o banco.
+#
+# - Admissão: cada requisição que abre uma sessão de leitura (get_read_db) conta como "em
+#   voo". Acima de LOAD_SHED_MAX_IN_FLIGHT, ou com o p95 recente da espera por conexão do
+#   pool acima de LOAD_SHED_POOL_WAIT_MS, a requisição é recusada com 503 + Retry-After
+#   antes de pegar uma conexão. Rotas com @cached servem a entrada stale em vez de recusar.
+# - Prazo: statement_timeout (SET LOCAL) em toda transação de leitura da API, com o
+#   orçamento da rota (@query_deadline) ou DB_STATEMENT_TIMEOUT; @query_deadline também
+#   cancela a corrotina da rota, cobrindo o tempo gasto fora do Postgres.
+
+
+class Overloaded(Exception):
+    """Requisição recusada ou interrompida para proteger o banco (vira 503 + Retry-After)."""
+
+    def __init__(self, detail: str, retry_after: int | None = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after or settings.LOAD_SHED_RETRY_AFTER
+
+
+class AdmissionController:
+    """Contagem de requisições em voo no banco e decisão de admissão, por processo."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.rejected = 0
+
+    def max_in_flight(self, pool_capacity: int) -> int:
+        if settings.LOAD_SHED_MAX_IN_FLIGHT is not None:
+            return settings.LOAD_SHED_MAX_IN_FLIGHT
+        # Padrão: o pool inteiro ocupado e outro tanto esperando na fila do checkout
+        return max(pool_capacity * 2, 1)
+
+    def overload_reason(self, pool_metrics) -> str | None:
+        """Motivo para recusar uma nova requisição agora, ou None se ela pode entrar."""
+        if not settings.LOAD_SHED_ENABLED:
+            return None
+        limit = self.max_in_flight(pool_metrics.capacity)
+        if self.in_flight >= limit:
+            return f"{self.in_flight} requisições em andamento no banco (limite {limit})"
+        wait_p95_ms = pool_metrics.recent_wait_p95() * 1000
+        if wait_p95_ms > settings.LOAD_SHED_POOL_WAIT_MS:
+            return f"espera por conexão p95 de {wait_p95_ms:.0f}ms"
+        return None
+
+    def snapshot(self) -> dict:
+        return {"in_flight": self.in_flight, "rejected": self.rejected}
+
+
+admission = AdmissionController()
+
+
+def statement_timeout_ms(request: Request) -> int:
+    """Orçamento de cada comando SQL da requisição, em ms."""
+    budget = getattr(request.state, "query_budget", None) or settings.DB_STATEMENT_TIMEOUT
+    return int(budget * 1000)
+
+
+def is_statement_timeout(error: Exception) -> bool:
+    # 57014 = query_canceled (statement_timeout ou cancelamento do cliente)
+    orig = getattr(error, "orig", None)
+    return (getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)) == "57014"
+
+
+def query_deadline(seconds: float):
+    """
+    Orçamento de tempo de uma rota: statement_timeout das suas consultas e cancelamento
+    da corrotina se a rota inteira passar do prazo (com uma pequena folga para o Postgres
+    abortar primeiro e a conexão voltar limpa ao pool).
+
+    Usar abaixo do @router.get (e abaixo de @cached, se houver). A rota ganha um parâmetro
+    `request` se ainda não tiver. Não usar em rotas de streaming: o corpo é enviado depois
+    que a rota retorna.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        wants_request = "request" in signature.parameters
+
+        @functools.wraps(func)
+        async def wrapper(*args, request: Request, **kwargs):
+            if wants_request:
+                kwargs["request"] = request
+            request.state.query_budget = seconds
+            try:
+                return await asyncio.wait_for(func(*args, **kwargs), timeout=seconds + settings.DEADLINE_GRACE)
+            except asyncio.TimeoutError:
+                print(f"[LOAD] {request.url.path} cancelled after {seconds}s budget")
+                raise Overloaded(f"A consulta excedeu o orçamento de {seconds:g}s")
+
+        if not wants_request:
+            params = list(signature.parameters.values())
+            params.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+
+    return decorator
+
+
+async def overloaded_handler(request: Request, exc: Overloaded) -> JSONResponse:
+    retry_after = max(1, math.ceil(exc.retry_after))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -0,0 +1,28 @@
+from redis.asyncio import Redis, ConnectionPool
+from src.core.config import settings
+
+# Cliente Redis compartilhado pelo processo. As conexões ficam presas ao event loop
+# que as abriu: processos que rodam vários asyncio.run() (tasks Celery) devem chamar
+# close_redis() antes de cada loop terminar (ver run_with_engine).
+_client: Redis | None = None
+
+def get_redis() -> Redis:
+    global _client
+    if _client is None:
+        pool = ConnectionPool.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=30,
+        )
+        _client = Redis(connection_pool=pool)
+    return _client
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+        await client.connection_pool.disconnect()
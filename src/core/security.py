@@ -1,37 +1,214 @@
+import asyncio
+import math
 import time
 from fastapi import Request, HTTPException, status
-from redis.asyncio import Redis
-import os
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from redis.exceptions import RedisError
+from src.core.config import settings
+from src.core.redis import get_redis
 
 # Rate Limiter Config
 # 60 requests per minute per IP
 RATE_LIMIT_DURATION = 60 
 RATE_LIMIT_REQUESTS = 60
 
+# GCRA (generic cell rate algorithm) executado inteiro no Redis: uma ida e volta,
+# atômico entre réplicas da API. Guarda apenas o "theoretical arrival time" por chave.
+# KEYS[1] = chave do cliente
+# ARGV[1] = intervalo entre requisições (ms), ARGV[2] = tolerância de burst (ms)
+# Retorna {permitido, restantes, ms até zerar, ms até poder tentar de novo}
+GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - burst
+if now < allow_at then
+    return {0, 0, tat - now, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((now + burst - new_tat) / interval), new_tat - now, 0}
+"""
+
+_gcra = None
+
+def _get_gcra_script():
+    global _gcra
+    if _gcra is None:
+        # register_script usa EVALSHA e só reenvia o corpo em caso de NOSCRIPT
+        _gcra = get_redis().register_script(GCRA_SCRIPT)
+    return _gcra
+
+
+class HybridRateLimiter:
+    """
+    Contadores por IP em memória (janela fixa), sincronizados com o Redis em lote.
+
+    A decisão é local: hits deste processo + hits das outras réplicas vistos no último
+    sync. A cada `sync_interval` os deltas locais são enviados com INCRBY e o total
+    global volta na mesma resposta. Entre syncs cada réplica pode admitir a mais, no
+    máximo, o que as outras receberam nesse intervalo. Se o Redis cair, os limites
+    continuam valendo localmente.
+    """
+
+    def __init__(self, limit: int, window: int, sync_interval: float):
+        self.limit = limit
+        self.window = window
+        self.sync_interval = sync_interval
+        # ip -> [janela, hits locais, hits locais já enviados, hits das outras réplicas]
+        self._counters: dict[str, list[int]] = {}
+        # Última janela em que os contadores de janelas encerradas foram descartados
+        self._pruned_window = -1
+        self._sync_task: asyncio.Task | None = None
+        self.redis_ok = True
+
+    def hit(self, client_ip: str, now: float) -> tuple[bool, int, float]:
+        """Registra uma requisição. Retorna (permitido, restantes, segundos até a janela virar)."""
+        window_id = int(now // self.window)
+        if window_id != self._pruned_window:
+            # Uma varredura por janela: sem isso, no modo local (ou com o Redis fora)
+            # ninguém chama sync() e um contador por IP já visto fica para sempre
+            self._prune(window_id)
+        entry = self._counters.get(client_ip)
+        if entry is None or entry[0] != window_id:
+            entry = self._counters[client_ip] = [window_id, 0, 0, 0]
+
+        reset = (window_id + 1) * self.window - now
+        used = entry[1] + entry[3]
+        if used >= self.limit:
+            return False, 0, reset
+        entry[1] += 1
+        return True, self.limit - used - 1, reset
+
+    def _prune(self, window_id: int):
+        """Descarta os contadores de janelas encerradas."""
+        for ip in [ip for ip, e in self._counters.items() if e[0] != window_id]:
+            del self._counters[ip]
+        self._pruned_window = window_id
+
+    def ensure_sync_task(self):
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync_loop())
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+                if not self.redis_ok:
+                    print("[RATE LIMIT] Redis available again, resuming global sync")
+                self.redis_ok = True
+            except (RedisError, OSError) as e:
+                if self.redis_ok:
+                    print(f"[RATE LIMIT] Redis unavailable, enforcing local limits only: {e}")
+                self.redis_ok = False
+
+    async def sync(self):
+        window_id = int(time.time() // self.window)
+        # Janelas encerradas não interessam mais
+        self._prune(window_id)
+        if not self._counters:
+            return
+
+        batch = []
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for ip, entry in self._counters.items():
+                key = f"rate_limit:{ip}:{window_id}"
+                # INCRBY 0 também serve para ler o que as outras réplicas somaram
+                pipe.incrby(key, entry[1] - entry[2])
+                pipe.expire(key, self.window * 2)
+                batch.append((ip, entry[1]))
+            results = await pipe.execute()
+
+        # Só depois do execute(): se o Redis falhar, o delta continua pendente e vai
+        # no próximo sync em vez de se perder
+        for (ip, sent), global_count in zip(batch, results[::2]):
+            entry = self._counters.get(ip)
+            if entry is not None and entry[0] == window_id:
+                entry[2] = sent
+                entry[3] = max(int(global_count) - sent, 0)
+
+
+_hybrid = HybridRateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_DURATION, settings.RATE_LIMIT_SYNC_INTERVAL)
+
+def _rate_limit_headers(remaining: int, reset_seconds: float) -> dict:
+    return {
+        "RateLimit-Limit": str(RATE_LIMIT_REQUESTS),
+        "RateLimit-Remaining": str(max(remaining, 0)),
+        "RateLimit-Reset": str(math.ceil(reset_seconds)),
+        "RateLimit-Policy": f"{RATE_LIMIT_REQUESTS};w={RATE_LIMIT_DURATION}",
+    }
+
+async def _check_redis(client_ip: str) -> tuple[bool, int, float, float]:
+    interval_ms = RATE_LIMIT_DURATION * 1000 // RATE_LIMIT_REQUESTS
+    burst_ms = RATE_LIMIT_DURATION * 1000
+    allowed, remaining, reset_ms, retry_ms = await _get_gcra_script()(
+        keys=[f"rate_limit:{client_ip}"], args=[interval_ms, burst_ms]
+    )
+    return bool(allowed), remaining, reset_ms / 1000, retry_ms / 1000
+
 async def rate_limiter(request: Request):
-    # Get Redis URL from environment
-    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    redis = Redis.from_url(redis_url, decode_responses=True)
-    
+    """
+    Limite por IP. RATE_LIMIT_MODE escolhe a estratégia:
+    - "redis": GCRA atômico no Redis a cada requisição (limite global exato)
+    - "hybrid": contadores em memória sincronizados em lote (sem ida ao Redis no caminho quente)
+    - "local": apenas em memória, por processo
+    Se o Redis falhar no modo "redis", a requisição é decidida localmente em vez de falhar.
+    """
     # Simple IP-based key
-    client_ip = request.client.host
-    key = f"rate_limit:{client_ip}"
-    
-    try:
-        current_count = await redis.get(key)
-        
-        if current_count and int(current_count) >= RATE_LIMIT_REQUESTS:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Try again in a minute."
-            )
-        
-        # Increment or initialize
-        async with redis.pipeline(transaction=True) as pipe:
-            await pipe.incr(key)
-            if not current_count:
-                await pipe.expire(key, RATE_LIMIT_DURATION)
-            await pipe.execute()
-            
-    finally:
-        await redis.close()
+    client_ip = request.client.host if request.client else "unknown"
+    mode = settings.RATE_LIMIT_MODE
+
+    allowed = None
+    if mode == "redis":
+        try:
+            allowed, remaining, reset, retry_after = await _check_redis(client_ip)
+        except (RedisError, OSError) as e:
+            print(f"[RATE LIMIT] Redis check failed, falling back to local limit: {e}")
+    elif mode == "hybrid":
+        _hybrid.ensure_sync_task()
+
+    if allowed is None:
+        allowed, remaining, reset = _hybrid.hit(client_ip, time.time())
+        retry_after = reset
+
+    headers = _rate_limit_headers(remaining, reset)
+    if not allowed:
+        headers["Retry-After"] = str(math.ceil(retry_after))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Try again in a minute.",
+            headers=headers,
+        )
+    # Aplicados por RateLimitHeadersMiddleware: rotas que devolvem um Response pronto
+    # (@cached, FastJSONResponse direto) descartariam os headers do sub-response
+    request.state.rate_limit_headers = headers
+
+
+class RateLimitHeadersMiddleware:
+    """Copia os headers RateLimit-* calculados por `rate_limiter` para qualquer resposta."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                # request.state vive em scope["state"]
+                rate_headers = scope.get("state", {}).get("rate_limit_headers")
+                if rate_headers:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in rate_headers.items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,42 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# orjson vem do pyproject; sem ele (instalação mínima) cai no json da stdlib, mesmo formato
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(value):
+    # Tipos que o orjson não serializa sozinho (date/datetime/UUID ele já trata)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """JSON compacto em UTF-8 (orjson quando disponível)."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Resposta JSON via `dumps`. Classe padrão do app; rotas de listagem podem devolvê-la
+    diretamente com dicts/tuplas crus para pular o jsonable_encoder do FastAPI.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -1,17 +1,21 @@
 from fastapi import FastAPI, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.core.database import get_db
-from src.services.extractor.camara import CamaraExtractor
-from src.services.resilience_ingestor import ResilienceIngestor
+from src.core.database import get_db, get_pool_stats
 
-from src.api.routes import deputados, proposicoes, stats, gastos
-from src.core.security import rate_limiter
+from src.api.routes import deputados, proposicoes, stats, gastos, export, analytics, fornecedores, votacoes
+from src.core.security import rate_limiter, RateLimitHeadersMiddleware
 
-from google import genai
+import asyncio
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.config import settings
+from src.core.compression import CompressionMiddleware
+from src.core.serialization import FastJSONResponse
+from src.api.dimensions import dimensions
+from src.core.load_shedding import Overloaded, overloaded_handler
 
-app = FastAPI(title="Lente Cidadã API")
+app = FastAPI(title="Lente Cidadã API", default_response_class=FastJSONResponse)
+# Banco saturado ou rota acima do orçamento de tempo: 503 + Retry-After
+app.add_exception_handler(Overloaded, overloaded_handler)
 
 # Configure CORS
 app.add_middleware(
@@ -22,33 +26,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-async def startup_event():
+# RateLimit-* em todas as respostas, inclusive Responses prontos (@cached, FastJSONResponse)
+app.add_middleware(RateLimitHeadersMiddleware)
+
+# gzip/brotli negociado para respostas grandes (listagens, dashboard, exportações)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+def _list_gemini_models():
+    # Import tardio: o SDK do GenAI é pesado e a API não precisa dele para servir tráfego
+    from google import genai
+
     print("--- Checking Available Gemini Models ---")
-    if settings.GEMINI_API_KEY:
-        try:
-            client = genai.Client(api_key=settings.GEMINI_API_KEY)
-            for m in client.models.list():
-                # The new SDK model object has 'name' attribute
-                print(f"  - Model: {m.name}")
-        except Exception as e:
-            print(f"  - Error listing models: {e}")
-    else:
-        print("  - GEMINI_API_KEY not configured.")
+    try:
+        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        for m in client.models.list():
+            # The new SDK model object has 'name' attribute
+            print(f"  - Model: {m.name}")
+    except Exception as e:
+        print(f"  - Error listing models: {e}")
     print("----------------------------------------")
 
+@app.on_event("startup")
+async def startup_event():
+    # Dimensões em memória prontas antes do primeiro request; se falhar, a primeira rota tenta de novo
+    try:
+        await dimensions.ensure_fresh()
+    except Exception as e:
+        print(f"[DIMENSIONS] Initial load failed: {e}")
+
+    # Diagnóstico opcional; roda em thread para não atrasar o boot nem depender da rede
+    if settings.GEMINI_LIST_MODELS_ON_STARTUP and settings.GEMINI_API_KEY:
+        asyncio.get_running_loop().run_in_executor(None, _list_gemini_models)
+
 # Register Routers with Rate Limiting
 app.include_router(deputados.router, dependencies=[Depends(rate_limiter)])
 app.include_router(proposicoes.router, dependencies=[Depends(rate_limiter)])
 app.include_router(stats.router, dependencies=[Depends(rate_limiter)])
 app.include_router(gastos.router, dependencies=[Depends(rate_limiter)])
+app.include_router(export.router, dependencies=[Depends(rate_limiter)])
+app.include_router(analytics.router, dependencies=[Depends(rate_limiter)])
+app.include_router(fornecedores.router, dependencies=[Depends(rate_limiter)])
+app.include_router(votacoes.router, dependencies=[Depends(rate_limiter)])
 
 @app.get("/")
 async def root():
     return {"message": "Lente Cidadã is running"}
 
+@app.get("/health/pool")
+async def pool_health():
+    """Saturação e tempo de espera no checkout do pool de conexões deste processo, e a admissão de carga"""
+    return get_pool_stats()
+
 @app.post("/ingest/deputados")
 async def ingest_deputados(db: AsyncSession = Depends(get_db)):
+    from src.services.extractor.camara import CamaraExtractor
+    from src.services.resilience_ingestor import ResilienceIngestor
+
     extractor = CamaraExtractor()
     ingestor = ResilienceIngestor(db)
     
@@ -62,6 +100,9 @@ async def ingest_deputados(db: AsyncSession = Depends(get_db)):
 
 @app.post("/ingest/gastos/{deputado_id}")
 async def ingest_gastos(deputado_id: int, db: AsyncSession = Depends(get_db)):
+    from src.services.extractor.camara import CamaraExtractor
+    from src.services.resilience_ingestor import ResilienceIngestor
+
     extractor = CamaraExtractor()
     ingestor = ResilienceIngestor(db)
     
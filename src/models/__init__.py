@@ -0,0 +1,3 @@
+# Importa todos os modelos para que os relationships declarados por nome
+# ("Voto", "Proposicao", ...) resolvam, qualquer que seja o módulo importado primeiro.
+from src.models import analise, dlq, exploracao, gasto, politico, proposicao, resumo, votacao, voto
@@ -1,10 +1,14 @@
-from sqlalchemy import String, JSON, Text, ForeignKey, Numeric
+from sqlalchemy import String, JSON, Text, ForeignKey, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from src.models.base import Base, TimestampMixin
 from decimal import Decimal
 
 class AnaliseIA(Base, TimestampMixin):
     __tablename__ = "analises_ia"
+    __table_args__ = (
+        # Busca por entidade (NOT EXISTS do ai_analyzer, análises nas listagens)
+        Index("ix_analises_entidade", "entidade_tipo", "entidade_id", postgresql_include=["score_anomalia"]),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     entidade_tipo: Mapped[str] = mapped_column(String(50)) # 'POLITICO', 'GASTO', 'PROPOSICAO'
@@ -0,0 +1,42 @@
+from sqlalchemy import String, Integer, ForeignKey, Numeric, Date, Text, Boolean, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from src.models.base import Base
+from datetime import date
+from decimal import Decimal
+
+# Read model da exploração de gastos (/gastos/exploration e /export/gastos).
+# Mantido por src/services/exploracao.py: ingestão de gastos/deputados e o analisador de
+# gastos. Nunca escrito pela API; reconstruível com scripts/backfill_rollups.py --exploracao.
+# Buscas por substring usam índices trigram sobre f_unaccent(col), criados na migration.
+
+class GastoExploracao(Base):
+    """Um gasto com deputado, partido, UF, fornecedor e a análise IA mais recente já resolvidos."""
+    __tablename__ = "gastos_exploracao"
+    __table_args__ = (
+        # Ordenações/keyset da exploração, globais e por deputado/UF
+        Index("ix_gastos_exploracao_data", "data_emissao", "gasto_id"),
+        Index("ix_gastos_exploracao_valor", "valor", "gasto_id"),
+        Index("ix_gastos_exploracao_politico", "politico_id", "data_emissao", "gasto_id"),
+        Index("ix_gastos_exploracao_uf", "uf", "data_emissao", "gasto_id"),
+        # Renomeação de fornecedor (sync_empresas)
+        Index("ix_gastos_exploracao_empresa", "empresa_cnpj"),
+        # Gastos analisados, dos mais suspeitos para os menos
+        Index("ix_gastos_exploracao_score", "score_anomalia", "gasto_id", postgresql_where=text("has_analise")),
+    )
+
+    gasto_id: Mapped[int] = mapped_column(ForeignKey("gastos_gabinete.id"), primary_key=True)
+    ext_id: Mapped[int] = mapped_column(Integer)
+    politico_id: Mapped[int] = mapped_column(Integer)
+    politico_nome: Mapped[str] = mapped_column(String(255))
+    partido_sigla: Mapped[str | None] = mapped_column(String(20))
+    uf: Mapped[str | None] = mapped_column(String(2))
+    data_emissao: Mapped[date | None] = mapped_column(Date)
+    valor: Mapped[Decimal] = mapped_column(Numeric(12, 2))
+    tipo_despesa: Mapped[str | None] = mapped_column(String(255))
+    empresa_cnpj: Mapped[str | None] = mapped_column(String(20))
+    fornecedor_nome: Mapped[str | None] = mapped_column(String(255))
+    url_documento: Mapped[str | None] = mapped_column(String(500))
+    # Análise IA mais recente do gasto (AnaliseIA GASTO, entidade_id = gastos_gabinete.id)
+    has_analise: Mapped[bool] = mapped_column(Boolean, server_default=text("false"))
+    score_anomalia: Mapped[Decimal | None] = mapped_column(Numeric(3, 2))
+    ai_resumo: Mapped[str | None] = mapped_column(Text)
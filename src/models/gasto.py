@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, Numeric, Date
+from sqlalchemy import String, ForeignKey, Numeric, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.base import Base, TimestampMixin
 from datetime import date
@@ -13,8 +13,23 @@ class Empresa(Base, TimestampMixin):
     
     gastos: Mapped[list["Gasto"]] = relationship(back_populates="empresa")
 
+class TipoDespesa(Base):
+    """Tipos de despesa já vistos na ingestão (lookup de /gastos/tipos-despesa/)."""
+    __tablename__ = "tipos_despesa"
+
+    nome: Mapped[str] = mapped_column(String(255), primary_key=True)
+
 class Gasto(Base, TimestampMixin):
     __tablename__ = "gastos_gabinete"
+    __table_args__ = (
+        # Gastos de um deputado por data (exploração, perfil, rollups); cobre a soma de valor
+        Index("ix_gastos_politico_data", "politico_id", "data_emissao", "id", postgresql_include=["valor"]),
+        # Ordenações/keyset globais da exploração
+        Index("ix_gastos_data_id", "data_emissao", "id"),
+        Index("ix_gastos_valor_id", "valor", "id"),
+        # DISTINCT de /gastos/tipos-despesa/ via index-only scan
+        Index("ix_gastos_tipo_despesa", "tipo_despesa", postgresql_where=text("tipo_despesa IS NOT NULL")),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     ext_id: Mapped[int] = mapped_column(unique=True) # idDocumento da API
@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.base import Base, TimestampMixin
 from typing import List
@@ -15,6 +15,10 @@ class Partido(Base, TimestampMixin):
 
 class Politico(Base, TimestampMixin):
     __tablename__ = "politicos"
+    __table_args__ = (
+        Index("ix_politicos_partido_id", "partido_id"),
+        Index("ix_politicos_uf", "uf"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True) # ID da Câmara
     nome_civil: Mapped[str] = mapped_column(String(255))
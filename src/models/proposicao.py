@@ -1,10 +1,17 @@
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.base import Base, TimestampMixin
 from datetime import datetime
 
 class Proposicao(Base, TimestampMixin):
     __tablename__ = "proposicoes"
+    __table_args__ = (
+        # Keyset (data_apresentacao, id) da timeline dos deputados
+        Index("ix_proposicoes_data_id", "data_apresentacao", "id"),
+        Index("ix_proposicoes_ementa_tsv", "ementa_tsv", postgresql_using="gin"),
+        Index("ix_proposicoes_sigla_tipo_ano", "sigla_tipo", "ano"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     uri: Mapped[str] = mapped_column(String(255))
@@ -14,6 +21,12 @@ class Proposicao(Base, TimestampMixin):
     ano: Mapped[int] = mapped_column(Integer)
     ementa: Mapped[str] = mapped_column(Text)
     data_apresentacao: Mapped[datetime] = mapped_column(DateTime)
+    # Busca textual (/proposicoes/search). Gerada pelo banco; deferred para não trafegar nas listagens
+    ementa_tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('portuguese_unaccent'::regconfig, coalesce(ementa, ''))", persisted=True),
+        deferred=True,
+    )
 
     votacoes: Mapped[list["Votacao"]] = relationship(back_populates="proposicao")
     
@@ -25,10 +38,12 @@ class Proposicao(Base, TimestampMixin):
     )
 
 # Association table must be defined to be picked up by Alembic
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 autoria_proposicao = Table(
     "autoria_proposicao",
     Base.metadata,
     Column("proposicao_id", ForeignKey("proposicoes.id"), primary_key=True),
     Column("politico_id", ForeignKey("politicos.id"), primary_key=True),
+    # A PK começa por proposicao_id; buscas por autor precisam do próprio índice
+    Index("ix_autoria_politico_id", "politico_id"),
 )
@@ -0,0 +1,154 @@
+from sqlalchemy import String, Integer, ForeignKey, Numeric, Float, Index, JSON, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from src.models.base import Base
+from datetime import datetime
+from decimal import Decimal
+
+# Tabelas de resumo (rollups) mantidas por src/services/rollups.py.
+# Nunca escritas pela API; reconstruíveis a qualquer momento com scripts/backfill_rollups.py
+
+class GastoResumoAnual(Base):
+    """Total e quantidade de gastos por deputado, ano e tipo de despesa."""
+    __tablename__ = "gastos_resumo_anual"
+    __table_args__ = (
+        # Agregações do dashboard por ano
+        Index("ix_gastos_resumo_anual_ano", "ano", "politico_id"),
+    )
+
+    politico_id: Mapped[int] = mapped_column(ForeignKey("politicos.id"), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # '' representa gastos sem tipo de despesa (a PK não aceita NULL)
+    tipo_despesa: Mapped[str] = mapped_column(String(255), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    qtd: Mapped[int] = mapped_column(Integer)
+
+
+class DashboardAnual(Base):
+    """Uma linha por ano com tudo que /stats/dashboard devolve."""
+    __tablename__ = "dashboard_anual"
+
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total_gastos: Mapped[Decimal] = mapped_column(Numeric(16, 2))
+    qtd_gastos: Mapped[int] = mapped_column(Integer)
+    total_deputados: Mapped[int] = mapped_column(Integer)
+    total_proposicoes: Mapped[int] = mapped_column(Integer)
+    top_spenders: Mapped[list[dict]] = mapped_column(JSON)
+    categories: Mapped[list[dict]] = mapped_column(JSON)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+# Rollups mensais mantidos por deltas dentro da transação de process_gastos_batch.
+# ano = mes = 0 agrupa gastos sem data_emissao (assim as somas batem com gastos_gabinete).
+
+class GastoMensal(Base):
+    """Total e quantidade de gastos por deputado, ano, mês e tipo de despesa."""
+    __tablename__ = "gastos_mensal"
+    __table_args__ = (
+        # Contagem de deputados com gastos no ano (benchmark)
+        Index("ix_gastos_mensal_ano", "ano", "politico_id"),
+    )
+
+    politico_id: Mapped[int] = mapped_column(ForeignKey("politicos.id"), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    mes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tipo_despesa: Mapped[str] = mapped_column(String(255), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    qtd: Mapped[int] = mapped_column(Integer)
+
+
+class GastoMensalUF(Base):
+    """gastos_mensal agregado por UF do deputado."""
+    __tablename__ = "gastos_mensal_uf"
+
+    uf: Mapped[str] = mapped_column(String(2), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    mes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tipo_despesa: Mapped[str] = mapped_column(String(255), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(16, 2))
+    qtd: Mapped[int] = mapped_column(Integer)
+
+
+class GastoMensalPartido(Base):
+    """gastos_mensal agregado pelo partido do deputado no momento da ingestão."""
+    __tablename__ = "gastos_mensal_partido"
+
+    partido_id: Mapped[int] = mapped_column(ForeignKey("partidos.id"), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    mes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tipo_despesa: Mapped[str] = mapped_column(String(255), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(16, 2))
+    qtd: Mapped[int] = mapped_column(Integer)
+
+
+# Rollups de fornecedores, também mantidos por deltas em process_gastos_batch.
+# Só gastos com empresa_cnpj; ano 0 agrupa os gastos sem data.
+
+class GastoFornecedor(Base):
+    """Total e quantidade pagos por um deputado a um fornecedor em um ano."""
+    __tablename__ = "gastos_fornecedor"
+    __table_args__ = (
+        # Fornecedores de um deputado (perfil, concentração)
+        Index("ix_gastos_fornecedor_politico", "politico_id", "ano"),
+    )
+
+    empresa_cnpj: Mapped[str] = mapped_column(ForeignKey("empresas.cnpj"), primary_key=True)
+    politico_id: Mapped[int] = mapped_column(ForeignKey("politicos.id"), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    qtd: Mapped[int] = mapped_column(Integer)
+
+
+class FornecedorAnual(Base):
+    """gastos_fornecedor agregado por fornecedor e ano, com o número de deputados pagantes."""
+    __tablename__ = "fornecedores_anual"
+    __table_args__ = (
+        # Ranking de fornecedores de um ano
+        Index("ix_fornecedores_anual_ano_total", "ano", "total"),
+    )
+
+    empresa_cnpj: Mapped[str] = mapped_column(ForeignKey("empresas.cnpj"), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(16, 2))
+    qtd: Mapped[int] = mapped_column(Integer)
+    deputados: Mapped[int] = mapped_column(Integer)
+
+
+class ConcentracaoFornecedores(Base):
+    """
+    Concentração dos gastos de um deputado entre fornecedores em um ano.
+
+    hhi vai de 0 a 10.000 (mesma escala de src/services/analytics.py); top1_share e
+    top5_share são frações do total pago a fornecedores identificados.
+    """
+    __tablename__ = "fornecedores_concentracao"
+    __table_args__ = (
+        Index("ix_fornecedores_concentracao_ano_hhi", "ano", "hhi"),
+    )
+
+    politico_id: Mapped[int] = mapped_column(ForeignKey("politicos.id"), primary_key=True)
+    ano: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    fornecedores: Mapped[int] = mapped_column(Integer)
+    hhi: Mapped[float | None] = mapped_column(Float)
+    top1_share: Mapped[float | None] = mapped_column(Float)
+    top5_share: Mapped[float | None] = mapped_column(Float)
+
+
+class PlacarVotacao(Base):
+    """
+    Placar de uma votação, mantido por process_votacoes_batch (src/services/placares.py).
+
+    por_tipo: {tipo_voto: n}; por_partido/por_uf: [{"sigla"|"uf", "total", "votos": {tipo_voto: n}}].
+    """
+    __tablename__ = "votacoes_placar"
+
+    votacao_id: Mapped[str] = mapped_column(ForeignKey("votacoes.id"), primary_key=True)
+    total: Mapped[int] = mapped_column(Integer)
+    sim: Mapped[int] = mapped_column(Integer)
+    nao: Mapped[int] = mapped_column(Integer)
+    abstencao: Mapped[int] = mapped_column(Integer)
+    obstrucao: Mapped[int] = mapped_column(Integer)
+    por_tipo: Mapped[dict] = mapped_column(JSON)
+    por_partido: Mapped[list[dict]] = mapped_column(JSON)
+    por_uf: Mapped[list[dict]] = mapped_column(JSON)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
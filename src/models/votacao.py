@@ -1,10 +1,15 @@
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.base import Base, TimestampMixin
 from datetime import datetime
 
 class Votacao(Base, TimestampMixin):
     __tablename__ = "votacoes"
+    __table_args__ = (
+        # Keyset (data, id) de /votacoes e da timeline dos deputados
+        Index("ix_votacoes_data_id", "data", "id"),
+        Index("ix_votacoes_proposicao_id", "proposicao_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True) # API uses string IDs for votes
     uri: Mapped[str] = mapped_column(String(255))
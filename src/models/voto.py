@@ -1,9 +1,15 @@
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.base import Base, TimestampMixin
 
 class Voto(Base, TimestampMixin):
     __tablename__ = "votos"
+    __table_args__ = (
+        # DELETE por votação em process_votacoes_batch e placares; voto de um deputado
+        # em uma votação (timeline)
+        Index("ix_votos_votacao_politico", "votacao_id", "politico_id"),
+        Index("ix_votos_politico_id", "politico_id"),
+    )
     
     # Composite PK via relationship or just an autoincrement ID? 
     # Since a deputy votes only once per votacao, (votacao_id, politico_id) should be unique.
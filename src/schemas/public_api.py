@@ -9,12 +9,25 @@ class PartidoPublic(BaseModel):
     nome: str
     logo_url: Optional[str]
 
+class AnaliseIAPublic(BaseModel):
+    id: int
+    entidade_tipo: str
+    entidade_id: int
+    score_anomalia: Optional[Decimal] = None
+    resumo_critico: Optional[str] = None
+    impacto_financeiro: Optional[str] = None
+    grupos_beneficiados: Optional[List[str]] = None
+    riscos_corrupcao: Optional[str] = None
+    created_at: datetime
+
 class PoliticoPublic(BaseModel):
     id: int
     nome_parlamentar: str
     uf: str
     partido: Optional[PartidoPublic]
     foto_url: Optional[str]
+    # Análise cruzada (CROSS_DATA), preenchida pelo AnaliseLoader
+    analise: Optional[AnaliseIAPublic] = None
 
 class GastoPublic(BaseModel):
     id: int
@@ -29,13 +42,6 @@ class PoliticoDetail(PoliticoPublic):
     email: Optional[str]
     id_legislatura: Optional[int]
 
-class AnaliseIAPublic(BaseModel):
-    id: int
-    entidade_tipo: str
-    entidade_id: str
-    resultado_json: dict
-    created_at: datetime
-
 class ProposicaoPublic(BaseModel):
     id: int
     sigla_tipo: str
@@ -43,4 +49,5 @@ class ProposicaoPublic(BaseModel):
     ano: int
     ementa: str
     data_apresentacao: Optional[datetime]
+    # Preenchida pelo AnaliseLoader (src/api/loaders.py)
     analise: Optional[AnaliseIAPublic] = None
@@ -16,7 +16,9 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import AsyncSessionLocal
+from src.core.cache import bump_tags
 from src.services.llm_service import GeminiClient
+from src.services import exploracao
 from src.models.analise import AnaliseIA
 from src.models.gasto import Gasto
 from src.models.voto import Voto
@@ -73,15 +75,17 @@ class GastoAnalyzer(BaseAnalyzer):
         Busca gastos não analisados, ordenados por data do documento (mais recentes primeiro).
         Ignora gastos já analisados.
         """
-        # Subquery: IDs de gastos já analisados
-        analyzed_ids = select(AnaliseIA.entidade_id).where(
-            AnaliseIA.entidade_tipo == self.analysis_type.value
-        )
+        # Gastos já analisados (NOT EXISTS vira anti-join sobre ix_analises_entidade;
+        # NOT IN com subquery não pode ser planejado assim)
+        already_analyzed = select(AnaliseIA.id).where(
+            AnaliseIA.entidade_tipo == self.analysis_type.value,
+            AnaliseIA.entidade_id == Gasto.id
+        ).exists()
 
         # Query: Gastos não analisados, data decrescente, limit N
         stmt = select(Gasto).where(
             and_(
-                Gasto.id.not_in(analyzed_ids),
+                ~already_analyzed,
                 Gasto.data_emissao.isnot(None)  # Apenas com data válida
             )
         ).options(
@@ -167,6 +171,8 @@ class GastoAnalyzer(BaseAnalyzer):
                 raw_response=resultado
             )
             session.add(analise)
+            # Mesma transação: a exploração de gastos lê score/resumo do read model
+            await exploracao.marcar_analise(session, gasto.id, analise)
             await session.commit()
 
             return {
@@ -199,17 +205,18 @@ class VotoAnalyzer(BaseAnalyzer):
         """
         Busca votos não analisados, ordenados por data da votação (mais recentes).
         """
-        # Subquery: IDs de votos já analisados
-        analyzed_ids = select(AnaliseIA.entidade_id).where(
-            AnaliseIA.entidade_tipo == self.analysis_type.value
-        )
+        # Votos já analisados (anti-join, ver GastoAnalyzer)
+        already_analyzed = select(AnaliseIA.id).where(
+            AnaliseIA.entidade_tipo == self.analysis_type.value,
+            AnaliseIA.entidade_id == Voto.id
+        ).exists()
 
         # Query: Votos não analisados
         stmt = select(Voto).join(
             Votacao, Voto.votacao_id == Votacao.id
         ).where(
             and_(
-                Voto.id.not_in(analyzed_ids),
+                ~already_analyzed,
                 Votacao.data.isnot(None)
             )
         ).options(
@@ -317,13 +324,14 @@ class ProposicaoAnalyzer(BaseAnalyzer):
         """
         Busca proposições não analisadas, ordenadas por data de apresentação (mais recentes).
         """
-        analyzed_ids = select(AnaliseIA.entidade_id).where(
-            AnaliseIA.entidade_tipo == self.analysis_type.value
-        )
+        already_analyzed = select(AnaliseIA.id).where(
+            AnaliseIA.entidade_tipo == self.analysis_type.value,
+            AnaliseIA.entidade_id == Proposicao.id
+        ).exists()
 
         stmt = select(Proposicao).where(
             and_(
-                Proposicao.id.not_in(analyzed_ids),
+                ~already_analyzed,
                 Proposicao.data_apresentacao.isnot(None)
             )
         ).options(
@@ -595,6 +603,10 @@ class AIAnalysisManager:
                         "type": analysis_type.value
                     })
 
+        if success_count:
+            # Respostas em cache que embutem análises (ver src/core/cache.py)
+            await bump_tags("analises")
+
         return {
             "type": analysis_type.value,
             "limit": limit,
@@ -0,0 +1,196 @@
+"""
+Motor analítico em processo (DuckDB) sobre o snapshot Parquet de src/services/snapshot.py.
+
+As consultas pesadas (gastos por partido/mês, concentração de fornecedores, concordância
+de votos) rodam sobre arquivos locais: nenhuma carga no Postgres. Os resultados ficam em
+cache em memória por versão do snapshot; um snapshot novo invalida tudo automaticamente.
+
+`duckdb` vem do pyproject; sem ele (instalação mínima) ou sem snapshot publicado as
+consultas levantam AnalyticsUnavailable. ANALYTICS_SNAPSHOT_DIR precisa ser compartilhado
+entre o worker que gera os snapshots e a API (ver .env.example / docker-compose.yml).
+"""
+import asyncio
+import importlib.util
+import threading
+from collections import OrderedDict
+
+from src.services.snapshot import SNAPSHOT_TABLES, current_snapshot
+
+RESULT_CACHE_SIZE = 256
+
+
+class AnalyticsUnavailable(RuntimeError):
+    pass
+
+
+class AnalyticsEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._connection = None
+        self._results = OrderedDict()
+        # Cursores abertos por conexão; uma conexão substituída só fecha quando chega a zero
+        self._in_use = {}
+        self._retired = set()
+
+    def _connect(self, version, path):
+        # Chamado com o lock: uma conexão DuckDB (em memória) por versão do snapshot
+        if version == self._version:
+            return self._connection
+        import duckdb
+
+        connection = duckdb.connect(database=":memory:")
+        for table in SNAPSHOT_TABLES:
+            file = (path / f"{table}.parquet").as_posix().replace("'", "''")
+            connection.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{file}')")
+        previous = self._connection
+        self._version, self._connection = version, connection
+        self._results.clear()
+        if previous is not None:
+            # Consultas ainda rodando em outras threads sobre a versão anterior terminam antes
+            if self._in_use.get(previous):
+                self._retired.add(previous)
+            else:
+                previous.close()
+        return connection
+
+    def query(self, name: str, sql: str, params: tuple = ()) -> dict:
+        """Executa (ou devolve do cache) uma consulta; resultado: {"snapshot", "items"}"""
+        if importlib.util.find_spec("duckdb") is None:
+            raise AnalyticsUnavailable("Motor analítico requer o pacote duckdb (pip install duckdb)")
+        snapshot = current_snapshot()
+        if snapshot is None:
+            raise AnalyticsUnavailable("Nenhum snapshot analítico publicado (rode scripts/analytics_snapshot.py build)")
+        version, path = snapshot
+
+        key = (version, name, params)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            # cursor(): conexão própria sobre o mesmo banco, segura para uso em outra thread
+            connection = self._connect(version, path)
+            cursor = connection.cursor()
+            self._in_use[connection] = self._in_use.get(connection, 0) + 1
+
+        try:
+            cursor.execute(sql, list(params))
+            columns = [d[0] for d in cursor.description]
+            items = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            with self._lock:
+                self._in_use[connection] -= 1
+                if not self._in_use[connection]:
+                    del self._in_use[connection]
+                    if connection in self._retired:
+                        self._retired.discard(connection)
+                        connection.close()
+
+        result = {"snapshot": version, "items": items}
+        with self._lock:
+            if version == self._version:
+                self._results[key] = result
+                while len(self._results) > RESULT_CACHE_SIZE:
+                    self._results.popitem(last=False)
+        return result
+
+    async def run(self, name: str, sql: str, params: tuple = ()) -> dict:
+        # DuckDB bloqueia (e libera o GIL): roda fora do event loop
+        return await asyncio.to_thread(self.query, name, sql, params)
+
+
+engine = AnalyticsEngine()
+
+
+# ---------------------------------------------------------------------------
+# Consultas analíticas
+# ---------------------------------------------------------------------------
+
+GASTOS_PARTIDO_MES = """
+    SELECT pa.sigla AS partido,
+           month(g.data_emissao) AS mes,
+           CAST(sum(g.valor) AS DOUBLE) AS total,
+           count(*) AS qtd
+    FROM gastos g
+    JOIN politicos d ON d.id = g.politico_id
+    JOIN partidos pa ON pa.id = d.partido_id
+    WHERE year(g.data_emissao) = ?
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+# HHI (0-10.000) sobre a participação de cada fornecedor no total do recorte
+CONCENTRACAO_FORNECEDORES = """
+    WITH por_fornecedor AS (
+        SELECT g.empresa_cnpj AS cnpj, sum(g.valor) AS total, count(*) AS qtd
+        FROM gastos g
+        WHERE year(g.data_emissao) = ?
+          AND g.empresa_cnpj IS NOT NULL
+          AND (? IS NULL OR g.tipo_despesa = ?)
+        GROUP BY 1
+    ),
+    participacao AS (
+        SELECT cnpj, total, qtd, total / sum(total) OVER () AS share
+        FROM por_fornecedor
+    )
+    SELECT p.cnpj,
+           e.nome_fantasia AS nome,
+           CAST(p.total AS DOUBLE) AS total,
+           p.qtd,
+           CAST(p.share AS DOUBLE) AS share,
+           CAST(sum(p.share * p.share) OVER () * 10000 AS DOUBLE) AS hhi,
+           count(*) OVER () AS fornecedores
+    FROM participacao p
+    LEFT JOIN empresas e ON e.cnpj = p.cnpj
+    ORDER BY p.total DESC
+    LIMIT ?
+"""
+
+# Orientação majoritária (Sim/Não) de cada partido por votação e concordância entre pares
+CONCORDANCIA_PARTIDOS = """
+    WITH votos_partido AS (
+        SELECT v.votacao_id, pa.sigla AS partido, v.tipo_voto, count(*) AS n
+        FROM votos v
+        JOIN votacoes vt ON vt.id = v.votacao_id
+        JOIN politicos d ON d.id = v.politico_id
+        JOIN partidos pa ON pa.id = d.partido_id
+        WHERE year(vt.data) = ? AND v.tipo_voto IN ('Sim', 'Não')
+        GROUP BY 1, 2, 3
+    ),
+    orientacao AS (
+        SELECT votacao_id, partido, arg_max(tipo_voto, n) AS voto
+        FROM votos_partido
+        GROUP BY 1, 2
+    )
+    SELECT a.partido AS partido_a,
+           b.partido AS partido_b,
+           count(*) AS votacoes,
+           CAST(avg(CASE WHEN a.voto = b.voto THEN 1 ELSE 0 END) AS DOUBLE) AS concordancia
+    FROM orientacao a
+    JOIN orientacao b ON a.votacao_id = b.votacao_id AND a.partido < b.partido
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+
+async def gastos_partido_mes(ano: int) -> dict:
+    return await engine.run("gastos_partido_mes", GASTOS_PARTIDO_MES, (ano,))
+
+
+async def concentracao_fornecedores(ano: int, tipo_despesa: str | None = None, top: int = 20) -> dict:
+    result = await engine.run(
+        "concentracao_fornecedores", CONCENTRACAO_FORNECEDORES, (ano, tipo_despesa, tipo_despesa, top)
+    )
+    items = result["items"]
+    return {
+        "snapshot": result["snapshot"],
+        "hhi": items[0]["hhi"] if items else 0.0,
+        "fornecedores": items[0]["fornecedores"] if items else 0,
+        "top_share": sum(i["share"] for i in items),
+        "items": [{k: v for k, v in i.items() if k not in ("hhi", "fornecedores")} for i in items],
+    }
+
+
+async def concordancia_partidos(ano: int) -> dict:
+    return await engine.run("concordancia_partidos", CONCORDANCIA_PARTIDOS, (ano,))
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 import asyncio
 from src.core.celery_app import celery_app
-from src.core.database import AsyncSessionLocal
+from src.core.database import AsyncSessionLocal, run_with_engine
 from src.services.extractor.camara import CamaraExtractor
 from src.services.resilience_ingestor import ResilienceIngestor
 
@@ -10,7 +10,7 @@ from src.models.politico import Politico
 
 @celery_app.task(bind=True, max_retries=3)
 def fetch_deputados_task(self):
-    asyncio.run(_async_fetch_deputados())
+    run_with_engine(_async_fetch_deputados())
 
 async def _async_fetch_deputados():
     extractor = CamaraExtractor()
@@ -32,7 +32,7 @@ async def _async_fetch_deputados():
 def fetch_gastos_task(self, ano: int = None):
     if ano is None:
         ano = datetime.now().year
-    asyncio.run(_async_fetch_all_gastos(ano))
+    run_with_engine(_async_fetch_all_gastos(ano))
 
 async def _async_fetch_all_gastos(ano: int):
     extractor = CamaraExtractor()
@@ -92,7 +92,7 @@ def fetch_gastos_rescan_task(self):
     - Roda diariamente
     - Deduplicação no banco garante que não insere duplicatas
     """
-    asyncio.run(_async_fetch_gastos_rescan())
+    run_with_engine(_async_fetch_gastos_rescan())
 
 async def _async_fetch_gastos_rescan():
     """Busca gastos dos últimos 90 dias para pegar dados atrasados."""
@@ -163,7 +163,7 @@ async def _async_fetch_gastos_rescan():
 
 @celery_app.task(bind=True, max_retries=3)
 def fetch_proposicoes_task(self, days_back: int = 7):
-    asyncio.run(_async_fetch_proposicoes(days_back))
+    run_with_engine(_async_fetch_proposicoes(days_back))
 
 async def _async_fetch_proposicoes(days_back: int):
     extractor = CamaraExtractor()
@@ -221,7 +221,7 @@ async def _async_fetch_proposicoes(days_back: int):
 
 @celery_app.task(bind=True, max_retries=3)
 def fetch_votacoes_task(self, days_back: int = 7):
-    asyncio.run(_async_fetch_votacoes(days_back))
+    run_with_engine(_async_fetch_votacoes(days_back))
 
 async def _async_fetch_votacoes(days_back: int):
     extractor = CamaraExtractor()
@@ -274,3 +274,9 @@ async def _async_fetch_votacoes(days_back: int):
             print(f"Error in votacoes chunk {data_inicio}-{data_fim}: {e}")
             
         current_start = current_end + timedelta(days=1)
+
+@celery_app.task
+def build_analytics_snapshot_task():
+    # Snapshot Parquet para o motor analítico (src/services/analytics.py)
+    from src.services.snapshot import build_snapshot
+    return run_with_engine(build_snapshot())
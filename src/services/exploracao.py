@@ -0,0 +1,128 @@
+"""
+Manutenção do read model gastos_exploracao (src/models/exploracao.py).
+
+Cada escritor atualiza só o que mudou, na mesma transação da escrita de origem:
+- process_gastos_batch: as linhas dos gastos do lote (sync_gastos) e o nome de fornecedores
+  renomeados (sync_empresas);
+- process_deputados_batch: nome/partido/UF dos deputados que mudaram (sync_politicos);
+- GastoAnalyzer: a análise recém-criada (marcar_analise).
+
+rebuild_exploracao refaz a tabela inteira (scripts/backfill_rollups.py --exploracao).
+"""
+from sqlalchemy import delete, or_, select, text, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.analise import AnaliseIA
+from src.models.exploracao import GastoExploracao
+from src.models.gasto import Empresa, Gasto
+from src.models.politico import Partido, Politico
+
+_COLUMNS = [
+    "gasto_id", "ext_id", "politico_id", "politico_nome", "partido_sigla", "uf",
+    "data_emissao", "valor", "tipo_despesa", "empresa_cnpj", "fornecedor_nome", "url_documento",
+    "has_analise", "score_anomalia", "ai_resumo",
+]
+
+
+def _exploracao_select(*where):
+    # Análise mais recente do gasto (mesma regra do AnaliseLoader), pelo ix_analises_entidade
+    analise = (
+        select(AnaliseIA.id, AnaliseIA.score_anomalia, AnaliseIA.resumo_critico)
+        .where(AnaliseIA.entidade_tipo == "GASTO", AnaliseIA.entidade_id == Gasto.id)
+        .order_by(AnaliseIA.id.desc())
+        .limit(1)
+        .lateral("analise")
+    )
+    return (
+        select(
+            Gasto.id, Gasto.ext_id, Gasto.politico_id, Politico.nome_parlamentar, Partido.sigla, Politico.uf,
+            Gasto.data_emissao, Gasto.valor, Gasto.tipo_despesa, Gasto.empresa_cnpj, Empresa.nome_fantasia,
+            Gasto.url_documento, analise.c.id.is_not(None), analise.c.score_anomalia, analise.c.resumo_critico,
+        )
+        .join(Politico, Politico.id == Gasto.politico_id)
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .outerjoin(Empresa, Empresa.cnpj == Gasto.empresa_cnpj)
+        .outerjoin(analise, true())
+        .where(*where)
+    )
+
+
+async def sync_gastos(session: AsyncSession, ext_ids: list[int]):
+    """Insere/atualiza as linhas dos gastos dados (por ext_id) a partir das tabelas de origem."""
+    if not ext_ids:
+        return
+    stmt = insert(GastoExploracao).from_select(_COLUMNS, _exploracao_select(Gasto.ext_id.in_(ext_ids)))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["gasto_id"],
+        set_={c: stmt.excluded[c] for c in _COLUMNS if c != "gasto_id"},
+    )
+    await session.execute(stmt)
+
+
+async def dimensoes_politicos(session: AsyncSession, politico_ids: list[int]) -> dict:
+    """(nome, sigla do partido, UF) atuais de cada deputado, para detectar mudanças."""
+    if not politico_ids:
+        return {}
+    result = await session.execute(
+        select(Politico.id, Politico.nome_parlamentar, Partido.sigla, Politico.uf)
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .where(Politico.id.in_(politico_ids))
+    )
+    return {row[0]: tuple(row[1:]) for row in result.all()}
+
+
+async def sync_politicos(session: AsyncSession, politico_ids: list[int]):
+    """Propaga nome, partido e UF dos deputados dados para todas as suas linhas."""
+    if not politico_ids:
+        return
+    atual = (
+        select(Politico.id, Politico.nome_parlamentar, Partido.sigla, Politico.uf)
+        .outerjoin(Partido, Partido.id == Politico.partido_id)
+        .where(Politico.id.in_(politico_ids))
+        .subquery()
+    )
+    await session.execute(
+        update(GastoExploracao)
+        .where(
+            GastoExploracao.politico_id == atual.c.id,
+            or_(
+                GastoExploracao.politico_nome.is_distinct_from(atual.c.nome_parlamentar),
+                GastoExploracao.partido_sigla.is_distinct_from(atual.c.sigla),
+                GastoExploracao.uf.is_distinct_from(atual.c.uf),
+            ),
+        )
+        .values(politico_nome=atual.c.nome_parlamentar, partido_sigla=atual.c.sigla, uf=atual.c.uf)
+    )
+
+
+async def sync_empresas(session: AsyncSession, cnpjs: list[str]):
+    """Propaga o nome dos fornecedores dados (renomeados) para as suas linhas."""
+    if not cnpjs:
+        return
+    await session.execute(
+        update(GastoExploracao)
+        .where(
+            GastoExploracao.empresa_cnpj == Empresa.cnpj,
+            Empresa.cnpj.in_(cnpjs),
+            GastoExploracao.fornecedor_nome.is_distinct_from(Empresa.nome_fantasia),
+        )
+        .values(fornecedor_nome=Empresa.nome_fantasia)
+    )
+
+
+async def marcar_analise(session: AsyncSession, gasto_id: int, analise: AnaliseIA):
+    """Registra a análise recém-criada de um gasto (passa a ser a mais recente)."""
+    await session.execute(
+        update(GastoExploracao)
+        .where(GastoExploracao.gasto_id == gasto_id)
+        .values(has_analise=True, score_anomalia=analise.score_anomalia, ai_resumo=analise.resumo_critico)
+    )
+
+
+async def rebuild_exploracao(session: AsyncSession):
+    """Reconstrói gastos_exploracao inteira a partir das tabelas de origem."""
+    # Bloqueia ingestões de gastos concorrentes enquanto a tabela é refeita
+    await session.execute(text("LOCK TABLE gastos_gabinete IN SHARE MODE"))
+    await session.execute(delete(GastoExploracao))
+    await session.execute(insert(GastoExploracao).from_select(_COLUMNS, _exploracao_select()))
@@ -0,0 +1,246 @@
+"""
+Exportação em massa (CSV / NDJSON / Parquet) com cursor no servidor.
+
+As consultas são lidas em partições de EXPORT_CHUNK_SIZE linhas (`yield_per` sobre um
+cursor asyncpg) e cada partição é codificada e liberada antes da próxima: a memória não
+cresce com o tamanho da exportação. Usado pelas rotas /export/* e por scripts/export_data.py.
+
+Parquet depende de `pyarrow` (dependência do pyproject, importado só ao gerar Parquet).
+"""
+import csv
+import importlib.util
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.politico import Politico
+from src.models.proposicao import Proposicao, autoria_proposicao
+from src.models.votacao import Votacao
+from src.models.voto import Voto
+
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+DATASETS = ["gastos", "votos", "proposicoes"]
+
+
+class ExportError(ValueError):
+    pass
+
+
+def check_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Formato inválido: {fmt}. Use {', '.join(EXPORT_FORMATS)}")
+    # pyarrow é importado só ao gerar Parquet (não pesa no boot da API)
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ExportError("Exportação Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+
+# ---------------------------------------------------------------------------
+# Consultas: (statement, [(coluna, tipo)]) na mesma ordem do SELECT.
+# Ordenadas por id para que a exportação seja determinística.
+# ---------------------------------------------------------------------------
+
+def gastos_query(**filters):
+    """Mesmos filtros de /gastos/exploration (build_exploration_query)"""
+    from src.api.routes.gastos import build_exploration_query
+    from src.models.exploracao import GastoExploracao as G
+
+    stmt = build_exploration_query(**filters).with_only_columns(
+        G.gasto_id, G.ext_id, G.data_emissao, G.valor, G.tipo_despesa,
+        G.empresa_cnpj, G.url_documento, G.politico_id, G.politico_nome, G.partido_sigla,
+    ).order_by(G.gasto_id)
+    columns = [
+        ("id", "int"), ("ext_id", "int"), ("data_emissao", "date"), ("valor", "decimal"),
+        ("tipo_despesa", "str"), ("fornecedor_cnpj", "str"), ("url_documento", "str"),
+        ("politico_id", "int"), ("politico", "str"), ("partido", "str"),
+    ]
+    return stmt, columns
+
+
+def votos_query(politico_id: int | None = None, ano: int | None = None, votacao_id: str | None = None):
+    stmt = (
+        select(
+            Voto.id, Voto.votacao_id, Votacao.data, Votacao.proposicao_id,
+            Voto.politico_id, Politico.nome_parlamentar, Voto.tipo_voto,
+        )
+        .join(Votacao, Voto.votacao_id == Votacao.id)
+        .join(Politico, Voto.politico_id == Politico.id)
+        .order_by(Voto.id)
+    )
+    filters = []
+    if politico_id:
+        filters.append(Voto.politico_id == politico_id)
+    if ano:
+        filters.append(and_(Votacao.data >= datetime(ano, 1, 1), Votacao.data < datetime(ano + 1, 1, 1)))
+    if votacao_id:
+        filters.append(Voto.votacao_id == votacao_id)
+    if filters:
+        stmt = stmt.where(*filters)
+    columns = [
+        ("id", "int"), ("votacao_id", "str"), ("data", "datetime"), ("proposicao_id", "int"),
+        ("politico_id", "int"), ("politico", "str"), ("tipo_voto", "str"),
+    ]
+    return stmt, columns
+
+
+def proposicoes_query(politico_id: int | None = None, ano: int | None = None, sigla_tipo: str | None = None):
+    stmt = select(
+        Proposicao.id, Proposicao.sigla_tipo, Proposicao.numero, Proposicao.ano,
+        Proposicao.data_apresentacao, Proposicao.ementa,
+    ).order_by(Proposicao.id)
+    filters = []
+    if politico_id:
+        filters.append(Proposicao.id.in_(
+            select(autoria_proposicao.c.proposicao_id).where(autoria_proposicao.c.politico_id == politico_id)
+        ))
+    if ano:
+        filters.append(Proposicao.ano == ano)
+    if sigla_tipo:
+        filters.append(Proposicao.sigla_tipo == sigla_tipo.upper())
+    if filters:
+        stmt = stmt.where(*filters)
+    columns = [
+        ("id", "int"), ("sigla_tipo", "str"), ("numero", "int"), ("ano", "int"),
+        ("data_apresentacao", "datetime"), ("ementa", "str"),
+    ]
+    return stmt, columns
+
+
+# ---------------------------------------------------------------------------
+# Codificadores: recebem partições (listas de tuplas) e produzem bytes
+# ---------------------------------------------------------------------------
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_csv(columns, partition, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow([name for name, _ in columns])
+    writer.writerows(partition)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(columns, partition) -> bytes:
+    names = [name for name, _ in columns]
+    return "".join(
+        json.dumps(dict(zip(names, row)), ensure_ascii=False, default=_json_default) + "\n"
+        for row in partition
+    ).encode("utf-8")
+
+
+class _ChunkSink:
+    """Arquivo só de escrita que entrega os bytes em pedaços; tell() segue crescendo,
+    o que o ParquetWriter usa para os offsets do rodapé."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(pa, columns):
+    types = {
+        "int": pa.int64(), "str": pa.string(), "date": pa.date32(),
+        "datetime": pa.timestamp("us"), "decimal": pa.decimal128(14, 2),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+async def encode_chunks(fmt: str, columns, partitions):
+    if fmt == "csv":
+        header = True
+        async for partition in partitions:
+            yield _encode_csv(columns, partition, header)
+            header = False
+        if header:
+            # Exportação vazia ainda tem cabeçalho
+            yield _encode_csv(columns, [], True)
+    elif fmt == "ndjson":
+        async for partition in partitions:
+            yield _encode_ndjson(columns, partition)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema(pa, columns)
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        try:
+            # Cada partição vira um row group
+            async for partition in partitions:
+                arrays = list(zip(*partition))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(arrays, schema)],
+                    schema=schema,
+                ))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+
+async def stream_partitions(session: AsyncSession, stmt, chunk_size: int):
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+QUERIES = {
+    "gastos": gastos_query,
+    "votos": votos_query,
+    "proposicoes": proposicoes_query,
+}
+
+
+async def stream_export(session_factory, dataset: str, fmt: str, filters: dict,
+                        chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Gera os bytes da exportação. Abre a própria sessão: numa StreamingResponse as
+    dependências da rota já foram encerradas quando o corpo começa a ser enviado.
+    """
+    check_format(fmt)
+    stmt, columns = QUERIES[dataset](**filters)
+    async with session_factory() as session:
+        async for chunk in encode_chunks(fmt, columns, stream_partitions(session, stmt, chunk_size)):
+            if chunk:
+                yield chunk
@@ -1,4 +1,3 @@
-from google import genai
 from src.core.config import settings
 from pydantic import BaseModel, Field
 from typing import List
@@ -17,6 +16,9 @@ class AnalisePoliticaSchema(BaseModel):
 
 class GeminiClient:
     def __init__(self):
+        # Import tardio: só quem realmente chama o modelo paga o custo do SDK
+        from google import genai
+
         # allow either Gemini Developer API, Vertex AI, or a custom base URL
         if not settings.GEMINI_API_KEY and not settings.GOOGLE_GENAI_USE_VERTEXAI:
             raise ValueError("GEMINI_API_KEY not set (or enable Vertex mode via GOOGLE_GENAI_USE_VERTEXAI)")
@@ -0,0 +1,87 @@
+"""
+Placar precomputado das votações (votacoes_placar, src/models/resumo.py).
+
+Uma linha por votação com a contagem por tipo de voto e as quebras por partido e por UF,
+recalculada por process_votacoes_batch na mesma transação que regrava os votos. As rotas
+de /votacoes leem só essa linha; nunca agregam os ~513 votos de uma votação.
+
+O partido de cada voto é o do deputado no momento do cálculo (como gastos_mensal_partido).
+Tudo é reconstruível com scripts/backfill_rollups.py --placares.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Tipos de voto com coluna própria (ordenação/filtros); todos os tipos ficam em por_tipo.
+# {votos} e {votacoes} restringem as votações recalculadas (TRUE = todas).
+PLACAR_SQL = """
+WITH v AS (
+    SELECT vo.votacao_id, vo.tipo_voto, COALESCE(pa.sigla, '') AS sigla, COALESCE(p.uf, '') AS uf
+    FROM votos vo
+    JOIN politicos p ON p.id = vo.politico_id
+    LEFT JOIN partidos pa ON pa.id = p.partido_id
+    WHERE {votos}
+),
+tipos AS (
+    SELECT votacao_id, SUM(n)::int AS total, json_object_agg(tipo_voto, n ORDER BY tipo_voto) AS por_tipo
+    FROM (SELECT votacao_id, tipo_voto, COUNT(*) AS n FROM v GROUP BY 1, 2) t
+    GROUP BY 1
+),
+por_partido AS (
+    SELECT votacao_id,
+           json_agg(json_build_object('sigla', sigla, 'total', total, 'votos', votos) ORDER BY total DESC, sigla) AS grupos
+    FROM (
+        SELECT votacao_id, sigla, SUM(n) AS total, json_object_agg(tipo_voto, n ORDER BY tipo_voto) AS votos
+        FROM (SELECT votacao_id, sigla, tipo_voto, COUNT(*) AS n FROM v GROUP BY 1, 2, 3) t
+        GROUP BY 1, 2
+    ) g
+    GROUP BY 1
+),
+por_uf AS (
+    SELECT votacao_id,
+           json_agg(json_build_object('uf', uf, 'total', total, 'votos', votos) ORDER BY uf) AS grupos
+    FROM (
+        SELECT votacao_id, uf, SUM(n) AS total, json_object_agg(tipo_voto, n ORDER BY tipo_voto) AS votos
+        FROM (SELECT votacao_id, uf, tipo_voto, COUNT(*) AS n FROM v GROUP BY 1, 2, 3) t
+        GROUP BY 1, 2
+    ) g
+    GROUP BY 1
+)
+INSERT INTO votacoes_placar
+    (votacao_id, total, sim, nao, abstencao, obstrucao, por_tipo, por_partido, por_uf, updated_at)
+SELECT vt.id,
+       COALESCE(t.total, 0),
+       COALESCE((t.por_tipo->>'Sim')::int, 0),
+       COALESCE((t.por_tipo->>'Não')::int, 0),
+       COALESCE((t.por_tipo->>'Abstenção')::int, 0),
+       COALESCE((t.por_tipo->>'Obstrução')::int, 0),
+       COALESCE(t.por_tipo, '{{}}'::json),
+       COALESCE(pp.grupos, '[]'::json),
+       COALESCE(pu.grupos, '[]'::json),
+       now()
+FROM votacoes vt
+LEFT JOIN tipos t ON t.votacao_id = vt.id
+LEFT JOIN por_partido pp ON pp.votacao_id = vt.id
+LEFT JOIN por_uf pu ON pu.votacao_id = vt.id
+WHERE {votacoes}
+ON CONFLICT (votacao_id) DO UPDATE SET
+    total = EXCLUDED.total, sim = EXCLUDED.sim, nao = EXCLUDED.nao,
+    abstencao = EXCLUDED.abstencao, obstrucao = EXCLUDED.obstrucao,
+    por_tipo = EXCLUDED.por_tipo, por_partido = EXCLUDED.por_partido, por_uf = EXCLUDED.por_uf,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+async def refresh_placares(session: AsyncSession, votacao_ids: list[str]):
+    """Recalcula o placar das votações dadas a partir dos votos já gravados na transação."""
+    if not votacao_ids:
+        return
+    sql = PLACAR_SQL.format(votos="vo.votacao_id = ANY(:ids)", votacoes="vt.id = ANY(:ids)")
+    await session.execute(text(sql), {"ids": list(votacao_ids)})
+
+
+async def rebuild_placares(session: AsyncSession):
+    """Reconstrói votacoes_placar inteira."""
+    # Bloqueia ingestões concorrentes de votações enquanto os placares são refeitos
+    await session.execute(text("LOCK TABLE votos IN SHARE MODE"))
+    await session.execute(text("DELETE FROM votacoes_placar"))
+    await session.execute(text(PLACAR_SQL.format(votos="TRUE", votacoes="TRUE")))
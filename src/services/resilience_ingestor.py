@@ -3,11 +3,13 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
-from src.models.gasto import Gasto, Empresa
+from src.models.gasto import Gasto, Empresa, TipoDespesa
 from src.models.proposicao import Proposicao
 from src.models.votacao import Votacao
 from src.models.voto import Voto
 from src.models.dlq import DLQ
+from src.services import exploracao, placares, rollups
+from src.core.cache import bump_tags
 from src.schemas.camara_api import StrictGastoSchema, ProposicaoSchema, VotacaoSchema, VotoSchema
 
 class ResilienceIngestor:
@@ -55,23 +57,56 @@ class ResilienceIngestor:
                 })
 
         # 3. Upsert Empresas primeiro (FK dependency)
+        empresas_alteradas = []
         if valid_empresas:
             stmt = insert(Empresa).values(list(valid_empresas.values()))
             stmt = stmt.on_conflict_do_update(
                 index_elements=['cnpj'],
-                set_={"nome_fantasia": stmt.excluded.nome_fantasia}
-            )
-            await self.session.execute(stmt)
+                set_={"nome_fantasia": stmt.excluded.nome_fantasia},
+                # Só reescreve (e devolve) fornecedores novos ou renomeados
+                where=Empresa.nome_fantasia.is_distinct_from(stmt.excluded.nome_fantasia),
+            ).returning(Empresa.cnpj)
+            empresas_alteradas = (await self.session.execute(stmt)).scalars().all()
 
         # 4. Upsert Gastos
+        anteriores = []
         if valid_records:
+            anteriores = await rollups.gastos_anteriores(self.session, politico_id, [r['ext_id'] for r in valid_records])
             await self._bulk_upsert_gastos(valid_records)
+            # Mesma transação do upsert: gastos_mensal e os rollups de fornecedores nunca divergem de gastos_gabinete
+            await rollups.aplicar_deltas_mensais(self.session, anteriores, valid_records)
+            await rollups.aplicar_deltas_fornecedores(self.session, anteriores, valid_records)
+            await exploracao.sync_gastos(self.session, [r['ext_id'] for r in valid_records])
+        await exploracao.sync_empresas(self.session, empresas_alteradas)
+
+        # Tipos de despesa novos entram no lookup (lido pelo cache de dimensões da API)
+        tipos_novos = []
+        tipos = sorted({r['tipo_despesa'] for r in valid_records if r.get('tipo_despesa')})
+        if tipos:
+            result = await self.session.execute(
+                insert(TipoDespesa).values([{"nome": t} for t in tipos])
+                .on_conflict_do_nothing(index_elements=['nome'])
+                .returning(TipoDespesa.nome)
+            )
+            tipos_novos = result.scalars().all()
+
+        # Anos tocados pelo lote (inclui o ano anterior de gastos já gravados) para o resumo anual
+        anos = {r['data_emissao'].year for r in valid_records if r.get('data_emissao')}
+        anos |= {r.data_emissao.year for r in anteriores if r.data_emissao}
         
         if dlq_records:
             await self._bulk_insert_dlq(dlq_records)
             
         await self.session.commit()
 
+        if anos:
+            await self._refresh_rollups(rollups.refresh_gastos_politico, politico_id, anos)
+        if valid_records:
+            tags = ["gastos", "stats", f"deputado:{politico_id}"]
+            if tipos_novos:
+                tags.append("tipos_despesa")
+            await bump_tags(*tags)
+
     async def _bulk_upsert_gastos(self, records):
         stmt = insert(Gasto).values(records)
         # Sincroniza campos exceto a PK interna se houver conflito no ext_id
@@ -132,6 +167,11 @@ class ResilienceIngestor:
                     "error_type": type(e).__name__
                 })
 
+        # Nome/partido/UF atuais, para propagar só as mudanças ao read model da exploração
+        anteriores = await exploracao.dimensoes_politicos(self.session, [p["id"] for p in valid_politicos])
+        # UF/partido atuais (chave dos rollups mensais por UF e partido)
+        dimensoes_mensais = await rollups.dimensoes_mensais(self.session, [p["id"] for p in valid_politicos])
+
         # 1. Upsert Partidos
         if valid_partidos:
             stmt = insert(Partido).values(list(valid_partidos.values()))
@@ -153,17 +193,30 @@ class ResilienceIngestor:
             }
             stmt = stmt.on_conflict_do_update(index_elements=['id'], set_=update_dict)
             await self.session.execute(stmt)
+
+            alterados = [
+                p["id"] for p in valid_politicos
+                if p["id"] in anteriores
+                and anteriores[p["id"]] != (p["nome_parlamentar"], valid_partidos[p["partido_id"]]["sigla"], p["uf"])
+            ]
+            await exploracao.sync_politicos(self.session, alterados)
+            await rollups.mover_gastos_mensais(self.session, dimensoes_mensais)
         
         if dlq_records:
             await self._bulk_insert_dlq(dlq_records)
             
         await self.session.commit()
 
+        if valid_politicos:
+            await self._refresh_rollups(rollups.refresh_contagens)
+            await bump_tags("deputados", "partidos", "stats")
+
     async def process_proposicoes_batch(self, raw_data_list: list[dict]):
         valid_records = []
         dlq_records = []
         all_authors = [] # (proposicao_id, politico_id)
         proposicao_ids_to_clean = []
+        final_authors = []
 
         for raw_item in raw_data_list:
             try:
@@ -235,11 +288,28 @@ class ResilienceIngestor:
             
         await self.session.commit()
 
+        if valid_records:
+            await self._refresh_rollups(rollups.refresh_contagens)
+            # Perfis dos autores (total de proposições) também mudam
+            autores = {a['politico_id'] for a in final_authors}
+            await bump_tags("proposicoes", "stats", *(f"deputado:{pid}" for pid in sorted(autores)))
+
+    async def _refresh_rollups(self, refresh, *args):
+        # Transação própria, depois do commit dos dados: uma falha aqui não perde o lote
+        # (o backfill_rollups.py corrige o resumo)
+        try:
+            await refresh(self.session, *args)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            print(f"[ROLLUPS] Refresh failed ({refresh.__name__}): {e}")
+
     async def _bulk_upsert_proposicoes(self, records):
         stmt = insert(Proposicao).values(records)
+        # ementa_tsv é coluna gerada: o Postgres a recalcula quando a ementa muda
         update_dict = {
             c.name: c for c in stmt.excluded 
-            if c.name not in ['id', 'created_at']
+            if c.name not in ['id', 'created_at', 'ementa_tsv']
         }
         stmt = stmt.on_conflict_do_update(
             index_elements=['id'],
@@ -340,12 +410,18 @@ class ResilienceIngestor:
             
             if final_votos:
                 await self.session.execute(insert(Voto).values(final_votos))
+
+        # Placar (tipo de voto, partido, UF) das votações do lote, na mesma transação dos votos
+        await placares.refresh_placares(self.session, votacao_ids_to_clean)
         
         if dlq_records:
             await self._bulk_insert_dlq(dlq_records)
             
         await self.session.commit()
 
+        if valid_records:
+            await bump_tags("votacoes")
+
     async def _bulk_upsert_votacoes(self, records):
         stmt = insert(Votacao).values(records)
         update_dict = {
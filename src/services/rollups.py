@@ -0,0 +1,453 @@
+"""
+Rollups (tabelas de resumo) de gastos.
+
+gastos_resumo_anual guarda total/qtd por (deputado, ano, tipo de despesa) e é recalculado
+apenas para os pares deputado-ano tocados por um lote de ingestão (lido pelo índice
+ix_gastos_politico_data). dashboard_anual é derivado dele: uma linha por ano, lida pela PK em
+/stats/dashboard.
+
+gastos_mensal (e suas agregações por UF e partido) é mantido por deltas: o ingestor trava o
+deputado (advisory lock), lê a versão anterior dos gastos do lote, aplica o upsert e soma a diferença nos
+rollups, tudo na mesma transação. Os rollups de fornecedores (gastos_fornecedor,
+fornecedores_anual e fornecedores_concentracao) seguem o mesmo caminho.
+
+Tudo é reconstruível com scripts/backfill_rollups.py.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Integer, and_, delete, func, literal_column, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.gasto import Gasto
+from src.models.politico import Politico
+from src.models.proposicao import Proposicao
+from src.models.resumo import (
+    DashboardAnual, GastoResumoAnual, GastoMensal, GastoMensalUF, GastoMensalPartido,
+    GastoFornecedor, FornecedorAnual,
+)
+
+# Namespace do pg_advisory_xact_lock(ns, ano): serializa recálculos concorrentes do mesmo ano
+DASHBOARD_LOCK_NAMESPACE = 3601
+# Namespace do pg_advisory_xact_lock(ns, politico_id): um lote de gastos por deputado por vez
+GASTOS_LOCK_NAMESPACE = 3602
+TOP_N = 5
+
+
+def _anos_filter(anos):
+    # Range por ano (sargável) em vez de extract('year', ...)
+    return or_(*(
+        and_(Gasto.data_emissao >= date(ano, 1, 1), Gasto.data_emissao < date(ano + 1, 1, 1))
+        for ano in sorted(anos)
+    ))
+
+
+def _resumo_select(*where):
+    ano = func.extract("year", Gasto.data_emissao).cast(Integer)
+    # literal_column: o mesmo texto no SELECT e no GROUP BY (um bind param seria outro $n)
+    tipo = func.coalesce(Gasto.tipo_despesa, literal_column("''"))
+    return (
+        select(Gasto.politico_id, ano, tipo, func.sum(Gasto.valor), func.count())
+        .where(Gasto.data_emissao.is_not(None), *where)
+        .group_by(Gasto.politico_id, ano, tipo)
+    )
+
+
+_RESUMO_COLUMNS = ["politico_id", "ano", "tipo_despesa", "total", "qtd"]
+
+
+async def gastos_anteriores(session: AsyncSession, politico_id: int, ext_ids: list[int]) -> list:
+    """
+    Versão atual dos gastos que o lote vai sobrescrever.
+
+    Antes da leitura trava o deputado até o commit (pg_advisory_xact_lock): dois lotes
+    sobrepostos do mesmo deputado (ex.: retry do Celery com a primeira execução ainda
+    rodando) rodam em série, e o segundo vê o que o primeiro gravou. Lock de linha não
+    bastaria: para um ext_id ainda inexistente o FOR UPDATE não trava nada e os dois
+    lotes somariam o valor inteiro como inserção.
+    """
+    if not ext_ids:
+        return []
+    await session.execute(select(func.pg_advisory_xact_lock(GASTOS_LOCK_NAMESPACE, politico_id)))
+    result = await session.execute(
+        select(Gasto.ext_id, Gasto.politico_id, Gasto.data_emissao, Gasto.tipo_despesa, Gasto.empresa_cnpj, Gasto.valor)
+        .where(Gasto.ext_id.in_(ext_ids))
+        .order_by(Gasto.ext_id)
+        .with_for_update()
+    )
+    return result.all()
+
+
+def _mensal_key(politico_id, data_emissao, tipo_despesa):
+    ano, mes = (data_emissao.year, data_emissao.month) if data_emissao else (0, 0)
+    return (politico_id, ano, mes, tipo_despesa or "")
+
+
+def _ano(data_emissao):
+    return data_emissao.year if data_emissao else 0
+
+
+_MENSAL_KEY = ["ano", "mes", "tipo_despesa"]
+
+
+async def aplicar_deltas_mensais(session: AsyncSession, anteriores: list, novos: list[dict]):
+    """
+    Soma em gastos_mensal(_uf/_partido) a diferença entre a versão anterior dos gastos
+    (gastos_anteriores) e a nova (registros do upsert). Gastos reenviados sem mudança
+    produzem delta zero e não tocam os rollups.
+    """
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    for row in anteriores:
+        delta = deltas[_mensal_key(row.politico_id, row.data_emissao, row.tipo_despesa)]
+        delta[0] -= row.valor
+        delta[1] -= 1
+    for record in novos:
+        delta = deltas[_mensal_key(record["politico_id"], record.get("data_emissao"), record.get("tipo_despesa"))]
+        delta[0] += record["valor"]
+        delta[1] += 1
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    # FOR SHARE: espera um process_deputados_batch concorrente terminar de mover o histórico
+    dimensoes = await dimensoes_mensais(session, {key[0] for key in deltas}, lock=True)
+
+    por_uf = defaultdict(lambda: [Decimal(0), 0])
+    por_partido = defaultdict(lambda: [Decimal(0), 0])
+    for (politico_id, ano, mes, tipo), (total, qtd) in deltas.items():
+        uf, partido_id = dimensoes.get(politico_id, (None, None))
+        for grupo, dimensao in ((por_uf, uf), (por_partido, partido_id)):
+            if dimensao is not None:
+                grupo[(dimensao, ano, mes, tipo)][0] += total
+                grupo[(dimensao, ano, mes, tipo)][1] += qtd
+
+    await _aplicar(session, GastoMensal, ["politico_id", *_MENSAL_KEY], deltas)
+    await _aplicar(session, GastoMensalUF, ["uf", *_MENSAL_KEY], por_uf)
+    await _aplicar(session, GastoMensalPartido, ["partido_id", *_MENSAL_KEY], por_partido)
+
+
+async def dimensoes_mensais(session: AsyncSession, politico_ids, lock: bool = False) -> dict:
+    """(uf, partido_id) atuais de cada deputado: a chave de gastos_mensal_uf/_partido."""
+    if not politico_ids:
+        return {}
+    stmt = select(Politico.id, Politico.uf, Politico.partido_id).where(Politico.id.in_(politico_ids))
+    if lock:
+        stmt = stmt.order_by(Politico.id).with_for_update(read=True)
+    result = await session.execute(stmt)
+    return {row.id: (row.uf, row.partido_id) for row in result.all()}
+
+
+async def mover_gastos_mensais(session: AsyncSession, anteriores: dict):
+    """
+    Move o histórico de gastos_mensal_uf/_partido dos deputados que mudaram de UF ou de
+    partido. `anteriores` é dimensoes_mensais lido antes do upsert de process_deputados_batch;
+    sem isso, o próximo delta de um gasto reenviado seria subtraído do grupo novo.
+    """
+    atuais = await dimensoes_mensais(session, list(anteriores))
+    mudaram = {
+        politico_id: (anteriores[politico_id], atual)
+        for politico_id, atual in atuais.items()
+        if atual != anteriores[politico_id]
+    }
+    if not mudaram:
+        return
+
+    result = await session.execute(
+        select(GastoMensal.politico_id, GastoMensal.ano, GastoMensal.mes, GastoMensal.tipo_despesa,
+               GastoMensal.total, GastoMensal.qtd)
+        .where(GastoMensal.politico_id.in_(mudaram))
+    )
+    por_uf = defaultdict(lambda: [Decimal(0), 0])
+    por_partido = defaultdict(lambda: [Decimal(0), 0])
+    for politico_id, ano, mes, tipo, total, qtd in result.all():
+        (uf_antiga, partido_antigo), (uf_nova, partido_novo) = mudaram[politico_id]
+        for grupo, antigo, novo in ((por_uf, uf_antiga, uf_nova), (por_partido, partido_antigo, partido_novo)):
+            if antigo == novo:
+                continue
+            if antigo is not None:
+                grupo[(antigo, ano, mes, tipo)][0] -= total
+                grupo[(antigo, ano, mes, tipo)][1] -= qtd
+            if novo is not None:
+                grupo[(novo, ano, mes, tipo)][0] += total
+                grupo[(novo, ano, mes, tipo)][1] += qtd
+
+    await _aplicar(session, GastoMensalUF, ["uf", *_MENSAL_KEY], por_uf)
+    await _aplicar(session, GastoMensalPartido, ["partido_id", *_MENSAL_KEY], por_partido)
+
+
+async def aplicar_deltas_fornecedores(session: AsyncSession, anteriores: list, novos: list[dict]):
+    """
+    Como aplicar_deltas_mensais, para gastos_fornecedor e fornecedores_anual; em seguida
+    recalcula deputados por fornecedor e a concentração dos deputados-ano tocados.
+    """
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    for row in anteriores:
+        if row.empresa_cnpj:
+            delta = deltas[(row.empresa_cnpj, row.politico_id, _ano(row.data_emissao))]
+            delta[0] -= row.valor
+            delta[1] -= 1
+    for record in novos:
+        if record.get("empresa_cnpj"):
+            delta = deltas[(record["empresa_cnpj"], record["politico_id"], _ano(record.get("data_emissao")))]
+            delta[0] += record["valor"]
+            delta[1] += 1
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    por_fornecedor = defaultdict(lambda: [Decimal(0), 0])
+    politicos_anos = defaultdict(set)
+    for (cnpj, politico_id, ano), (total, qtd) in deltas.items():
+        por_fornecedor[(cnpj, ano)][0] += total
+        por_fornecedor[(cnpj, ano)][1] += qtd
+        politicos_anos[politico_id].add(ano)
+
+    await _aplicar(session, GastoFornecedor, ["empresa_cnpj", "politico_id", "ano"], deltas)
+    await _aplicar(session, FornecedorAnual, ["empresa_cnpj", "ano"], por_fornecedor, deputados=0)
+
+    # As linhas de fornecedores_anual já estão travadas pelo upsert acima, então a contagem
+    # enxerga os gastos_fornecedor de qualquer lote concorrente que tenha terminado antes
+    fornecedores_anos = sorted(por_fornecedor)
+    await session.execute(
+        update(FornecedorAnual)
+        .where(tuple_(FornecedorAnual.empresa_cnpj, FornecedorAnual.ano).in_(fornecedores_anos))
+        .values(deputados=(
+            select(func.count())
+            .where(
+                GastoFornecedor.empresa_cnpj == FornecedorAnual.empresa_cnpj,
+                GastoFornecedor.ano == FornecedorAnual.ano,
+            )
+            .scalar_subquery()
+        ))
+    )
+    for politico_id in sorted(politicos_anos):
+        await refresh_concentracao(session, politico_id, politicos_anos[politico_id])
+
+
+async def _aplicar(session: AsyncSession, model, key_columns: list[str], deltas: dict, **insert_defaults):
+    # Ordem fixa das chaves: lotes concorrentes travam as linhas na mesma ordem (sem deadlock)
+    keys = sorted(key for key, delta in deltas.items() if delta[0] or delta[1])
+    if not keys:
+        return
+    rows = [dict(zip(key_columns, key), total=deltas[key][0], qtd=deltas[key][1], **insert_defaults) for key in keys]
+    table = model.__table__
+    stmt = insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={"total": table.c.total + stmt.excluded.total, "qtd": table.c.qtd + stmt.excluded.qtd},
+    )
+    await session.execute(stmt)
+    # Grupos que ficaram vazios (ex.: gasto mudou de mês) saem do rollup
+    await session.execute(
+        delete(model).where(
+            model.qtd <= 0,
+            tuple_(*(table.c[c] for c in key_columns)).in_(keys),
+        )
+    )
+
+
+# Concentração por deputado-ano; {where} filtra gastos_fornecedor (ver refresh_concentracao)
+CONCENTRACAO_SQL = """
+    INSERT INTO fornecedores_concentracao (politico_id, ano, total, fornecedores, hhi, top1_share, top5_share)
+    SELECT politico_id, ano, SUM(total), COUNT(*),
+           SUM(share * share) * 10000, MAX(share), SUM(share) FILTER (WHERE posicao <= 5)
+    FROM (
+        SELECT politico_id, ano, total,
+               (total / NULLIF(SUM(total) OVER w, 0))::float8 AS share,
+               ROW_NUMBER() OVER (w ORDER BY total DESC) AS posicao
+        FROM gastos_fornecedor
+        WHERE {where}
+        WINDOW w AS (PARTITION BY politico_id, ano)
+    ) participacao
+    GROUP BY politico_id, ano
+    ON CONFLICT (politico_id, ano) DO UPDATE SET
+        total = EXCLUDED.total,
+        fornecedores = EXCLUDED.fornecedores,
+        hhi = EXCLUDED.hhi,
+        top1_share = EXCLUDED.top1_share,
+        top5_share = EXCLUDED.top5_share
+"""
+
+
+async def refresh_concentracao(session: AsyncSession, politico_id: int, anos: set[int]):
+    """Recalcula fornecedores_concentracao de um deputado nos anos dados (0 = sem data)."""
+    params = {"politico_id": politico_id, "anos": sorted(anos)}
+    await session.execute(
+        text(CONCENTRACAO_SQL.format(where="politico_id = :politico_id AND ano = ANY(:anos)")),
+        params,
+    )
+    # Deputado-ano sem nenhum fornecedor restante
+    await session.execute(text("""
+        DELETE FROM fornecedores_concentracao c
+        WHERE c.politico_id = :politico_id AND c.ano = ANY(:anos)
+          AND NOT EXISTS (
+              SELECT 1 FROM gastos_fornecedor g WHERE g.politico_id = c.politico_id AND g.ano = c.ano
+          )
+    """), params)
+
+
+async def refresh_gastos_politico(session: AsyncSession, politico_id: int, anos: set[int]):
+    """Recalcula o resumo de um deputado nos anos dados e o dashboard desses anos."""
+    if not anos:
+        return
+    await session.execute(
+        delete(GastoResumoAnual).where(
+            GastoResumoAnual.politico_id == politico_id,
+            GastoResumoAnual.ano.in_(anos),
+        )
+    )
+    await session.execute(
+        insert(GastoResumoAnual).from_select(
+            _RESUMO_COLUMNS,
+            _resumo_select(Gasto.politico_id == politico_id, _anos_filter(anos)),
+        )
+    )
+    for ano in sorted(anos):
+        await refresh_dashboard(session, ano)
+
+
+async def rebuild_gastos_resumo(session: AsyncSession, anos: set[int] | None = None):
+    """Reconstrói o resumo inteiro (ou só os anos dados) a partir de gastos_gabinete."""
+    clear = delete(GastoResumoAnual)
+    where = []
+    if anos:
+        clear = clear.where(GastoResumoAnual.ano.in_(anos))
+        where.append(_anos_filter(anos))
+    await session.execute(clear)
+    await session.execute(insert(GastoResumoAnual).from_select(_RESUMO_COLUMNS, _resumo_select(*where)))
+
+
+# Reconstrução completa de gastos_mensal e derivados (mesmo SQL da migration d81f3a6c2e94)
+REBUILD_MENSAL_SQL = [
+    "DELETE FROM gastos_mensal_partido",
+    "DELETE FROM gastos_mensal_uf",
+    "DELETE FROM gastos_mensal",
+    """
+    INSERT INTO gastos_mensal (politico_id, ano, mes, tipo_despesa, total, qtd)
+    SELECT politico_id,
+           COALESCE(EXTRACT(YEAR FROM data_emissao)::int, 0),
+           COALESCE(EXTRACT(MONTH FROM data_emissao)::int, 0),
+           COALESCE(tipo_despesa, ''),
+           SUM(valor), COUNT(*)
+    FROM gastos_gabinete
+    GROUP BY 1, 2, 3, 4
+    """,
+    """
+    INSERT INTO gastos_mensal_uf (uf, ano, mes, tipo_despesa, total, qtd)
+    SELECT p.uf, m.ano, m.mes, m.tipo_despesa, SUM(m.total), SUM(m.qtd)
+    FROM gastos_mensal m JOIN politicos p ON p.id = m.politico_id
+    WHERE p.uf IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    """,
+    """
+    INSERT INTO gastos_mensal_partido (partido_id, ano, mes, tipo_despesa, total, qtd)
+    SELECT p.partido_id, m.ano, m.mes, m.tipo_despesa, SUM(m.total), SUM(m.qtd)
+    FROM gastos_mensal m JOIN politicos p ON p.id = m.politico_id
+    WHERE p.partido_id IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    """,
+]
+
+
+# Reconstrução completa dos rollups de fornecedores (mesmo SQL da migration e2b7f4c81a06)
+REBUILD_FORNECEDORES_SQL = [
+    "DELETE FROM fornecedores_concentracao",
+    "DELETE FROM fornecedores_anual",
+    "DELETE FROM gastos_fornecedor",
+    """
+    INSERT INTO gastos_fornecedor (empresa_cnpj, politico_id, ano, total, qtd)
+    SELECT empresa_cnpj, politico_id, COALESCE(EXTRACT(YEAR FROM data_emissao)::int, 0),
+           SUM(valor), COUNT(*)
+    FROM gastos_gabinete
+    WHERE empresa_cnpj IS NOT NULL
+    GROUP BY 1, 2, 3
+    """,
+    """
+    INSERT INTO fornecedores_anual (empresa_cnpj, ano, total, qtd, deputados)
+    SELECT empresa_cnpj, ano, SUM(total), SUM(qtd), COUNT(*)
+    FROM gastos_fornecedor
+    GROUP BY 1, 2
+    """,
+    CONCENTRACAO_SQL.format(where="TRUE"),
+]
+
+
+async def rebuild_gastos_fornecedores(session: AsyncSession):
+    """Reconstrói gastos_fornecedor, fornecedores_anual e fornecedores_concentracao."""
+    await session.execute(text("LOCK TABLE gastos_gabinete IN SHARE MODE"))
+    for sql in REBUILD_FORNECEDORES_SQL:
+        await session.execute(text(sql))
+
+
+async def rebuild_gastos_mensal(session: AsyncSession):
+    """Reconstrói gastos_mensal(_uf/_partido); partidos passam a ser os atuais dos deputados."""
+    # Bloqueia ingestões concorrentes de gastos enquanto os rollups são refeitos
+    await session.execute(text("LOCK TABLE gastos_gabinete IN SHARE MODE"))
+    for sql in REBUILD_MENSAL_SQL:
+        await session.execute(text(sql))
+
+
+async def refresh_dashboard(session: AsyncSession, ano: int):
+    """Recalcula a linha de dashboard_anual de um ano a partir de gastos_resumo_anual."""
+    await session.execute(select(func.pg_advisory_xact_lock(DASHBOARD_LOCK_NAMESPACE, ano)))
+
+    total_gastos, qtd_gastos = (await session.execute(
+        select(func.coalesce(func.sum(GastoResumoAnual.total), 0), func.coalesce(func.sum(GastoResumoAnual.qtd), 0))
+        .where(GastoResumoAnual.ano == ano)
+    )).one()
+
+    total_por_deputado = func.sum(GastoResumoAnual.total)
+    top_result = await session.execute(
+        select(Politico.id, Politico.nome_parlamentar, Politico.foto_url, total_por_deputado)
+        .join(Politico, Politico.id == GastoResumoAnual.politico_id)
+        .where(GastoResumoAnual.ano == ano)
+        .group_by(Politico.id)
+        .order_by(total_por_deputado.desc())
+        .limit(TOP_N)
+    )
+    top_spenders = [
+        {"id": r[0], "nome": r[1], "foto_url": r[2], "valor": float(r[3])}
+        for r in top_result.all()
+    ]
+
+    total_por_tipo = func.sum(GastoResumoAnual.total)
+    category_result = await session.execute(
+        select(GastoResumoAnual.tipo_despesa, total_por_tipo)
+        .where(GastoResumoAnual.ano == ano)
+        .group_by(GastoResumoAnual.tipo_despesa)
+        .order_by(total_por_tipo.desc())
+        .limit(TOP_N)
+    )
+    categories = [
+        {"categoria": r[0] or None, "valor": float(r[1])}
+        for r in category_result.all()
+    ]
+
+    values = {
+        "ano": ano,
+        "total_gastos": total_gastos,
+        "qtd_gastos": qtd_gastos,
+        "total_deputados": await session.scalar(select(func.count(Politico.id))),
+        "total_proposicoes": await session.scalar(select(func.count(Proposicao.id))),
+        "top_spenders": top_spenders,
+        "categories": categories,
+    }
+    stmt = insert(DashboardAnual).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ano"],
+        set_={**{k: stmt.excluded[k] for k in values if k != "ano"}, "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def refresh_contagens(session: AsyncSession):
+    """Atualiza total_deputados/total_proposicoes em todas as linhas (poucas: uma por ano)."""
+    await session.execute(
+        update(DashboardAnual).values(
+            total_deputados=select(func.count(Politico.id)).scalar_subquery(),
+            total_proposicoes=select(func.count(Proposicao.id)).scalar_subquery(),
+            updated_at=func.now(),
+        )
+    )
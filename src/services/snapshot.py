@@ -0,0 +1,133 @@
+"""
+Snapshot analítico: exporta as tabelas principais para Parquet local.
+
+Cada execução grava <ANALYTICS_SNAPSHOT_DIR>/<versão>/<tabela>.parquet a partir da réplica
+de leitura (ou do primário em modo somente leitura), numa única transação REPEATABLE READ
+para que as tabelas sejam consistentes entre si. A versão só é publicada (arquivo CURRENT)
+depois que todos os arquivos foram escritos; src/services/analytics.py lê sempre a versão
+publicada. Requer pyarrow.
+
+Agendado no Celery beat (build_analytics_snapshot_task) ou via scripts/analytics_snapshot.py.
+"""
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select
+
+from src.core.config import settings
+from src.core.database import AsyncReadSessionLocal
+from src.models.gasto import Gasto, Empresa
+from src.models.politico import Politico, Partido
+from src.models.proposicao import Proposicao, autoria_proposicao
+from src.models.votacao import Votacao
+from src.models.voto import Voto
+from src.services.export import check_format, encode_chunks, stream_partitions
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+# tabela -> [(coluna, tipo)] ; tipos de src/services/export.py
+SNAPSHOT_TABLES = {
+    "partidos": [(Partido.id, "int"), (Partido.sigla, "str"), (Partido.nome, "str")],
+    "politicos": [
+        (Politico.id, "int"), (Politico.nome_parlamentar, "str"), (Politico.uf, "str"),
+        (Politico.partido_id, "int"), (Politico.id_legislatura, "int"),
+    ],
+    "empresas": [(Empresa.cnpj, "str"), (Empresa.nome_fantasia, "str")],
+    "gastos": [
+        (Gasto.id, "int"), (Gasto.politico_id, "int"), (Gasto.empresa_cnpj, "str"),
+        (Gasto.valor, "decimal"), (Gasto.data_emissao, "date"), (Gasto.tipo_despesa, "str"),
+    ],
+    "proposicoes": [
+        (Proposicao.id, "int"), (Proposicao.sigla_tipo, "str"), (Proposicao.numero, "int"),
+        (Proposicao.ano, "int"), (Proposicao.data_apresentacao, "datetime"),
+    ],
+    "autoria": [(autoria_proposicao.c.proposicao_id, "int"), (autoria_proposicao.c.politico_id, "int")],
+    "votacoes": [
+        (Votacao.id, "str"), (Votacao.data, "datetime"), (Votacao.sigla_orgao, "str"),
+        (Votacao.aprovacao, "int"), (Votacao.proposicao_id, "int"),
+    ],
+    "votos": [
+        (Voto.id, "int"), (Voto.votacao_id, "str"), (Voto.politico_id, "int"), (Voto.tipo_voto, "str"),
+    ],
+}
+
+
+def snapshot_root() -> Path:
+    return Path(settings.ANALYTICS_SNAPSHOT_DIR)
+
+
+def current_snapshot() -> tuple[str, Path] | None:
+    """(versão, diretório) publicados, ou None se nenhum snapshot foi gerado ainda."""
+    root = snapshot_root()
+    try:
+        version = (root / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return None
+    path = root / version
+    return (version, path) if version and path.is_dir() else None
+
+
+async def _write_table(session, path: Path, name: str, spec) -> int:
+    stmt = select(*(column for column, _ in spec))
+    columns = [(column.name, kind) for column, kind in spec]
+    rows = 0
+
+    async def counted(partitions):
+        nonlocal rows
+        async for partition in partitions:
+            rows += len(partition)
+            yield partition
+
+    with open(path / f"{name}.parquet", "wb") as f:
+        async for chunk in encode_chunks("parquet", columns, counted(stream_partitions(session, stmt, 20_000))):
+            f.write(chunk)
+    return rows
+
+
+async def build_snapshot() -> dict:
+    check_format("parquet")
+    root = snapshot_root()
+    root.mkdir(parents=True, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    staging = root / f".{version}.tmp"
+    staging.mkdir()
+
+    manifest = {"version": version, "tables": {}}
+    started = time.perf_counter()
+    try:
+        async with AsyncReadSessionLocal() as session:
+            # Uma transação REPEATABLE READ: todas as tabelas vêm do mesmo instante
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            for name, spec in SNAPSHOT_TABLES.items():
+                table_started = time.perf_counter()
+                rows = await _write_table(session, staging, name, spec)
+                manifest["tables"][name] = {"rows": rows, "seconds": round(time.perf_counter() - table_started, 2)}
+                print(f"[SNAPSHOT] {name}: {rows} rows")
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    manifest["seconds"] = round(time.perf_counter() - started, 2)
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+    # Publica: renomeia o diretório e troca o CURRENT de forma atômica
+    staging.rename(root / version)
+    pointer = root / f".{CURRENT_FILE}.tmp"
+    pointer.write_text(version)
+    os.replace(pointer, root / CURRENT_FILE)
+
+    _prune(root, keep=settings.ANALYTICS_SNAPSHOT_KEEP)
+    print(f"[SNAPSHOT] Published {version} in {manifest['seconds']}s")
+    return manifest
+
+
+def _prune(root: Path, keep: int):
+    versions = sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    # Processos da API podem estar lendo a versão anterior; mantém as `keep` mais recentes
+    for old in versions[:-keep] if keep > 0 else []:
+        shutil.rmtree(old, ignore_errors=True)